@@ -3,6 +3,7 @@
 金融资讯定时爬取系统 - 主入口
 """
 
+import asyncio
 import os
 import sys
 import logging
@@ -39,6 +40,17 @@ def setup_logging():
     )
 
 
+def setup_event_loop():
+    """非 Windows 平台且安装了 uvloop 时，爬虫中的 asyncio.run 都改用 uvloop 事件循环"""
+    if sys.platform == 'win32':
+        return
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
 def cmd_test(args):
     """测试模式"""
     from src.spiders import ScrapySpider, PlaywrightSpider, RSSSpider
@@ -63,24 +75,7 @@ def cmd_test(args):
             # 取第一个匹配
             target = targets[0]
             print(f"找到 {len(targets)} 个匹配，使用: {target['name']}")
-            website = WebsiteConfig(
-                name=target['name'],
-                url=target['url'],
-                category=target['category'],
-                source_type=target['source_type'],
-                type=target.get('type', SpiderType.SCRAPY.value),
-                list_url=target.get('list_url'),
-                list_selector=target.get('list_selector'),
-                title_selector=target.get('title_selector'),
-                link_selector=target.get('link_selector'),
-                date_selector=target.get('date_selector'),
-                rss_url=target.get('rss_url'),
-                encoding=target.get('encoding'),
-                use_stealth=target.get('use_stealth', False),
-                proxy_url=target.get('proxy_url'),
-                wait_time=target.get('wait_time', 2),
-                headless=target.get('headless', True)
-            )
+            website = WebsiteConfig.from_dict(target)
 
             # 根据类型选择爬虫
             spider_type = website.type
@@ -89,7 +84,8 @@ def cmd_test(args):
                 spider = PlaywrightSpider(website)
             elif spider_type == SpiderType.RSS.value:
                 print(f"使用 RSS 爬虫")
-                spider = RSSSpider(website)
+                # 测试总是完整抓取 feed，也不写入条件请求缓存
+                spider = RSSSpider(website, conditional=False)
             else:
                 print(f"使用 Scrapy 爬虫")
                 spider = ScrapySpider(website)
@@ -251,6 +247,7 @@ def main():
 
     # 设置日志
     setup_logging()
+    setup_event_loop()
 
     logger = logging.getLogger(__name__)
 
@@ -2,10 +2,15 @@
 配置加载模块
 """
 
+import logging
 import os
 import yaml
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+from .models import WebsiteConfig
+
+logger = logging.getLogger(__name__)
 
 
 class Config:
@@ -14,6 +19,9 @@ class Config:
     _instance: Optional['Config'] = None
     _config: Dict[str, Any] = {}
     _websites: Dict[str, Any] = {}
+    _websites_path: Optional[Path] = None
+    _websites_mtime_ns: Optional[int] = None
+    _website_configs: Optional[Tuple] = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -66,7 +74,16 @@ class Config:
                 self._config = parse_env_vars(raw_config)
 
         # 加载网站配置
-        if websites_path.exists():
+        self._websites_path = websites_path
+        self._load_websites()
+
+    def _load_websites(self):
+        """加载网站配置文件，并记录其 mtime 供 get_website_configs 判断是否需要重新加载"""
+        self._website_configs = None
+        self._websites_mtime_ns = None
+        websites_path = self._websites_path
+        if websites_path is not None and websites_path.exists():
+            self._websites_mtime_ns = websites_path.stat().st_mtime_ns
             with open(websites_path, 'r', encoding='utf-8') as f:
                 self._websites = yaml.safe_load(f) or {}
 
@@ -138,6 +155,31 @@ class Config:
                     websites.append(config)
         return websites
 
+    def get_website_configs(self) -> Tuple:
+        """
+        获取所有网站的 WebsiteConfig 对象
+
+        websites.yaml 未修改时直接复用上次构建的对象；文件 mtime 变化时重新加载并构建。
+        """
+        if self._websites_path is not None:
+            try:
+                mtime_ns = self._websites_path.stat().st_mtime_ns
+            except OSError:
+                mtime_ns = None
+            if mtime_ns != self._websites_mtime_ns:
+                self._load_websites()
+
+        if self._website_configs is None:
+            configs = []
+            for site in self.get_all_website_list():
+                try:
+                    configs.append(WebsiteConfig.from_dict(site))
+                except (KeyError, TypeError) as e:
+                    logger.error(f"网站配置无效 {site.get('name')}: {e}")
+            self._website_configs = tuple(configs)
+
+        return self._website_configs
+
     def reload(self):
         """重新加载配置"""
         self._config = {}
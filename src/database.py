@@ -5,7 +5,7 @@
 import sqlite3
 import logging
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Set
 from pathlib import Path
 
 from .config import config
@@ -13,6 +13,12 @@ from .models import NewsArticle, CrawlResult
 
 logger = logging.getLogger(__name__)
 
+_INSERT_ARTICLE_SQL = '''
+    INSERT OR IGNORE INTO news_articles
+    (title, url, source, category, source_type, publish_time, summary, content, crawled_time)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
 
 class Database:
     """数据库管理类"""
@@ -100,8 +106,28 @@ class Database:
                 )
             ''')
 
+            # RSS 条件请求缓存表（ETag / Last-Modified）
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS feed_cache (
+                    feed_url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    updated_time DATETIME NOT NULL
+                )
+            ''')
+
+            # 自动探测到的 RSS 地址（站点 URL -> feed URL）
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS feed_urls (
+                    site_url TEXT PRIMARY KEY,
+                    feed_url TEXT NOT NULL,
+                    updated_time DATETIME NOT NULL
+                )
+            ''')
+
             # 创建索引
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_news_url ON news_articles(url)')
+            # url 列的 UNIQUE 约束自带索引，旧版本额外创建的同列索引只会拖慢写入
+            cursor.execute('DROP INDEX IF EXISTS idx_news_url')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_news_category ON news_articles(category)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_news_crawled_time ON news_articles(crawled_time)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_news_is_push ON news_articles(is_push)')
@@ -110,31 +136,43 @@ class Database:
             logger.info("数据库初始化完成")
 
     def save_articles(self, articles: List[NewsArticle]) -> int:
-        """保存文章，返回成功保存的数量"""
-        saved_count = 0
+        """保存文章，返回成功保存的数量（单个事务内 executemany 批量写入，重复 URL 由唯一约束忽略）"""
+        rows = [
+            (
+                article.title,
+                article.url,
+                article.source,
+                article.category,
+                article.source_type,
+                article.publish_time,
+                article.summary,
+                article.content,
+                article.crawled_time
+            )
+            for article in articles
+        ]
+        if not rows:
+            return 0
+
         with self._get_connection() as conn:
+            try:
+                cursor = conn.executemany(_INSERT_ARTICLE_SQL, rows)
+                conn.commit()
+                return cursor.rowcount
+            except sqlite3.Error as e:
+                # 批量写入失败时回滚，逐条重试以定位并跳过有问题的文章
+                conn.rollback()
+                logger.warning(f"批量保存文章失败，改为逐条保存: {e}")
+
+            saved_count = 0
             cursor = conn.cursor()
-            for article in articles:
+            for row in rows:
                 try:
-                    cursor.execute('''
-                        INSERT OR IGNORE INTO news_articles
-                        (title, url, source, category, source_type, publish_time, summary, content, crawled_time)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        article.title,
-                        article.url,
-                        article.source,
-                        article.category,
-                        article.source_type,
-                        article.publish_time,
-                        article.summary,
-                        article.content,
-                        article.crawled_time
-                    ))
+                    cursor.execute(_INSERT_ARTICLE_SQL, row)
                     if cursor.rowcount > 0:
                         saved_count += 1
                 except Exception as e:
-                    logger.error(f"保存文章失败: {article.url}, 错误: {e}")
+                    logger.error(f"保存文章失败: {row[1]}, 错误: {e}")
             conn.commit()
         return saved_count
 
@@ -191,6 +229,87 @@ class Database:
             cursor.execute('SELECT 1 FROM news_articles WHERE url = ?', (url,))
             return cursor.fetchone() is not None
 
+    def existing_urls(self, urls: Iterable[str], batch_size: int = 500) -> Set[str]:
+        """返回 urls 中已入库的部分（共用一个连接，按批 IN 查询）"""
+        urls = list(urls)
+        found = set()
+        if not urls:
+            return found
+        with self._get_connection() as conn:
+            for i in range(0, len(urls), batch_size):
+                batch = urls[i:i + batch_size]
+                placeholders = ','.join('?' * len(batch))
+                cursor = conn.execute(f'SELECT url FROM news_articles WHERE url IN ({placeholders})', batch)
+                found.update(url for (url,) in cursor)
+        return found
+
+    def get_feed_cache(self, feed_url: str) -> Dict[str, Optional[str]]:
+        """获取 RSS feed 上次响应的 ETag / Last-Modified"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT etag, last_modified FROM feed_cache WHERE feed_url = ?', (feed_url,))
+            row = cursor.fetchone()
+        if row is None:
+            return {'etag': None, 'last_modified': None}
+        return {'etag': row[0], 'last_modified': row[1]}
+
+    def save_feed_cache(self, feed_url: str, etag: Optional[str], last_modified: Optional[str]):
+        """保存 RSS feed 本次响应的 ETag / Last-Modified"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO feed_cache (feed_url, etag, last_modified, updated_time)
+                VALUES (?, ?, ?, ?)
+            ''', (feed_url, etag, last_modified, datetime.now()))
+            conn.commit()
+
+    def get_feed_url(self, site_url: str) -> Optional[str]:
+        """获取站点上次探测到的 RSS 地址"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT feed_url FROM feed_urls WHERE site_url = ?', (site_url,))
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    def save_feed_url(self, site_url: str, feed_url: Optional[str]):
+        """保存站点探测到的 RSS 地址，feed_url 为 None 时删除记录"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            if feed_url is None:
+                cursor.execute('DELETE FROM feed_urls WHERE site_url = ?', (site_url,))
+            else:
+                cursor.execute('''
+                    INSERT OR REPLACE INTO feed_urls (site_url, feed_url, updated_time)
+                    VALUES (?, ?, ?)
+                ''', (site_url, feed_url, datetime.now()))
+            conn.commit()
+
+    def count_recent_urls(self, days: int = 30) -> int:
+        """最近 N 天入库文章的数量"""
+        with self._get_connection() as conn:
+            cursor = conn.execute(
+                'SELECT COUNT(*) FROM news_articles WHERE crawled_time >= ?',
+                (datetime.now() - timedelta(days=days),)
+            )
+            return cursor.fetchone()[0]
+
+    def get_recent_urls(self, days: int = 30, batch_size: int = 1000) -> Iterator[str]:
+        """逐批返回最近 N 天入库文章的 URL（只查 url 列，不构造文章对象）"""
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute(
+                'SELECT url FROM news_articles WHERE crawled_time >= ?',
+                (datetime.now() - timedelta(days=days),)
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for (url,) in rows:
+                    yield url
+        finally:
+            conn.close()
+
     def get_recent_articles(self, category: str = None, days: int = 7, limit: int = 50) -> List[NewsArticle]:
         """获取最近的文章"""
         with self._get_connection() as conn:
@@ -223,15 +342,16 @@ class Database:
         Returns:
             文章列表
         """
+        # 按 [当天 0 点, 次日 0 点) 的区间比较，可以走 crawled_time 索引（date(crawled_time) 需逐行计算）
+        day = datetime.strptime(date, '%Y-%m-%d')
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            # 使用 date() 函数比较日期部分
             cursor.execute('''
                 SELECT * FROM news_articles
-                WHERE date(crawled_time) = ?
+                WHERE crawled_time >= ? AND crawled_time < ?
                 ORDER BY crawled_time DESC
                 LIMIT ?
-            ''', (date, limit))
+            ''', (day, day + timedelta(days=1), limit))
 
             rows = cursor.fetchall()
             return [self._row_to_article(row) for row in rows]
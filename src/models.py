@@ -2,12 +2,19 @@
 数据模型模块
 """
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cached_property
 from typing import Optional, List
 from enum import Enum
 
 
+# HTML 转义表（与 html.escape(quote=True) 结果一致），str.translate 单次扫描完成；
+# 文章对象的 HTML 片段与 Formatter 的报告渲染共用，同一文本在各处转义结果相同
+_HTML_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'})
+
+
 class NewsCategory(str, Enum):
     """新闻分类"""
     INSURANCE = "insurance"
@@ -40,6 +47,44 @@ class NewsArticle:
     is_push: bool = False
     push_time: Optional[datetime] = None
 
+    def __post_init__(self):
+        # 来源/分类在成百上千篇文章间高度重复（数据库每行、每次抓取都会新建字符串），
+        # 驻留后共享同一对象，节省内存，分类分组时的字典比较也退化为指针比较
+        # （sys.intern 只接受精确的 str 类型，str 子类如 NewsCategory 保持原样）
+        if type(self.source) is str:
+            self.source = sys.intern(self.source)
+        if type(self.category) is str:
+            self.category = sys.intern(self.category)
+        if type(self.source_type) is str:
+            self.source_type = sys.intern(self.source_type)
+
+    @cached_property
+    def title_html_safe(self) -> str:
+        """HTML 转义后的标题（首次访问时计算并缓存，多渠道/多次渲染复用）"""
+        return self.title.translate(_HTML_ESCAPE_TABLE)
+
+    @cached_property
+    def url_attr_safe(self) -> str:
+        """可直接放入 HTML 属性的链接（转义查询串中的 & 与引号）"""
+        return self.url.translate(_HTML_ESCAPE_TABLE)
+
+    @cached_property
+    def publish_time_hm(self) -> str:
+        """发布时间的 时:分 文本（无发布时间时为空串），同样只格式化一次"""
+        return self.publish_time.strftime('%H:%M') if self.publish_time else ''
+
+    @cached_property
+    def source_tag_html(self) -> str:
+        """AI 报告专题卡片中的来源标签链接（缓存，重复渲染直接复用）"""
+        source = (self.source or "未知来源").translate(_HTML_ESCAPE_TABLE)
+        return f'<a href="{self.url_attr_safe}" target="_blank" class="source-tag">{source}</a>'
+
+    @cached_property
+    def flash_source_html(self) -> str:
+        """AI 报告资讯速递中的来源链接（缓存）"""
+        source = (self.source or "").translate(_HTML_ESCAPE_TABLE)
+        return f'<a href="{self.url_attr_safe}" target="_blank" class="flash-source">{source} ↗</a>'
+
     def to_dict(self) -> dict:
         """转换为字典"""
         return {
@@ -74,9 +119,9 @@ class NewsArticle:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WebsiteConfig:
-    """网站配置模型"""
+    """网站配置模型（只读；由 config.get_website_configs() 构建并在多次运行间复用）"""
     name: str
     url: str
     category: str
@@ -92,8 +137,10 @@ class WebsiteConfig:
     # Playwright增强配置
     use_stealth: bool = False
     proxy_url: Optional[str] = None
-    wait_time: int = 2  # 随机等待秒数
+    wait_time: int = 2  # 列表页等待渲染（网络空闲）的最长秒数
     headless: bool = True
+    # 链接中包含任一子串即跳过（广告、导航等）
+    exclude_patterns: List[str] = field(default_factory=list)
 
     def to_dict(self) -> dict:
         """转换为字典"""
@@ -113,9 +160,33 @@ class WebsiteConfig:
             'use_stealth': self.use_stealth,
             'proxy_url': self.proxy_url,
             'wait_time': self.wait_time,
-            'headless': self.headless
+            'headless': self.headless,
+            'exclude_patterns': self.exclude_patterns
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> 'WebsiteConfig':
+        """由 websites.yaml 中的单个站点配置（已补充 category / source_type）创建"""
+        return cls(
+            name=data['name'],
+            url=data['url'],
+            category=data['category'],
+            source_type=data['source_type'],
+            type=data.get('type', SpiderType.SCRAPY.value),
+            list_url=data.get('list_url'),
+            list_selector=data.get('list_selector'),
+            title_selector=data.get('title_selector'),
+            link_selector=data.get('link_selector'),
+            date_selector=data.get('date_selector'),
+            rss_url=data.get('rss_url'),
+            encoding=data.get('encoding'),
+            use_stealth=data.get('use_stealth', False),
+            proxy_url=data.get('proxy_url'),
+            wait_time=data.get('wait_time', 2),
+            headless=data.get('headless', True),
+            exclude_patterns=data.get('exclude_patterns') or []
+        )
+
 
 @dataclass
 class CrawlResult:
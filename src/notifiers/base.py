@@ -22,13 +22,14 @@ class BaseNotifier(ABC):
         self._last_result: Optional[PushResult] = None
 
     @abstractmethod
-    def send(self, articles: List[NewsArticle], date: datetime = None) -> PushResult:
+    def send(self, articles: List[NewsArticle], date: datetime = None, ctx=None) -> PushResult:
         """
         发送通知
 
         Args:
             articles: 文章列表
             date: 日期
+            ctx: 可选的 FormatContext（同一批文章的分类排序结果，多个通知器共用）
 
         Returns:
             PushResult: 推送结果
@@ -28,7 +28,7 @@ class EmailNotifier(BaseNotifier):
         self.from_name = config.get('from_name', '金融资讯机器人')
         self.to = config.get('to', [])
 
-    def send(self, articles: List[NewsArticle], date: datetime = None) -> PushResult:
+    def send(self, articles: List[NewsArticle], date: datetime = None, ctx=None) -> PushResult:
         """发送邮件"""
         if not articles:
             return PushResult(
@@ -51,7 +51,7 @@ class EmailNotifier(BaseNotifier):
         try:
             from ..processors import Formatter
             formatter = Formatter()
-            subject, html_body = formatter.format_for_email(articles, date)
+            subject, html_body = formatter.format_for_email(ctx or articles, date)
 
             # 发送邮件
             self._send_email(subject, html_body)
@@ -23,7 +23,7 @@ class TelegramNotifier(BaseNotifier):
         self.chat_id = config.get('chat_id', '')
         self.parse_mode = config.get('parse_mode', 'HTML')
 
-    def send(self, articles: List[NewsArticle], date: datetime = None) -> PushResult:
+    def send(self, articles: List[NewsArticle], date: datetime = None, ctx=None) -> PushResult:
         """发送Telegram消息"""
         if not articles:
             return PushResult(
@@ -46,7 +46,7 @@ class TelegramNotifier(BaseNotifier):
         try:
             from ..processors import Formatter
             formatter = Formatter()
-            content = formatter.format_for_telegram(articles, date)
+            content = formatter.format_for_telegram(ctx or articles, date)
 
             # 发送消息
             self._send_message(content)
@@ -21,7 +21,7 @@ class WeChatNotifier(BaseNotifier):
         super().__init__(name, config)
         self.webhook_url = config.get('webhook_url', '')
 
-    def send(self, articles: List[NewsArticle], date: datetime = None) -> PushResult:
+    def send(self, articles: List[NewsArticle], date: datetime = None, ctx=None) -> PushResult:
         """发送企业微信消息"""
         if not articles:
             return PushResult(
@@ -44,7 +44,7 @@ class WeChatNotifier(BaseNotifier):
         try:
             from ..processors import Formatter
             formatter = Formatter()
-            content = formatter.format_for_wechat(articles, date)
+            content = formatter.format_for_wechat(ctx or articles, date)
 
             # 发送消息
             self._send_message(content)
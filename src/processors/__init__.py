@@ -1,5 +1,5 @@
 from .deduplicator import Deduplicator
-from .formatter import Formatter
+from .formatter import Formatter, FormatContext
 from .ai_processor import AIProcessor
 
-__all__ = ['Deduplicator', 'Formatter', 'AIProcessor']
+__all__ = ['Deduplicator', 'Formatter', 'FormatContext', 'AIProcessor']
@@ -4,8 +4,9 @@
 
 import hashlib
 import logging
+import math
 import re
-from typing import List, Set, Dict
+from typing import List, Set, Dict, Callable, Iterable, Optional
 from collections import defaultdict
 
 from ..models import NewsArticle
@@ -13,11 +14,62 @@ from ..models import NewsArticle
 logger = logging.getLogger(__name__)
 
 
+class BloomFilter:
+    """
+    简易布隆过滤器（bytearray 位图 + blake2b 双重哈希）
+
+    只判断"可能存在"或"一定不存在"，存在误判（假阳性），不会漏判。
+    每个元素约占 1.44 * log2(1/error_rate) 位，与 URL 长度无关。
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 1e-6):
+        capacity = max(1, capacity)
+        self._num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self._num_hashes = max(1, round(self._num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self._num_bits + 7) // 8)
+        self._count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        m = self._num_bits
+        return [(h1 + i * h2) % m for i in range(self._num_hashes)]
+
+    def add(self, item: str):
+        bits = self._bits
+        for pos in self._positions(item):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self._count += 1
+
+    def update(self, items: Iterable[str]):
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def __len__(self) -> int:
+        return self._count
+
+
 class Deduplicator:
     """文章去重处理器"""
 
-    def __init__(self):
-        self._seen_urls: Set[str] = set()
+    # 历史 URL 布隆过滤器的最小容量与误判率
+    BLOOM_MIN_CAPACITY = 100_000
+    BLOOM_ERROR_RATE = 1e-6
+
+    def __init__(self, existing_urls: Optional[Callable[[Iterable[str]], Set[str]]] = None):
+        """
+        Args:
+            existing_urls: 布隆过滤器命中时用于确认的批量精确查询（如 db.existing_urls），
+                           传入一批 URL、返回其中确实存在的部分；为空时命中即按已见处理
+        """
+        self._existing_urls = existing_urls
+        self._history: Optional[BloomFilter] = None  # 数据库中的历史 URL
+        self._seen_urls: Set[str] = set()  # 本次运行新见到的 URL（精确集合）
         self._seen_hashes: Set[str] = set()
         self._title_index: Dict[str, List[str]] = defaultdict(list)  # 标题哈希 -> URLs
 
@@ -31,8 +83,25 @@ class Deduplicator:
 
     def is_seen(self, url: str, title: str = "") -> bool:
         """检查是否已存在"""
+        return self._is_seen(url, title, self._confirm_history([url]))
+
+    def _confirm_history(self, urls: Iterable[str]) -> Set[str]:
+        """
+        返回 urls 中确实在历史记录里的部分
+
+        布隆过滤器未命中即一定未见；命中的 URL 汇总后用一次批量查询精确确认以排除误判。
+        """
+        if self._history is None:
+            return set()
+        hits = {url for url in urls if url not in self._seen_urls and url in self._history}
+        if not hits or self._existing_urls is None:
+            return hits
+        return self._existing_urls(hits)
+
+    def _is_seen(self, url: str, title: str, history: Set[str]) -> bool:
+        """is_seen 的实现，history 为已确认存在于历史记录中的 URL"""
         # URL完全匹配
-        if url in self._seen_urls:
+        if url in self._seen_urls or url in history:
             return True
 
         # 标准化后标题匹配
@@ -46,9 +115,10 @@ class Deduplicator:
     def deduplicate(self, articles: List[NewsArticle]) -> List[NewsArticle]:
         """对文章列表去重"""
         unique_articles = []
+        history = self._confirm_history(article.url for article in articles)
 
         for article in articles:
-            if self.is_seen(article.url, article.title):
+            if self._is_seen(article.url, article.title, history):
                 logger.debug(f"去重跳过: {article.title}")
                 continue
 
@@ -95,11 +165,20 @@ class Deduplicator:
 
     def clear(self):
         """清空已见记录"""
+        self._history = None
         self._seen_urls.clear()
         self._seen_hashes.clear()
         self._title_index.clear()
 
-    def load_from_database(self, urls: List[str]):
-        """从数据库加载已见的URL"""
-        self._seen_urls.update(urls)
-        logger.info(f"从数据库加载了 {len(urls)} 个已见URL")
+    def load_from_database(self, urls: Iterable[str], expected: int = 0) -> int:
+        """
+        从数据库加载已见的URL（存入布隆过滤器，内存占用与 URL 长度无关）
+
+        urls 可以是生成器，边读边写入过滤器，不在内存中保留 URL 列表；
+        expected 为预计的 URL 数量，用于确定过滤器容量。返回实际加载的数量。
+        """
+        bloom = BloomFilter(max(self.BLOOM_MIN_CAPACITY, expected * 2), self.BLOOM_ERROR_RATE)
+        bloom.update(urls)
+        self._history = bloom
+        logger.info(f"从数据库加载了 {len(bloom)} 个已见URL")
+        return len(bloom)
@@ -1,462 +1,135 @@
 """
 内容格式化器
 """
+import gzip
 import logging
-import os
+import re
+import time
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Any
-from ..models import NewsArticle
+from functools import lru_cache
+from itertools import accumulate, groupby
+from typing import List, Dict, Any, Iterator, Union
+from ..models import NewsArticle, _HTML_ESCAPE_TABLE
 
 logger = logging.getLogger(__name__)
 
-class Formatter:
-    """内容格式化器"""
-
-    # 分类显示名称映射
-    CATEGORY_NAMES = {
-        'insurance': '保险行业',
-        'banks': '银行行业',
-        'finance': '财经资讯',
-        'regulation': '政策法规',
-        'internet_finance': '互联网金融',
-        'market': '市场动态'
-    }
-
-    def __init__(self):
-        pass
-
-    def format_for_email(self, articles: List[NewsArticle], date: datetime = None) -> tuple:
-        """
-        格式化为邮件格式 (标准 HTML)
-
-        Returns:
-            tuple: (subject, html_body)
-        """
-        if not articles:
-            return "金融资讯日报", "<p>今日暂无资讯</p>"
-
-        if date is None:
-            date = datetime.now()
-
-        subject = f"金融资讯日报 - {date.strftime('%Y年%m月%d日')}"
-
-        # 按分类组织文章
-        categorized = self._categorize_articles(articles)
-
-        # 生成HTML
-        html = self._generate_html(categorized, date)
-
-        return subject, html
 
-    def format_ai_report(self, ai_data: Dict[str, Any], date: datetime = None) -> str:
-        """
-        将 AI 分析结果格式化为现代化的 HTML 研报
-        """
-        if date is None:
-            date = datetime.now()
-
-        return self._generate_ai_html_template(ai_data, date)
-
-    def format_combined_report(self, articles: List[NewsArticle], ai_data: Dict[str, Any] = None, date: datetime = None) -> str:
-        """
-        生成合并版 HTML 报告（标准列表 + AI分析），使用 Tab 切换
-
-        Returns:
-            str: 合并后的完整HTML
-        """
-        if date is None:
-            date = datetime.now()
-
-        # 生成 AI 分析部分 HTML
-        ai_sections_html = self._generate_ai_sections(ai_data) if ai_data else ""
-
-        # 生成文章列表部分 HTML
-        categorized = self._categorize_articles(articles)
-        articles_html = self._generate_articles_section(categorized, date)
-
-        # 生成完整合并版 HTML
-        return self._generate_combined_html(ai_sections_html, articles_html, len(articles), date)
-
-    def _generate_ai_sections(self, data: Dict[str, Any]) -> str:
-        """提取 AI 分析的各个部分（市场综述、深度专题、资讯速递）"""
-        if not data:
+def _esc(s) -> str:
+    """转义插入 HTML 的动态文本（None/空串返回空串；AI 返回的数字、列表等非字符串按 str() 转义）"""
+    if not isinstance(s, str):
+        if s is None:
             return ""
-
-        # 1. 市场综述
-        sentiment_html = ""
-        if "market_sentiment" in data:
-            sentiment_html = f"""
-            <div class="sentiment-box glass-effect has-select selected" data-card-type="sentiment">
-                <div class="card-select-indicator"></div>
-                <div class="box-header"><span class="icon">📈</span> 市场情绪与宏观综述</div>
-                <div class="box-content">{data['market_sentiment']}</div>
-            </div>
-            """
-
-        # 2. 深度专题
-        themes_html = ""
-        if "themes" in data:
-            theme_cards = ""
-            for theme in data["themes"]:
-                imp = theme.get("importance", "中")
-                importance_class = "imp-high" if imp == "高" else "imp-med"
-
-                # 关联文章链接
-                articles_links = ""
-                if "articles" in theme:
-                    links = []
-                    for art in theme["articles"]:
-                        source = art.source or "未知来源"
-                        links.append(f'<a href="{art.url}" target="_blank" class="source-tag">{source}</a>')
-                    if links:
-                        articles_links = f'<div class="ref-links"><span class="ref-label">相关报道:</span> {"".join(links)}</div>'
-
-                theme_cards += f"""
-                <div class="theme-card has-select selected" data-card-type="theme">
-                    <div class="card-select-indicator"></div>
-                    <div class="theme-header">
-                        <div class="theme-title-wrapper">
-                            <span class="theme-title">{theme.get('title')}</span>
-                        </div>
-                        <span class="importance {importance_class}">{imp}关注</span>
-                    </div>
-                    <div class="theme-body">
-                        <div class="summary-section">
-                            {theme.get('summary')}
-                        </div>
-                        <div class="insight-section">
-                            <div class="insight-label">💡 研究员洞察</div>
-                            <div class="insight-text">{theme.get('insight')}</div>
-                        </div>
-                        {articles_links}
-                    </div>
-                </div>
-                """
-
-            themes_html = f"""
-            <div class="section-container">
-                <div class="section-header">
-                    <span class="section-icon">🧐</span> 深度专题
-                </div>
-                <div class="themes-grid">
-                    {theme_cards}
-                </div>
-            </div>
-            """
-
-        # 3. 资讯速递
-        flash_html = ""
-        if "news_flash" in data:
-            flash_items = ""
-            for item in data["news_flash"]:
-                article_info = ""
-                if "article" in item:
-                    art = item["article"]
-                    article_info = f'<a href="{art.url}" target="_blank" class="flash-source">{art.source} ↗</a>'
-
-                flash_items += f"""
-                <div class="flash-item has-select selected" data-card-type="flash">
-                    <div class="card-select-indicator"></div>
-                    <div class="flash-content">
-                        <div class="flash-title">
-                            {item.get('title')} {article_info}
-                        </div>
-                        <div class="flash-comment">
-                           <span class="comment-icon">👉</span> {item.get('one_sentence_comment')}
-                        </div>
-                    </div>
-                </div>
-                """
-
-            flash_html = f"""
-            <div class="section-container">
-                <div class="section-header">
-                    <span class="section-icon">⚡</span> 资讯速递
-                </div>
-                <div class="flash-grid">
-                    {flash_items}
-                </div>
-            </div>
-            """
-
-        return sentiment_html + themes_html + flash_html
-
-    def _generate_articles_section(self, categorized_articles: Dict[str, List[NewsArticle]], date: datetime) -> str:
-        """生成文章列表部分的 HTML"""
-        sections_html = ""
-
-        # 排序：优先显示配置中定义的分类
-        sorted_keys = sorted(categorized_articles.keys(),
-                           key=lambda x: list(self.CATEGORY_NAMES.keys()).index(x) if x in self.CATEGORY_NAMES else 999)
-
-        for category in sorted_keys:
-            articles = categorized_articles[category]
-            cat_name = self.CATEGORY_NAMES.get(category, category.upper())
-
-            rows = ""
-            for i, art in enumerate(articles, 1):
-                rows += f"""
+        s = str(s)
+    return s.translate(_HTML_ESCAPE_TABLE)
+
+
+# 专题重要性 -> (标签样式, 已转义的标签文字)；兼容模型偶尔返回的英文取值，
+# 未知取值按"中"的样式处理并原样（转义后）显示
+_IMP_TABLE = {
+    "高": ("imp-high", "高"),
+    "中": ("imp-med", "中"),
+    "低": ("imp-low", "低"),
+    "high": ("imp-high", "高"),
+    "medium": ("imp-med", "中"),
+    "low": ("imp-low", "低"),
+}
+
+# 中文星期（按 datetime.weekday() 索引）
+_WEEKDAYS_CN = ("周一", "周二", "周三", "周四", "周五", "周六", "周日")
+
+# 文章列表行模板（模块级预构建，% 位置参数：序号, 链接, 标题, 来源, 时间, 摘要）
+_ROW_TEMPLATE = """
                 <div class="article-item">
-                    <h3>{i}. <a href="{art.url}" target="_blank">{art.title}</a></h3>
+                    <h3>%s. <a href="%s" target="_blank">%s</a></h3>
                     <div class="meta">
-                        <span class="source">{art.source}</span>
-                        <span class="time">{art.publish_time.strftime('%H:%M') if art.publish_time else ''}</span>
+                        <span class="source">%s</span>
+                        <span class="time">%s</span>
                     </div>
-                    <p class="summary">{art.summary or '暂无摘要'}</p>
+                    <p class="summary">%s</p>
                 </div>
                 """
 
-            sections_html += f"""
+@lru_cache(maxsize=4096)
+def _render_article_row(i: int, url: str, title: str, source: str, time_str: str, summary: str) -> str:
+    """渲染单行文章（参数均为不可变基础类型；同一批文章被邮件/合并报告重复渲染时直接命中缓存）"""
+    return _ROW_TEMPLATE % (i, _esc(url), _esc(title), _esc(source), time_str, _esc(summary))
+
+
+@lru_cache(maxsize=64)
+def _render_category_block(cat_name: str, rows: tuple) -> str:
+    """渲染一个分类区块；rows 为 (url, title, source, time_str, summary) 元组序列，按内容而非对象缓存"""
+    rows_html = "".join(_render_article_row(i, *row) for i, row in enumerate(rows, 1))
+    return f"""
             <div class="category-section">
-                <h2>{cat_name} ({len(articles)})</h2>
-                {rows}
+                <h2>{cat_name} ({len(rows)})</h2>
+                {rows_html}
             </div>
             """
 
-        return sections_html
 
-    def _generate_combined_html(self, ai_html: str, articles_html: str, article_count: int, date: datetime) -> str:
-        """生成完整的合并版 HTML 页面"""
-        date_str = date.strftime('%Y年%m月%d日')
+def _minify_css(css: str) -> str:
+    """压缩 CSS：去掉注释并折叠空白（仅在模块导入时对静态样式调用一次）"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    # 冒号只去掉其后的空白：冒号前的空格在选择器中有意义（如 "div :first-child"）
+    css = re.sub(r':\s+', ':', css)
+    return re.sub(r'\s*([{};,])\s*', r'\1', css).strip()
 
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>金融日报 | {date_str}</title>
-            <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Noto+Sans+SC:wght@300;400;500;700&display=swap" rel="stylesheet">
-            <style>
-                :root {{
-                    --primary: #2563eb;
-                    --primary-dark: #1e40af;
-                    --secondary: #64748b;
-                    --accent: #f59e0b;
-                    --success: #10b981;
-                    --danger: #ef4444;
-                    --bg-page: #f8fafc;
-                    --bg-card: #ffffff;
-                    --text-main: #1e293b;
-                    --text-muted: #64748b;
-                    --border-color: #e2e8f0;
-                    --shadow-sm: 0 1px 2px 0 rgba(0, 0, 0, 0.05);
-                    --shadow-md: 0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -1px rgba(0, 0, 0, 0.06);
-                    --shadow-lg: 0 10px 15px -3px rgba(0, 0, 0, 0.1), 0 4px 6px -2px rgba(0, 0, 0, 0.05);
-                }}
 
-                body {{
-                    font-family: 'Inter', 'Noto Sans SC', sans-serif;
-                    line-height: 1.6;
-                    color: var(--text-main);
-                    background-color: var(--bg-page);
-                    margin: 0;
-                    padding: 0;
-                    -webkit-font-smoothing: antialiased;
-                }}
+def _minify_html(html: str) -> str:
+    """去掉静态 HTML 片段中源码缩进带来的行首空白和空行（同样只在导入时调用）"""
+    return "\n".join(line.strip() for line in html.splitlines() if line.strip())
 
-                .main-container {{
-                    max-width: 900px;
-                    margin: 0 auto;
-                    padding: 40px 20px;
-                }}
 
-                /* Header */
-                .report-header {{
-                    text-align: center;
-                    margin-bottom: 40px;
-                }}
-                .report-title {{
-                    font-size: 32px;
-                    font-weight: 800;
-                    color: #0f172a;
-                    letter-spacing: -0.025em;
-                    margin: 0;
-                    display: inline-block;
+# 报告字体（Google Fonts）：preload 后异步切换为样式表，不阻塞首屏渲染；无 JS 环境走 noscript 回退
+_FONT_URL = "https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Noto+Sans+SC:wght@300;400;500;700&display=swap"
+_FONT_LINK = (
+    f'<link rel="preload" as="style" href="{_FONT_URL}" onload="this.onload=null;this.rel=\'stylesheet\'">'
+    f'<noscript><link rel="stylesheet" href="{_FONT_URL}"></noscript>'
+)
+
+# AI 分析卡片样式（市场综述、深度专题、资讯速递），AI 深度版报告与合并版报告共用同一份源码
+_AI_CARDS_CSS = """
+                /* Sentiment Box */
+                .sentiment-box {
+                    background: linear-gradient(135deg, #ffffff 0%, #eff6ff 100%);
+                    border: 1px solid #dbeafe;
+                    border-radius: 16px;
+                    padding: 24px;
+                    margin-bottom: 50px;
+                    box-shadow: var(--shadow-md);
                     position: relative;
-                }}
-                .report-title::after {{
+                    overflow: hidden;
+                }
+                .sentiment-box::before {
                     content: '';
-                    display: block;
-                    width: 60px;
-                    height: 4px;
-                    background: var(--primary);
-                    margin: 15px auto 0;
-                    border-radius: 2px;
-                }}
-                .report-subtitle {{
-                    font-size: 16px;
-                    color: var(--text-muted);
-                    font-weight: 500;
-                    margin-top: 10px;
-                    text-transform: uppercase;
-                    letter-spacing: 0.05em;
-                }}
-                .mode-toggle-wrap {{
-                    margin-top: 16px;
-                    display: inline-flex;
-                    align-items: center;
-                    gap: 8px;
-                }}
-                .mode-switch {{
-                    position: relative;
-                    display: inline-block;
-                    width: 44px;
-                    height: 24px;
-                }}
-                .mode-switch input {{
-                    opacity: 0;
-                    width: 0;
-                    height: 0;
-                }}
-                .slider {{
                     position: absolute;
-                    cursor: pointer;
                     top: 0;
                     left: 0;
-                    right: 0;
-                    bottom: 0;
-                    background-color: #94a3b8;
-                    transition: .3s;
-                    border-radius: 24px;
-                }}
-                .slider:before {{
-                    position: absolute;
-                    content: "";
-                    height: 18px;
-                    width: 18px;
-                    left: 3px;
-                    bottom: 3px;
-                    background-color: white;
-                    transition: .3s;
-                    border-radius: 50%;
-                }}
-                input:checked + .slider {{
-                    background-color: #2563eb;
-                }}
-                input:checked + .slider:before {{
-                    transform: translateX(20px);
-                }}
-                .mode-label {{
-                    font-size: 13px;
-                    color: #64748b;
-                }}
-                /* View mode: hide screenshot UI */
-                .view-mode .ai-toolbar,
-                .view-mode .card-select-wrapper,
-                .view-mode .selected-count,
-                .view-mode #screenshot-modal,
-                .view-mode .card-select-indicator {{
-                    display: none !important;
-                }}
-                .view-mode .sentiment-box,
-                .view-mode .theme-card,
-                .view-mode .flash-item {{
-                    cursor: default !important;
-                    border: none !important;
-                    box-shadow: none !important;
-                }}
-
-                /* Tab Navigation */
-                .tab-nav {{
+                    width: 4px;
+                    height: 100%;
+                    background: var(--primary);
+                }
+                .box-header {
+                    font-size: 18px;
+                    font-weight: 700;
+                    color: #1e3a8a;
+                    margin-bottom: 15px;
                     display: flex;
+                    align-items: center;
                     gap: 8px;
-                    margin-bottom: 40px;
-                    border-bottom: 2px solid var(--border-color);
-                    padding-bottom: 0;
-                }}
-                .tab-btn {{
-                    padding: 14px 28px;
-                    border: none;
-                    background: transparent;
-                    font-size: 15px;
-                    font-weight: 600;
-                    color: var(--text-muted);
-                    cursor: pointer;
-                    position: relative;
-                    transition: color 0.3s;
-                    border-radius: 8px 8px 0 0;
-                }}
-                .tab-btn:hover {{
-                    color: var(--primary);
-                    background: rgba(37, 99, 235, 0.05);
-                }}
-                .tab-btn.active {{
-                    color: var(--primary);
-                }}
-                .tab-btn.active::after {{
-                    content: '';
-                    position: absolute;
-                    bottom: -2px;
-                    left: 0;
-                    right: 0;
-                    height: 3px;
-                    background: var(--primary);
-                    border-radius: 3px 3px 0 0;
-                }}
-                .tab-count {{
-                    font-size: 12px;
-                    background: var(--border-color);
-                    padding: 2px 8px;
-                    border-radius: 12px;
-                    margin-left: 8px;
-                    color: var(--text-muted);
-                }}
-
-                /* Tab Content */
-                .tab-content {{
-                    min-height: 400px;
-                }}
-                .tab-pane {{
-                    display: none;
-                    animation: fadeIn 0.4s ease;
-                }}
-                .tab-pane.active {{
-                    display: block;
-                }}
-                @keyframes fadeIn {{
-                    from {{ opacity: 0; transform: translateY(15px); }}
-                    to {{ opacity: 1; transform: translateY(0); }}
-                }}
-
-                /* AI Section Styles (reused from AI template) */
-                .sentiment-box {{
-                    background: linear-gradient(135deg, #ffffff 0%, #eff6ff 100%);
-                    border: 1px solid #dbeafe;
-                    border-radius: 16px;
-                    padding: 24px;
-                    margin-bottom: 50px;
-                    box-shadow: var(--shadow-md);
-                    position: relative;
-                    overflow: hidden;
-                }}
-                .sentiment-box::before {{
-                    content: '';
-                    position: absolute;
-                    top: 0;
-                    left: 0;
-                    width: 4px;
-                    height: 100%;
-                    background: var(--primary);
-                }}
-                .box-header {{
-                    font-size: 18px;
-                    font-weight: 700;
-                    color: #1e3a8a;
-                    margin-bottom: 15px;
-                    display: flex;
-                    align-items: center;
-                    gap: 8px;
-                }}
-                .box-content {{
+                }
+                .box-content {
                     font-size: 16px;
                     color: #334155;
                     font-weight: 400;
                     text-align: justify;
                     line-height: 1.7;
-                }}
+                }
 
-                .section-header {{
+                /* Section Headers */
+                .section-header {
                     font-size: 24px;
                     font-weight: 700;
                     color: #0f172a;
@@ -466,43 +139,44 @@ class Formatter:
                     gap: 12px;
                     border-bottom: 2px solid var(--border-color);
                     padding-bottom: 10px;
-                }}
-                .section-icon {{
+                }
+                .section-icon {
                     font-size: 24px;
-                }}
-
-                .themes-grid {{
+                }
+                
+                /* Theme Cards */
+                .themes-grid {
                     display: grid;
                     gap: 25px;
                     margin-bottom: 50px;
-                }}
-                .theme-card {{
+                }
+                .theme-card {
                     background: var(--bg-card);
                     border-radius: 12px;
                     padding: 24px;
                     box-shadow: var(--shadow-sm);
                     border: 1px solid var(--border-color);
                     transition: all 0.3s ease;
-                }}
-                .theme-card:hover {{
+                }
+                .theme-card:hover {
                     box-shadow: var(--shadow-lg);
                     transform: translateY(-2px);
                     border-color: #cbd5e1;
-                }}
-                .theme-header {{
+                }
+                .theme-header {
                     display: flex;
                     justify-content: space-between;
                     align-items: flex-start;
                     margin-bottom: 18px;
                     gap: 15px;
-                }}
-                .theme-title {{
+                }
+                .theme-title {
                     font-size: 20px;
                     font-weight: 700;
                     color: #0f172a;
                     line-height: 1.3;
-                }}
-                .importance {{
+                }
+                .importance {
                     font-size: 12px;
                     padding: 4px 10px;
                     border-radius: 20px;
@@ -510,36 +184,37 @@ class Formatter:
                     white-space: nowrap;
                     text-transform: uppercase;
                     letter-spacing: 0.02em;
-                }}
-                .imp-high {{ background-color: #fee2e2; color: #b91c1c; }}
-                .imp-med {{ background-color: #fef3c7; color: #b45309; }}
-
-                .summary-section {{
+                }
+                .imp-high { background-color: #fee2e2; color: #b91c1c; }
+                .imp-med { background-color: #fef3c7; color: #b45309; }
+                .imp-low { background-color: #dcfce7; color: #047857; }
+                
+                .summary-section {
                     font-size: 15px;
                     color: #475569;
                     margin-bottom: 15px;
                     line-height: 1.6;
-                }}
-                .insight-section {{
+                }
+                .insight-section {
                     background-color: #f0fdf4;
                     border-left: 3px solid #10b981;
                     padding: 15px;
                     border-radius: 0 8px 8px 0;
                     margin-bottom: 15px;
-                }}
-                .insight-label {{
+                }
+                .insight-label {
                     font-size: 13px;
                     font-weight: 700;
                     color: #047857;
                     margin-bottom: 5px;
                     text-transform: uppercase;
-                }}
-                .insight-text {{
+                }
+                .insight-text {
                     font-size: 15px;
                     color: #065f46;
-                }}
-
-                .ref-links {{
+                }
+                
+                .ref-links {
                     margin-top: 15px;
                     padding-top: 15px;
                     border-top: 1px dashed var(--border-color);
@@ -547,13 +222,13 @@ class Formatter:
                     flex-wrap: wrap;
                     gap: 8px;
                     align-items: center;
-                }}
-                .ref-label {{
+                }
+                .ref-label {
                     font-size: 12px;
                     color: #94a3b8;
                     font-weight: 600;
-                }}
-                .source-tag {{
+                }
+                .source-tag {
                     font-size: 11px;
                     color: #475569;
                     background: #f1f5f9;
@@ -561,44 +236,45 @@ class Formatter:
                     border-radius: 4px;
                     text-decoration: none;
                     transition: background 0.2s;
-                }}
-                .source-tag:hover {{
+                }
+                .source-tag:hover {
                     background: #e2e8f0;
                     color: var(--primary);
-                }}
+                }
 
-                .flash-grid {{
+                /* News Flash Grid */
+                .flash-grid {
                     display: grid;
                     grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
                     gap: 20px;
-                }}
-                .flash-item {{
+                }
+                .flash-item {
                     background: var(--bg-card);
                     border: 1px solid var(--border-color);
                     border-radius: 10px;
                     padding: 18px;
                     transition: transform 0.2s;
-                }}
-                .flash-item:hover {{
+                }
+                .flash-item:hover {
                     border-color: #cbd5e1;
                     box-shadow: var(--shadow-md);
-                }}
-                .flash-title {{
+                }
+                .flash-title {
                     font-size: 15px;
                     font-weight: 600;
                     color: #0f172a;
                     margin-bottom: 10px;
                     line-height: 1.4;
-                }}
-                .flash-source {{
+                }
+                .flash-source {
                     font-size: 11px;
                     color: #94a3b8;
                     font-weight: 400;
                     margin-left: 5px;
                     text-decoration: none;
-                }}
-                .flash-source:hover {{ color: var(--primary); }}
-                .flash-comment {{
+                }
+                .flash-source:hover { color: var(--primary); }
+                .flash-comment {
                     font-size: 13px;
                     color: #b45309;
                     background-color: #fffbeb;
@@ -608,56 +284,84 @@ class Formatter:
                     display: flex;
                     align-items: flex-start;
                     gap: 8px;
-                }}
-                .comment-icon {{
+                }
+                .flash-comment::before {
+                    content: "👉";
                     flex-shrink: 0;
-                }}
+                }
+"""
 
-                /* Articles List Styles */
-                .category-section {{
-                    margin-bottom: 35px;
-                }}
-                .category-section h2 {{
-                    color: #34495e;
-                    border-left: 5px solid #3498db;
-                    padding-left: 12px;
-                    margin-bottom: 18px;
-                    font-size: 20px;
-                }}
-                .article-item {{
-                    margin-bottom: 18px;
-                    padding-bottom: 18px;
-                    border-bottom: 1px solid #eee;
-                }}
-                .article-item h3 {{
-                    margin-bottom: 6px;
-                    font-size: 16px;
-                    font-weight: 600;
-                }}
-                .article-item a {{
-                    color: #2980b9;
-                    text-decoration: none;
-                }}
-                .article-item a:hover {{
-                    text-decoration: underline;
-                }}
-                .meta {{
-                    font-size: 12px;
-                    color: #7f8c8d;
-                    margin-bottom: 6px;
-                }}
-                .meta .source {{
-                    margin-right: 12px;
-                }}
-                .summary {{
-                    font-size: 14px;
-                    color: #555;
-                    margin: 0;
-                    line-height: 1.6;
-                }}
 
-                /* Footer */
-                .footer {{
+# AI 深度版报告样式（模块级常量，导入时构建一次）
+_AI_REPORT_CSS = _minify_css("""
+                :root {
+                    --primary: #2563eb;
+                    --primary-dark: #1e40af;
+                    --secondary: #64748b;
+                    --accent: #f59e0b;
+                    --success: #10b981;
+                    --danger: #ef4444;
+                    --bg-page: #f8fafc;
+                    --bg-card: #ffffff;
+                    --text-main: #1e293b;
+                    --text-muted: #64748b;
+                    --border-color: #e2e8f0;
+                    --shadow-sm: 0 1px 2px 0 rgba(0, 0, 0, 0.05);
+                    --shadow-md: 0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -1px rgba(0, 0, 0, 0.06);
+                    --shadow-lg: 0 10px 15px -3px rgba(0, 0, 0, 0.1), 0 4px 6px -2px rgba(0, 0, 0, 0.05);
+                }
+                
+                body {
+                    font-family: 'Inter', 'Noto Sans SC', sans-serif;
+                    line-height: 1.6;
+                    color: var(--text-main);
+                    background-color: var(--bg-page);
+                    margin: 0;
+                    padding: 0;
+                    -webkit-font-smoothing: antialiased;
+                }
+                
+                .main-container {
+                    max-width: 900px;
+                    margin: 0 auto;
+                    padding: 40px 20px;
+                }
+                
+                /* Header */
+                .report-header {
+                    text-align: center;
+                    margin-bottom: 50px;
+                }
+                .report-title {
+                    font-size: 32px;
+                    font-weight: 800;
+                    color: #0f172a;
+                    letter-spacing: -0.025em;
+                    margin: 0;
+                    display: inline-block;
+                    position: relative;
+                }
+                .report-title::after {
+                    content: '';
+                    display: block;
+                    width: 60px;
+                    height: 4px;
+                    background: var(--primary);
+                    margin: 15px auto 0;
+                    border-radius: 2px;
+                }
+                .report-subtitle {
+                    font-size: 16px;
+                    color: var(--text-muted);
+                    font-weight: 500;
+                    margin-top: 10px;
+                    text-transform: uppercase;
+                    letter-spacing: 0.05em;
+                }
+                
+""" + _AI_CARDS_CSS + """
+                
+                .footer {
                     text-align: center;
                     color: #94a3b8;
                     font-size: 12px;
@@ -665,1096 +369,509 @@ class Formatter:
                     padding-bottom: 30px;
                     border-top: 1px solid var(--border-color);
                     padding-top: 20px;
-                }}
-
-                @media (max-width: 600px) {{
-                    .flash-grid {{
+                }
+                
+                @media (max-width: 600px) {
+                    .flash-grid {
                         grid-template-columns: 1fr;
-                    }}
-                    .main-container {{
+                    }
+                    .main-container {
                         padding: 20px 15px;
-                    }}
-                    .report-title {{
+                    }
+                    .report-title {
                         font-size: 24px;
-                    }}
-                    .tab-btn {{
-                        padding: 12px 16px;
-                        font-size: 14px;
-                    }}
-                }}
-
-                /* Screenshot Feature Styles */
-                .ai-toolbar {{
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                    flex-wrap: wrap;
-                    gap: 12px;
-                    padding: 12px 16px;
-                    background: linear-gradient(135deg, #f0f9ff 0%, #e0f2fe 100%);
-                    border: 1px solid #bae6fd;
-                    border-radius: 12px;
-                    margin-bottom: 16px;
-                    position: sticky;
-                    top: 0;
-                    z-index: 100;
-                    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.05);
-                }}
-                .toolbar-left {{
-                    display: flex;
-                    align-items: center;
-                    gap: 16px;
-                    flex-wrap: wrap;
-                }}
-                .toolbar-right {{
-                    display: flex;
-                    align-items: center;
-                    gap: 12px;
-                }}
-                .selected-count {{
-                    font-size: 14px;
-                    color: #475569;
-                }}
-                .selected-count strong {{
-                    color: #2563eb;
-                }}
+                    }
+                }
+""")
 
-                /* Card Selection Checkbox */
-                .card-select-wrapper {{
-                    display: inline-flex;
-                    align-items: center;
-                    gap: 8px;
-                    cursor: pointer;
-                    user-select: none;
-                }}
-                .card-select-checkbox {{
-                    width: 20px;
-                    height: 20px;
-                    border: 2px solid #cbd5e1;
-                    border-radius: 4px;
-                    display: flex;
-                    align-items: center;
-                    justify-content: center;
-                    transition: all 0.2s;
-                    flex-shrink: 0;
-                }}
-                .card-select-checkbox svg {{
-                    width: 14px;
-                    height: 14px;
-                    stroke: white;
-                    stroke-width: 3;
-                    fill: none;
-                    opacity: 0;
-                    transition: opacity 0.2s;
-                }}
-                .card-select-wrapper:hover .card-select-checkbox {{
-                    border-color: #2563eb;
-                }}
-                .card-select-wrapper.active .card-select-checkbox {{
-                    background: #2563eb;
-                    border-color: #2563eb;
-                }}
-                .card-select-wrapper.active .card-select-checkbox svg {{
-                    opacity: 1;
-                }}
-                .card-select-label {{
-                    font-size: 14px;
-                    color: #475569;
-                }}
+_AI_CSS_BLOCK = "<style>" + _AI_REPORT_CSS + "</style>"
 
-                /* Card Select Indicator (for cards) */
-                .card-select-indicator {{
-                    position: absolute;
-                    top: 8px;
-                    right: 8px;
-                    width: 18px;
-                    height: 18px;
-                    border: 2px solid #cbd5e1;
-                    border-radius: 50%;
-                    background: white;
-                    cursor: pointer;
-                    transition: all 0.2s;
-                    z-index: 5;
-                }}
-                .card-select-indicator::after {{
-                    content: '';
-                    position: absolute;
-                    top: 50%;
-                    left: 50%;
-                    transform: translate(-50%, -50%) scale(0);
-                    width: 10px;
-                    height: 10px;
-                    background: #2563eb;
-                    border-radius: 50%;
-                    transition: transform 0.2s;
-                }}
-                .theme-card.selected .card-select-indicator,
-                .flash-item.selected .card-select-indicator,
-                .sentiment-box.selected .card-select-indicator {{
-                    border-color: #2563eb;
-                }}
-                .theme-card.selected .card-select-indicator::after,
-                .flash-item.selected .card-select-indicator::after,
-                .sentiment-box.selected .card-select-indicator::after {{
-                    transform: translate(-50%, -50%) scale(1);
-                }}
-                .sentiment-box .card-select-indicator {{
-                    top: 10px;
-                    right: 10px;
-                }}
+# AI 深度版报告 <head> 静态部分（字体、样式整体预拼接，调用时不再参与格式化）
+# AI 报告中不变的外壳（页头、分区外壳、页脚）导入时即编码为 UTF-8 字节，渲染时只需编码动态片段
+_AI_HTML_HEAD = _minify_html("""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="utf-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            """ + _FONT_LINK + """
+            """ + _AI_CSS_BLOCK).encode('utf-8')
 
-                /* Screenshot Button */
-                .screenshot-btn {{
-                    display: inline-flex;
-                    align-items: center;
-                    gap: 8px;
-                    padding: 10px 20px;
-                    background: linear-gradient(135deg, #2563eb 0%, #1d4ed8 100%);
-                    color: white;
-                    border: none;
-                    border-radius: 8px;
-                    font-size: 14px;
-                    font-weight: 600;
-                    cursor: pointer;
-                    transition: all 0.3s;
-                    box-shadow: 0 2px 4px rgba(37, 99, 235, 0.3);
-                }}
-                .screenshot-btn:hover {{
-                    transform: translateY(-2px);
-                    box-shadow: 0 4px 12px rgba(37, 99, 235, 0.4);
-                }}
-                .screenshot-btn:active {{
-                    transform: translateY(0);
-                }}
-                }}
-                .screenshot-btn:disabled {{
-                    background: #94a3b8;
-                    cursor: not-allowed;
-                    transform: none;
-                    box-shadow: none;
-                }}
-                .screenshot-btn .spinner {{
-                    animation: spin 1s linear infinite;
-                }}
-                @keyframes spin {{
-                    from {{ transform: rotate(0deg); }}
-                    to {{ transform: rotate(360deg); }}
-                }}
+# AI 深度版报告页面片段（依次拼接：_AI_HTML_HEAD、页眉、各分区、页脚）
+_AI_REPORT_HEADER_FMT = _minify_html("""
+            <title>金融日报 | AI 深度版 - {date_str}</title>
+        </head>
+        <body>
+            <div class="main-container">
+                <div class="report-header">
+                    <h1 class="report-title">金融日报</h1>
+                    <div class="report-subtitle">AI 深度分析版 · {date_str}</div>
+                </div>
+""").format
 
-                /* Card Selected State */
-                .theme-card, .flash-item {{
-                    transition: all 0.3s ease;
-                }}
-                .theme-card.has-select, .flash-item.has-select {{
-                    cursor: pointer;
-                    border: 2px solid transparent;
-                }}
-                .theme-card.has-select:hover, .flash-item.has-select:hover {{
-                    border-color: #e2e8f0;
-                }}
-                .theme-card.selected, .flash-item.selected {{
-                    border-color: #2563eb;
-                    box-shadow: 0 0 0 3px rgba(37, 99, 235, 0.1);
-                }}
-                .theme-card.excluded, .flash-item.excluded {{
-                    visibility: hidden;
-                    position: absolute;
-                    width: 0;
-                    height: 0;
-                    padding: 0;
-                    margin: 0;
-                    overflow: hidden;
-                }}
-
-                /* Modal */
-                .modal {{
-                    display: none;
-                    position: fixed;
-                    top: 0;
-                    left: 0;
-                    width: 100%;
-                    height: 100%;
-                    background: rgba(0, 0, 0, 0.7);
-                    z-index: 1000;
-                    backdrop-filter: blur(4px);
-                }}
-                .modal.active {{
-                    display: flex;
-                    align-items: center;
-                    justify-content: center;
-                }}
-                .modal-content {{
-                    background: white;
-                    border-radius: 16px;
-                    max-width: 90%;
-                    max-height: 90%;
-                    overflow: auto;
-                    box-shadow: 0 20px 25px -5px rgba(0, 0, 0, 0.1);
-                }}
-                .modal-header {{
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                    padding: 20px 24px;
-                    border-bottom: 1px solid #e2e8f0;
-                }}
-                .modal-header h3 {{
-                    margin: 0;
-                    font-size: 18px;
-                    color: #0f172a;
-                }}
-                .modal-close {{
-                    background: none;
-                    border: none;
-                    font-size: 28px;
-                    color: #64748b;
-                    cursor: pointer;
-                    line-height: 1;
-                }}
-                .modal-close:hover {{
-                    color: #0f172a;
-                }}
-                .modal-body {{
-                    padding: 24px;
-                    text-align: center;
-                    background: #f8fafc;
-                }}
-                .modal-body img {{
-                    max-width: 100%;
-                    border-radius: 8px;
-                    box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-                }}
-                .modal-footer {{
-                    display: flex;
-                    gap: 12px;
-                    justify-content: center;
-                    padding: 20px 24px;
-                    border-top: 1px solid #e2e8f0;
-                }}
-                .btn-primary, .btn-secondary {{
-                    padding: 10px 24px;
-                    border-radius: 8px;
-                    font-size: 14px;
-                    font-weight: 600;
-                    cursor: pointer;
-                    transition: all 0.2s;
-                    display: inline-flex;
-                    align-items: center;
-                    gap: 8px;
-                }}
-                .btn-primary {{
-                    background: #2563eb;
-                    color: white;
-                    border: none;
-                }}
-                .btn-primary:hover {{
-                    background: #1d4ed8;
-                }}
-                .btn-secondary {{
-                    background: white;
-                    color: #475569;
-                    border: 1px solid #cbd5e1;
-                }}
-                .btn-secondary:hover {{
-                    background: #f8fafc;
-                }}
-                .toast {{
-                    position: fixed;
-                    bottom: 30px;
-                    left: 50%;
-                    transform: translateX(-50%) translateY(100px);
-                    background: #0f172a;
-                    color: white;
-                    padding: 12px 24px;
-                    border-radius: 8px;
-                    font-size: 14px;
-                    opacity: 0;
-                    transition: all 0.3s;
-                    z-index: 1001;
-                }}
-                .toast.show {{
-                    transform: translateX(-50%) translateY(0);
-                    opacity: 1;
-                }}
-
-                /* Dedicated Screenshot Container (Mobile Optimized) */
-                #capture-container {{
-                    position: fixed;
-                    left: -9999px;
-                    top: 0;
-                    width: 375px;
-                    background: #ffffff;
-                    padding: 16px;
-                    box-sizing: border-box;
-                }}
+_AI_SENTIMENT_FMT = _minify_html("""
+            <div class="sentiment-box glass-effect">
+                <div class="box-header"><span class="icon">📈</span> 市场情绪与宏观综述</div>
+                <div class="box-content">{content}</div>
+            </div>
+            """).format
 
-                /* Mobile-optimized capture card style */
-                .capture-card {{
-                    margin-bottom: 16px;
-                    background: #fff;
-                    border-radius: 12px;
-                    overflow: hidden;
-                }}
+_AI_THEMES_OPEN = _minify_html("""
+            <div class="section-container">
+                <div class="section-header">
+                    <span class="section-icon">🧐</span> 深度专题
+                </div>
+                <div class="themes-grid">""").encode('utf-8')
 
-                /* Screenshot title */
-                .capture-title {{
-                    font-size: 20px;
-                    font-weight: 700;
-                    text-align: center;
-                    padding: 16px 0;
-                    margin-bottom: 8px;
-                    color: #0f172a;
-                }}
-            </style>
-        </head>
-        <body class="view-mode">
-            <div class="main-container">
-                <div class="report-header">
-                    <h1 class="report-title">金融日报</h1>
-                    <div class="report-subtitle">{date_str}</div>
-                    <div class="mode-toggle-wrap">
-                        <label class="mode-switch"><input type="checkbox" id="mode-switch"><span class="slider"></span></label>
-                        <span class="mode-label">截屏模式</span>
-                    </div>
+_AI_FLASH_OPEN = _minify_html("""
+            <div class="section-container">
+                <div class="section-header">
+                    <span class="section-icon">⚡</span> 资讯速递
                 </div>
+                <div class="flash-grid">""").encode('utf-8')
 
-                <!-- Tab Navigation -->
-                <div class="tab-nav">
-                    <button class="tab-btn active" data-tab="ai-analysis">AI 深度分析</button>
-                    <button class="tab-btn" data-tab="all-articles">全部资讯 <span class="tab-count">{article_count}</span></button>
+_AI_SECTION_CLOSE = _minify_html("""
                 </div>
+            </div>
+            """).encode('utf-8')
 
-                <!-- Tab Content -->
-                <div class="tab-content">
-                    <!-- Tab 1: AI Analysis -->
-                    <div id="ai-analysis" class="tab-pane active">
-                        <!-- Screenshot Toolbar -->
-                        <div class="ai-toolbar" id="ai-toolbar">
-                            <div class="toolbar-left">
-                                <label class="card-select-wrapper" data-card="sentiment">
-                                    <div class="card-select-checkbox">
-                                        <svg viewBox="0 0 24 24"><polyline points="20 6 9 17 4 12"></polyline></svg>
-                                    </div>
-                                    <span class="card-select-label">市场综述</span>
-                                </label>
-                                <label class="card-select-wrapper" data-card="themes">
-                                    <div class="card-select-checkbox">
-                                        <svg viewBox="0 0 24 24"><polyline points="20 6 9 17 4 12"></polyline></svg>
-                                    </div>
-                                    <span class="card-select-label">深度专题</span>
-                                </label>
-                                <label class="card-select-wrapper" data-card="flash">
-                                    <div class="card-select-checkbox">
-                                        <svg viewBox="0 0 24 24"><polyline points="20 6 9 17 4 12"></polyline></svg>
-                                    </div>
-                                    <span class="card-select-label">资讯速递</span>
-                                </label>
-                            </div>
-                            <div class="toolbar-right">
-                                <span class="selected-count">已选择 <strong id="selected-count">3</strong> 项</span>
-                                <button id="screenshot-btn" class="screenshot-btn">
-                                    <svg width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><rect x="3" y="3" width="18" height="18" rx="2" ry="2"/><circle cx="8.5" cy="8.5" r="1.5"/><polyline points="21 15 16 10 5 21"/></svg>
-                                    生成长截图
-                                </button>
-                            </div>
-                        </div>
+# 专题关联报道链接区（位置参数：已拼接好的来源标签）
+_REF_LINKS_FMT = '<div class="ref-links"><span class="ref-label">相关报道:</span> {}</div>'.format
 
-                        {ai_html if ai_html else '<p style="color: var(--text-muted); text-align: center; padding: 40px;">暂无 AI 分析数据</p>'}
+# 单个专题卡片（预绑定 str.format；字段均需调用方转义）
+_THEME_CARD_FMT = _minify_html("""
+                <div class="theme-card">
+                    <div class="theme-header">
+                        <span class="theme-title">{title}</span>
+                        <span class="importance {imp_class}">{imp}关注</span>
                     </div>
-
-                    <!-- Screenshot Modal -->
-                    <div id="screenshot-modal" class="modal">
-                        <div class="modal-content">
-                            <div class="modal-header">
-                                <h3>截图预览</h3>
-                                <button class="modal-close">&times;</button>
-                            </div>
-                            <div class="modal-body">
-                                <img id="screenshot-preview" src="" alt="截图预览">
-                            </div>
-                            <div class="modal-footer">
-                                <button id="copy-btn" class="btn-primary">
-                                    <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><rect x="9" y="9" width="13" height="13" rx="2" ry="2"/><path d="M5 15H4a2 2 0 0 1-2-2V4a2 2 0 0 1 2-2h9a2 2 0 0 1 2 2v1"/></svg>
-                                    复制图片
-                                </button>
-                                <button id="download-btn" class="btn-secondary">
-                                    <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M21 15v4a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2v-4"/><polyline points="7 10 12 15 17 10"/><line x1="12" y1="15" x2="12" y2="3"/></svg>
-                                    下载 PNG
-                                </button>
-                            </div>
+                    <div class="theme-body">
+                        <div class="summary-section">
+                            {summary}
+                        </div>
+                        <div class="insight-section">
+                            <div class="insight-label">💡 研究员洞察</div>
+                            <div class="insight-text">{insight}</div>
                         </div>
+                        {refs}
                     </div>
+                </div>
+                """).format
 
-                    <!-- Toast -->
-                    <div id="toast" class="toast"></div>
-
-                    <!-- Tab 2: All Articles -->
-                    <div id="all-articles" class="tab-pane">
-                        {articles_html}
+# 单条资讯速递
+_FLASH_ITEM_FMT = _minify_html("""
+                <div class="flash-item">
+                    <div class="flash-content">
+                        <div class="flash-title">
+                            {title} {source}
+                        </div>
+                        <div class="flash-comment">
+                            {comment}
+                        </div>
                     </div>
                 </div>
+                """).format
 
+_AI_REPORT_FOOTER = _minify_html("""
                 <div class="footer">
-                    Generated by Financial News Collector • AI 分析由 MiniMax M2.1 提供
+                    Created by AI News Collector • Powered by MiniMax M2.1
                 </div>
             </div>
+        </body>
+        </html>
+        """).encode('utf-8')
 
-            <script src="https://cdnjs.cloudflare.com/ajax/libs/html2canvas/1.4.1/html2canvas.min.js"></script>
-            <script>
-                // Tab switching logic
-                document.querySelectorAll('.tab-btn').forEach(btn => {{
-                    btn.addEventListener('click', function() {{
-                        // Remove active class from all buttons
-                        document.querySelectorAll('.tab-btn').forEach(b => b.classList.remove('active'));
-                        // Add active class to clicked button
-                        this.classList.add('active');
-
-                        // Hide all tab panes
-                        document.querySelectorAll('.tab-pane').forEach(pane => pane.classList.remove('active'));
-                        // Show target tab pane
-                        const targetTab = this.getAttribute('data-tab');
-                        document.getElementById(targetTab).classList.add('active');
-                    }});
-                }});
-
-                // Check URL hash for initial tab
-                if (window.location.hash === '#articles') {{
-                    document.querySelector('[data-tab="all-articles"]').click();
-                }}
-
-                // ============ Screenshot Feature ============
-                (function() {{
-                    'use strict';
+# 历史归档页样式
+_ARCHIVE_CSS = _minify_css("""
+                :root {
+                    --primary: #2563eb;
+                    --bg-page: #f8fafc;
+                    --text-main: #1e293b;
+                    --text-muted: #64748b;
+                    --border-color: #e2e8f0;
+                }
 
-                    const ScreenshotManager = {{
-                        selectedCards: new Set(),
-                        currentImageData: null,
-                        currentBlob: null,
-                        currentObjectUrl: null,
+                body {
+                    font-family: 'Inter', 'Noto Sans SC', sans-serif;
+                    line-height: 1.6;
+                    color: var(--text-main);
+                    background-color: var(--bg-page);
+                    margin: 0;
+                    padding: 0;
+                    -webkit-font-smoothing: antialiased;
+                }
 
-                        init: function() {{
-                            this.cacheElements();
-                            this.bindEvents();
-                            this.initMode();
-                            this.selectAllCards();
-                            this.updateCount();
-                        }},
+                .main-container {
+                    max-width: 800px;
+                    margin: 0 auto;
+                    padding: 40px 20px;
+                }
 
-                        resetCaptureOutput: function() {{
-                            this.currentImageData = null;
-                            this.currentBlob = null;
-                            if (this.currentObjectUrl) {{
-                                try {{ URL.revokeObjectURL(this.currentObjectUrl); }} catch (e) {{}}
-                                this.currentObjectUrl = null;
-                            }}
-                            if (this.previewImg) {{
-                                this.previewImg.src = '';
-                            }}
-                        }},
+                .report-header {
+                    text-align: center;
+                    margin-bottom: 50px;
+                }
+                .report-title {
+                    font-size: 32px;
+                    font-weight: 800;
+                    color: #0f172a;
+                    letter-spacing: -0.025em;
+                    margin: 0;
+                }
+                .report-title::after {
+                    content: '';
+                    display: block;
+                    width: 60px;
+                    height: 4px;
+                    background: var(--primary);
+                    margin: 15px auto 0;
+                    border-radius: 2px;
+                }
+                .report-subtitle {
+                    font-size: 16px;
+                    color: var(--text-muted);
+                    font-weight: 500;
+                    margin-top: 10px;
+                }
 
-                        canvasToBlob: function(canvas) {{
-                            return new Promise(function(resolve, reject) {{
-                                if (canvas && canvas.toBlob) {{
-                                    canvas.toBlob(function(blob) {{
-                                        if (blob) return resolve(blob);
-                                        reject(new Error('toBlob returned null'));
-                                    }}, 'image/png', 1.0);
-                                    return;
-                                }}
+                .year-section {
+                    margin-bottom: 40px;
+                }
+                .year-header {
+                    font-size: 24px;
+                    font-weight: 700;
+                    color: #0f172a;
+                    margin-bottom: 20px;
+                    padding-bottom: 10px;
+                    border-bottom: 2px solid var(--border-color);
+                }
 
-                                // Fallback: dataURL -> fetch -> blob
-                                try {{
-                                    var dataUrl = canvas.toDataURL('image/png', 1.0);
-                                    fetch(dataUrl)
-                                        .then(function(res) {{ return res.blob(); }})
-                                        .then(resolve)
-                                        .catch(reject);
-                                }} catch (e) {{
-                                    reject(e);
-                                }}
-                            }});
-                        }},
+                .archive-list {
+                    display: flex;
+                    flex-direction: column;
+                    gap: 12px;
+                }
+                .archive-item {
+                    display: flex;
+                    align-items: flex-start;
+                    gap: 20px;
+                    padding: 16px;
+                    background: white;
+                    border-radius: 12px;
+                    border: 1px solid var(--border-color);
+                    transition: all 0.2s;
+                }
+                .archive-item:hover {
+                    border-color: #cbd5e1;
+                    box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
+                }
+                .archive-date {
+                    font-size: 15px;
+                    font-weight: 600;
+                    color: #0f172a;
+                    white-space: nowrap;
+                    min-width: 80px;
+                }
+                .weekday {
+                    font-size: 12px;
+                    color: var(--text-muted);
+                    font-weight: 400;
+                    margin-left: 4px;
+                }
+                .archive-content {
+                    flex: 1;
+                }
+                .archive-link {
+                    font-size: 15px;
+                    font-weight: 500;
+                    color: var(--primary);
+                    text-decoration: none;
+                    display: block;
+                }
+                .archive-link:hover {
+                    text-decoration: underline;
+                }
+                .archive-summary {
+                    font-size: 13px;
+                    color: var(--text-muted);
+                    margin-top: 6px;
+                    line-height: 1.5;
+                }
 
-                        initMode: function() {{
-                            var saved = localStorage.getItem('reportMode');
-                            if (saved === 'capture') {{
-                                document.body.classList.remove('view-mode');
-                                this.modeSwitch.checked = true;
-                            }}
-                        }},
+                .footer {
+                    text-align: center;
+                    color: #94a3b8;
+                    font-size: 12px;
+                    margin-top: 60px;
+                    padding-bottom: 30px;
+                    border-top: 1px solid var(--border-color);
+                    padding-top: 20px;
+                }
 
-                        cacheElements: function() {{
-                            this.toolbar = document.getElementById('ai-toolbar');
-                            this.screenshotBtn = document.getElementById('screenshot-btn');
-                            this.modal = document.getElementById('screenshot-modal');
-                            this.previewImg = document.getElementById('screenshot-preview');
-                            this.copyBtn = document.getElementById('copy-btn');
-                            this.downloadBtn = document.getElementById('download-btn');
-                            this.toast = document.getElementById('toast');
-                            this.aiAnalysis = document.getElementById('ai-analysis');
-                            this.captureContainer = document.getElementById('capture-container');
-                            this.modeSwitch = document.getElementById('mode-switch');
-                        }},
+                .stats {
+                    text-align: center;
+                    color: var(--text-muted);
+                    font-size: 14px;
+                    margin-bottom: 40px;
+                }
 
-                        bindEvents: function() {{
-                            var self = this;
+                @media (max-width: 600px) {
+                    .archive-item {
+                        flex-direction: column;
+                        gap: 8px;
+                    }
+                    .archive-date {
+                        font-size: 13px;
+                    }
+                }
+""")
 
-                            // Card selection toggles
-                            document.querySelectorAll('.card-select-wrapper').forEach(function(wrapper) {{
-                                wrapper.addEventListener('click', function(e) {{
-                                    e.preventDefault();
-                                    e.stopPropagation();
-                                    var cardType = this.getAttribute('data-card');
-                                    if (cardType) {{
-                                        self.toggleCardType(cardType);
-                                    }}
-                                }});
-                            }});
+_ARCHIVE_CSS_BLOCK = "<style>" + _ARCHIVE_CSS + "</style>"
 
-                            // Individual card selection
-                            document.querySelectorAll('.sentiment-box, .theme-card, .flash-item').forEach(function(card) {{
-                                card.addEventListener('click', function() {{
-                                    self.toggleCard(this);
-                                }});
-                            }});
+# 历史归档页 <head>（完全静态）
+_ARCHIVE_HTML_HEAD = _minify_html("""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="utf-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <title>金融日报 | 历史归档</title>
+            """ + _FONT_LINK + """
+            """ + _ARCHIVE_CSS_BLOCK + """
+        </head>""")
 
-                            // Screenshot button
-                            this.screenshotBtn.addEventListener('click', function() {{
-                                self.captureScreenshot();
-                            }});
+# 归档列表单行
+_ARCHIVE_ITEM_FMT = _minify_html("""
+                <div class="archive-item">
+                    <div class="archive-date">{date} <span class="weekday">{wd}</span></div>
+                    <div class="archive-content">
+                        <a href="{url}" class="archive-link">{title}</a>
+                        {summary}
+                    </div>
+                </div>
+                """).format
 
-                            // Modal close
-                            document.querySelector('.modal-close').addEventListener('click', function() {{
-                                self.closeModal();
-                            }});
+_ARCHIVE_SUMMARY_FMT = '<div class="archive-summary">{}</div>'.format
 
-                            this.copyBtn.addEventListener('click', function() {{
-                                self.copyToClipboard();
-                            }});
+# 年份分组（items 处为该年的归档行）
+_YEAR_SECTION = _minify_html("""
+            <div class="year-section">
+                <div class="year-header">{year}年</div>
+                <div class="archive-list">
+                    {items}
+                </div>
+            </div>
+            """)
 
-                            this.downloadBtn.addEventListener('click', function() {{
-                                self.downloadImage();
-                            }});
+# 拆成前后两段，归档行直接追加到整页的片段列表中，不再为每个年份单独拼接
+_YEAR_OPEN, _YEAR_CLOSE = _YEAR_SECTION.split("{items}")
+_YEAR_OPEN_FMT = _YEAR_OPEN.format
 
-                            // Close modal on background click
-                            this.modal.addEventListener('click', function(e) {{
-                                if (e.target === self.modal) {{
-                                    self.closeModal();
-                                }}
-                            }});
+# 历史归档页 <body>（str.format 字段：report_count, year_count；year_sections_html 处为各年份分组）
+_ARCHIVE_PAGE = _minify_html("""
+        <body>
+            <div class="main-container">
+                <div class="report-header">
+                    <h1 class="report-title">金融日报</h1>
+                    <div class="report-subtitle">历史归档</div>
+                </div>
 
-                            // Mode switch
-                            this.modeSwitch.addEventListener('change', function() {{
-                                if (this.checked) {{
-                                    document.body.classList.remove('view-mode');
-                                    localStorage.setItem('reportMode', 'capture');
-                                }} else {{
-                                    document.body.classList.add('view-mode');
-                                    localStorage.setItem('reportMode', 'view');
-                                }}
-                            }});
-                        }},
+                <div class="stats">共 {report_count} 期 · {year_count} 年</div>
 
-                        toggleCardType: function(cardType) {{
-                            var wrappers = document.querySelectorAll('.card-select-wrapper[data-card="' + cardType + '"]');
-                            var cards = document.querySelectorAll('[data-card-type="' + cardType + '"]');
+                {year_sections_html}
 
-                            // Check if all cards of this type are selected
-                            var allSelected = true;
-                            cards.forEach(function(card) {{
-                                if (!this.selectedCards.has(card)) {{
-                                    allSelected = false;
-                                }}
-                            }}.bind(this));
+                <div class="footer">
+                    Generated by Financial News Collector
+                </div>
+            </div>
+        </body>
+        </html>
+        """)
+
+_ARCHIVE_PAGE_OPEN, _ARCHIVE_PAGE_CLOSE = _ARCHIVE_PAGE.split("{year_sections_html}")
+_ARCHIVE_PAGE_OPEN_FMT = _ARCHIVE_PAGE_OPEN.format
+
+
+def _render_year_section(year_group: tuple) -> str:
+    """
+    渲染一个年份分组
+
+    Args:
+        year_group: (年份, [(date_obj, report), ...])，报告已按日期降序
+    """
+    year, year_reports = year_group
+    # 循环内用到的常量表绑定为局部变量，避免每行重复的全局查找
+    weekdays = _WEEKDAYS_CN
+
+    parts = [_YEAR_OPEN_FMT(year=year)]
+    append = parts.append
+    for date_obj, report in year_reports:
+        # 月日直接切片 ISO 日期串，星期取自已解析的日期
+        date_str = report['date']
+        # 摘要只取一次值，条件判断放在模板调用之外
+        summary = report.get('summary')
+        summary_html = _ARCHIVE_SUMMARY_FMT(_esc(summary)) if summary else ''
+        append(_ARCHIVE_ITEM_FMT(
+            date=f"{date_str[5:7]}月{date_str[8:10]}日",
+            wd=weekdays[date_obj.weekday()],
+            url=_esc(report['url']),
+            title=_esc(report['title']),
+            summary=summary_html,
+        ))
+    append(_YEAR_CLOSE)
+    return "".join(parts)
+
+
+# 基础版（邮件）报告样式
+_BASIC_CSS = _minify_css("""
+                body { font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif; line-height: 1.6; color: #333; max-width: 800px; margin: 0 auto; padding: 20px; }
+                h1 { color: #2c3e50; border-bottom: 2px solid #2c3e50; padding-bottom: 10px; }
+                h2 { color: #34495e; margin-top: 30px; border-left: 5px solid #3498db; padding-left: 10px; }
+                .article-item { margin-bottom: 20px; padding-bottom: 20px; border-bottom: 1px solid #eee; }
+                .article-item h3 { margin-bottom: 5px; font-size: 16px; }
+                .article-item a { color: #2980b9; text-decoration: none; }
+                .meta { font-size: 12px; color: #7f8c8d; margin-bottom: 5px; }
+                .summary { font-size: 14px; color: #555; margin: 0; }
+""")
+
+# 基础版（邮件）报告 <head>：样式在导入时拼入，渲染时不再代入 CSS
+_BASIC_HTML_HEAD = _minify_html("""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="utf-8">
+            <style>""" + _BASIC_CSS + """</style>
+        </head>""")
 
-                            // Toggle
-                            wrappers.forEach(function(wrapper) {{
-                                if (allSelected) {{
-                                    wrapper.classList.remove('active');
-                                }} else {{
-                                    wrapper.classList.add('active');
-                                }}
-                            }});
+# 基础版（邮件）报告 <body>（str.format 字段：date_str, sections_html, generated_at）
+_BASIC_PAGE_FMT = _minify_html("""
+        <body>
+            <h1>金融资讯日报 <small>{date_str}</small></h1>
+            {sections_html}
+            <footer>
+                <p>Generated by Financial News Collector at {generated_at}</p>
+            </footer>
+        </body>
+        </html>
+        """).format
 
-                            cards.forEach(function(card) {{
-                                if (allSelected) {{
-                                    card.classList.remove('selected');
-                                    this.selectedCards.delete(card);
-                                }} else {{
-                                    card.classList.add('selected');
-                                    this.selectedCards.add(card);
-                                }}
-                            }}.bind(this));
+# 合并版报告 AI 分析区片段（卡片可勾选截图，结构与独立 AI 报告不同；字段均需调用方转义）
+_COMBINED_SENTIMENT_FMT = _minify_html("""
+            <div class="sentiment-box glass-effect has-select selected" data-card-type="sentiment">
+                <div class="card-select-indicator"></div>
+                <div class="box-header"><span class="icon">📈</span> 市场情绪与宏观综述</div>
+                <div class="box-content">{content}</div>
+            </div>
+            """).format
 
-                            this.updateCount();
-                        }},
+_COMBINED_THEME_CARD_FMT = _minify_html("""
+                <div class="theme-card has-select selected" data-card-type="theme">
+                    <div class="card-select-indicator"></div>
+                    <div class="theme-header">
+                        <span class="theme-title">{title}</span>
+                        <span class="importance {imp_class}">{imp}关注</span>
+                    </div>
+                    <div class="theme-body">
+                        <div class="summary-section">
+                            {summary}
+                        </div>
+                        <div class="insight-section">
+                            <div class="insight-label">💡 研究员洞察</div>
+                            <div class="insight-text">{insight}</div>
+                        </div>
+                        {refs}
+                    </div>
+                </div>
+                """).format
 
-                        toggleCard: function(card) {{
-                            if (this.selectedCards.has(card)) {{
-                                card.classList.remove('selected');
-                                this.selectedCards.delete(card);
-                            }} else {{
-                                card.classList.add('selected');
-                                this.selectedCards.add(card);
-                            }}
-                            this.updateCount();
-                            // Update toolbar checkbox based on card type
-                            this.updateToolbarCheckbox(card.getAttribute('data-card-type'));
-                        }},
+_COMBINED_THEMES_FMT = _minify_html("""
+            <div class="section-container">
+                <div class="section-header">
+                    <span class="section-icon">🧐</span> 深度专题
+                </div>
+                <div class="themes-grid">
+                    {cards}
+                </div>
+            </div>
+            """).format
 
-                        selectAllCards: function() {{
-                            document.querySelectorAll('.has-select').forEach(function(card) {{
-                                card.classList.add('selected');
-                                this.selectedCards.add(card);
-                            }}.bind(this));
-                            // Update all toolbar checkboxes
-                            this.updateToolbarCheckbox('sentiment');
-                            this.updateToolbarCheckbox('themes');
-                            this.updateToolbarCheckbox('flash');
-                        }},
+_COMBINED_FLASH_ITEM_FMT = _minify_html("""
+                <div class="flash-item has-select selected" data-card-type="flash">
+                    <div class="card-select-indicator"></div>
+                    <div class="flash-content">
+                        <div class="flash-title">
+                            {title} {source}
+                        </div>
+                        <div class="flash-comment">
+                            {comment}
+                        </div>
+                    </div>
+                </div>
+                """).format
 
-                        deselectAllCards: function() {{
-                            document.querySelectorAll('.has-select').forEach(function(card) {{
-                                card.classList.remove('selected');
-                                this.selectedCards.delete(card);
-                            }}.bind(this));
-                            // Update all toolbar checkboxes
-                            this.updateToolbarCheckbox('sentiment');
-                            this.updateToolbarCheckbox('themes');
-                            this.updateToolbarCheckbox('flash');
-                        }},
+_COMBINED_FLASH_FMT = _minify_html("""
+            <div class="section-container">
+                <div class="section-header">
+                    <span class="section-icon">⚡</span> 资讯速递
+                </div>
+                <div class="flash-grid">
+                    {items}
+                </div>
+            </div>
+            """).format
 
-                        updateCount: function() {{
-                            var count = this.selectedCards.size;
-                            var countEl = document.getElementById('selected-count');
-                            if (countEl) {{
-                                countEl.textContent = count;
-                            }}
-                            this.screenshotBtn.disabled = count === 0;
-                        }},
 
-                        updateToolbarCheckbox: function(cardType) {{
-                            var wrappers = document.querySelectorAll('.card-select-wrapper[data-card="' + cardType + '"]');
-                            var cards = document.querySelectorAll('[data-card-type="' + cardType + '"]');
-                            var allSelected = true;
+def _as_text(value):
+    """AI JSON 字段统一为 str / None（模型偶尔返回数字、列表或对象，按 str() 显示）"""
+    return value if value is None or isinstance(value, str) else str(value)
 
-                            cards.forEach(function(card) {{
-                                if (!this.selectedCards.has(card)) {{
-                                    allSelected = false;
-                                }}
-                            }}.bind(this));
 
-                            wrappers.forEach(function(wrapper) {{
-                                if (allSelected) {{
-                                    wrapper.classList.add('active');
-                                }} else {{
-                                    wrapper.classList.remove('active');
-                                }}
-                            }});
-                        }},
+def _render_theme_card(title, imp, summary, insight, refs: str, selectable: bool = False) -> str:
+    """
+    渲染单个专题卡片（字段先统一为字符串，再走按原始文本缓存的渲染）
 
-                        hideUnselectedCards: function() {{
-                            document.querySelectorAll('.has-select').forEach(function(card) {{
-                                if (!this.selectedCards.has(card)) {{
-                                    card.classList.add('excluded');
-                                }}
-                            }}.bind(this));
-                        }},
+    Args:
+        refs: 已拼接好的关联报道 HTML
+        selectable: 合并版报告中可勾选截图的卡片样式
+    """
+    return _render_theme_card_cached(
+        _as_text(title), _as_text(imp), _as_text(summary), _as_text(insight), refs, selectable
+    )
 
-                        showAllCards: function() {{
-                            document.querySelectorAll('.has-select.excluded').forEach(function(card) {{
-                                card.classList.remove('excluded');
-                            }});
-                        }},
 
-                        showToast: function(message) {{
-                            this.toast.textContent = message;
-                            this.toast.classList.add('show');
-                            setTimeout(function() {{
-                                this.toast.classList.remove('show');
-                            }}.bind(this), 2000);
-                        }},
+@lru_cache(maxsize=2048)
+def _render_theme_card_cached(title, imp, summary, insight, refs: str, selectable: bool) -> str:
+    """按原始文本缓存专题卡片（同一专题在多次渲染/多种报告间重复出现时直接命中）"""
+    fmt = _COMBINED_THEME_CARD_FMT if selectable else _THEME_CARD_FMT
+    imp_class, imp_label = _IMP_TABLE.get(imp) or ("imp-med", _esc(imp))
+    return fmt(
+        title=_esc(title),
+        imp_class=imp_class,
+        imp=imp_label,
+        summary=_esc(summary),
+        insight=_esc(insight),
+        refs=refs,
+    )
 
-                        // Mobile-optimized: Prepare cards in dedicated container
-                        preCapture: function() {{
-                            var container = this.captureContainer;
-                            if (!container) return;
 
-                            // Clear previous content
-                            container.innerHTML = '';
+def _render_flash_item(title, source: str, comment, selectable: bool = False) -> str:
+    """渲染单条资讯速递，处理方式同 _render_theme_card（source 为已转义的来源链接 HTML）"""
+    return _render_flash_item_cached(_as_text(title), source, _as_text(comment), selectable)
 
-                            // Add title with date
-                            var title = document.createElement('div');
-                            title.className = 'capture-title';
-                            var subtitleEl = document.querySelector('.report-subtitle');
-                            var dateText = subtitleEl ? subtitleEl.textContent : '';
-                            title.textContent = '金融日报 ' + dateText;
-                            container.appendChild(title);
 
-                            // Clone selected cards in DOM order (maintains original order)
-                            var allCards = document.querySelectorAll('.has-select');
-                            allCards.forEach(function(card) {{
-                                if (this.selectedCards.has(card)) {{
-                                    var clone = card.cloneNode(true);
+@lru_cache(maxsize=2048)
+def _render_flash_item_cached(title, source: str, comment, selectable: bool) -> str:
+    """按原始文本缓存资讯速递条目"""
+    fmt = _COMBINED_FLASH_ITEM_FMT if selectable else _FLASH_ITEM_FMT
+    return fmt(title=_esc(title), source=source, comment=_esc(comment))
 
-                                    // Remove selection indicator
-                                    var indicator = clone.querySelector('.card-select-indicator');
-                                    if (indicator) indicator.remove();
-
-                                    // Remove selection-related classes
-                                    clone.classList.remove('selected', 'has-select', 'excluded');
-
-                                    // Convert position:fixed to relative (html2canvas fix)
-                                    clone.querySelectorAll('*').forEach(function(el) {{
-                                        var style = window.getComputedStyle(el);
-                                        if (style.position === 'fixed') {{
-                                            el.style.position = 'relative';
-                                        }}
-                                    }});
-
-                                    // Wrap in capture-card for mobile optimization
-                                    var wrapper = document.createElement('div');
-                                    wrapper.className = 'capture-card';
-                                    wrapper.appendChild(clone);
-                                    container.appendChild(wrapper);
-                                }}
-                            }}.bind(this));
-                        }},
-
-                        captureScreenshot: function() {{
-                            var self = this;
-                            var btn = this.screenshotBtn;
-                            var originalHTML = btn.innerHTML;
-
-                            btn.innerHTML = '<svg class="spinner" viewBox="0 0 24 24" width="18" height="18"><circle cx="12" cy="12" r="10" stroke="currentColor" stroke-width="3" fill="none" stroke-dasharray="30 60"/></svg> 生成中...';
-                            btn.disabled = true;
-
-                            // Prepare cards in dedicated container
-                            this.preCapture();
-                            this.resetCaptureOutput();
-
-                            // Use the cached capture container
-                            var container = this.captureContainer;
-                            if (!container || container.children.length === 0) {{
-                                this.showToast('请先选择要截图的卡片');
-                                btn.innerHTML = originalHTML;
-                                btn.disabled = false;
-                                return;
-                            }}
-
-                            // Use dedicated container for capture
-                            html2canvas(container, {{
-                                useCORS: true,
-                                allowTaint: true,
-                                backgroundColor: '#ffffff',
-                                scale: 2,  // Retina quality
-                                width: 375,  // Mobile width
-                                logging: false
-                            }}).then(function(canvas) {{
-                                // Prefer Blob/ObjectURL to avoid extremely long data URLs being truncated on download.
-                                return self.canvasToBlob(canvas).then(function(blob) {{
-                                    self.currentBlob = blob;
-                                    self.currentObjectUrl = URL.createObjectURL(blob);
-                                    self.previewImg.src = self.currentObjectUrl;
-                                    self.modal.classList.add('active');
-
-                                    // Mobile: show long-press hint
-                                    if (/Mobile|Android|iPhone/i.test(navigator.userAgent)) {{
-                                        self.showToast('长按图片保存到相册');
-                                    }}
-                                }});
-                            }}).catch(function(error) {{
-                                console.error('Screenshot failed:', error);
-                                self.showToast('截图失败，请重试');
-                            }}).finally(function() {{
-                                btn.innerHTML = originalHTML;
-                                btn.disabled = self.selectedCards.size === 0;
-                            }});
-                        }},
-
-                        closeModal: function() {{
-                            this.modal.classList.remove('active');
-                        }},
-
-                        downloadImage: function() {{
-                            if (!this.currentBlob && !this.currentImageData) return;
-
-                            var link = document.createElement('a');
-                            var date = new Date().toISOString().slice(0, 10);
-                            link.download = '金融日报-AI分析-' + date + '.png';
-                            if (this.currentBlob && window.URL && URL.createObjectURL) {{
-                                var downloadUrl = URL.createObjectURL(this.currentBlob);
-                                link.href = downloadUrl;
-                                link.click();
-                                setTimeout(function() {{
-                                    try {{ URL.revokeObjectURL(downloadUrl); }} catch (e) {{}}
-                                }}, 10000);
-                                return;
-                            }}
-
-                            link.href = this.currentImageData;
-                            link.click();
-                        }},
-
-                        copyToClipboard: function() {{
-                            var self = this;
-                            if (!this.currentBlob && !this.currentImageData) return;
-
-                            var blobPromise = this.currentBlob
-                                ? Promise.resolve(this.currentBlob)
-                                : fetch(this.currentImageData).then(function(res) {{ return res.blob(); }});
-
-                            blobPromise.then(function(blob) {{
-                                    var item = new ClipboardItem({{ 'image/png': blob }});
-                                    return navigator.clipboard.write([item]);
-                                }})
-                                .then(function() {{
-                                    self.showToast('已复制到剪贴板');
-                                    self.closeModal();
-                                }})
-                                .catch(function(error) {{
-                                    console.error('Copy failed:', error);
-                                    self.showToast('复制失败，请手动保存');
-                                }});
-                        }}
-                    }};
-
-                    // Initialize on DOM ready
-                    if (document.readyState === 'loading') {{
-                        document.addEventListener('DOMContentLoaded', function() {{
-                            ScreenshotManager.init();
-                        }});
-                    }} else {{
-                        ScreenshotManager.init();
-                    }}
-                }})();
-            </script>
-
-            <!-- Dedicated Screenshot Container (Hidden, for Mobile Optimized Capture) -->
-            <div id="capture-container"></div>
-        </body>
-        </html>
-        """
-
-    def format_for_telegram(self, articles: List[NewsArticle], date: datetime = None) -> str:
-        """
-        格式化为 Telegram 消息 (HTML)
-        """
-        import html
-        
-        if not articles:
-            return "今日暂无资讯"
-
-        if date is None:
-            date = datetime.now()
-
-        date_str = date.strftime('%Y-%m-%d')
-        content = f"<b>{date_str} 金融资讯日报</b>\n\n"
-
-        # 按分类
-        categorized = self._categorize_articles(articles)
-        
-        # 排序
-        sorted_keys = sorted(categorized.keys(), 
-                           key=lambda x: list(self.CATEGORY_NAMES.keys()).index(x) if x in self.CATEGORY_NAMES else 999)
-
-        idx = 1
-        for category in sorted_keys:
-            cat_list = categorized[category]
-            cat_name = self.CATEGORY_NAMES.get(category, category.upper())
-            
-            content += f"<b>{cat_name}</b>\n"
-            for art in cat_list:
-                # 使用 HTML 格式，必须转义标题中的特殊字符
-                safe_title = html.escape(art.title)
-                content += f"{idx}. <a href=\"{art.url}\">{safe_title}</a>\n"
-                idx += 1
-            content += "\n"
-
-        content += f"共 {len(articles)} 篇 | Generated by News Collector"
-        return content
-
-    def _categorize_articles(self, articles: List[NewsArticle]) -> Dict[str, List[NewsArticle]]:
-        """按分类整理文章"""
-        categorized = {}
-        for article in articles:
-            cat = article.category or 'other'
-            if cat not in categorized:
-                categorized[cat] = []
-            categorized[cat].append(article)
-        return categorized
-
-    def _generate_html(self, categorized_articles: Dict[str, List[NewsArticle]], date: datetime) -> str:
-        """生成标准的基础 HTML 报告"""
-        date_str = date.strftime('%Y年%m月%d日')
-        
-        sections_html = ""
-        
-        # 排序：优先显示配置中定义的分类
-        sorted_keys = sorted(categorized_articles.keys(), 
-                           key=lambda x: list(self.CATEGORY_NAMES.keys()).index(x) if x in self.CATEGORY_NAMES else 999)
-
-        for category in sorted_keys:
-            articles = categorized_articles[category]
-            cat_name = self.CATEGORY_NAMES.get(category, category.upper())
-            
-            rows = ""
-            for i, art in enumerate(articles, 1):
-                rows += f"""
-                <div class="article-item">
-                    <h3>{i}. <a href="{art.url}" target="_blank">{art.title}</a></h3>
-                    <div class="meta">
-                        <span class="source">{art.source}</span>
-                        <span class="time">{art.publish_time.strftime('%H:%M') if art.publish_time else ''}</span>
-                    </div>
-                    <p class="summary">{art.summary or '暂无摘要'}</p>
-                </div>
-                """
-            
-            sections_html += f"""
-            <div class="category-section">
-                <h2>{cat_name} ({len(articles)})</h2>
-                {rows}
-            </div>
-            """
-
-        template = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <style>
-                body {{ font-family: 'Helvetica Neue', Helvetica, Arial, sans-serif; line-height: 1.6; color: #333; max-width: 800px; margin: 0 auto; padding: 20px; }}
-                h1 {{ color: #2c3e50; border-bottom: 2px solid #2c3e50; padding-bottom: 10px; }}
-                h2 {{ color: #34495e; margin-top: 30px; border-left: 5px solid #3498db; padding-left: 10px; }}
-                .article-item {{ margin-bottom: 20px; padding-bottom: 20px; border-bottom: 1px solid #eee; }}
-                .article-item h3 {{ margin-bottom: 5px; font-size: 16px; }}
-                .article-item a {{ color: #2980b9; text-decoration: none; }}
-                .meta {{ font-size: 12px; color: #7f8c8d; margin-bottom: 5px; }}
-                .summary {{ font-size: 14px; color: #555; margin: 0; }}
-            </style>
-        </head>
-        <body>
-            <h1>金融资讯日报 <small>{date_str}</small></h1>
-            {sections_html}
-            <footer>
-                <p>Generated by Financial News Collector at {datetime.now().strftime('%H:%M:%S')}</p>
-            </footer>
-        </body>
-        </html>
-        """
-        return template
-
-    def _generate_ai_html_template(self, data: Dict[str, Any], date: datetime) -> str:
-        """
-        生成 AI 增强版 HTML 报告 (Modern Premium Style)
-        """
-        date_str = date.strftime('%Y年%m月%d日')
-        
-        # 1. 市场综述
-        sentiment_html = ""
-        if "market_sentiment" in data:
-            sentiment_html = f"""
-            <div class="sentiment-box glass-effect">
-                <div class="box-header"><span class="icon">📈</span> 市场情绪与宏观综述</div>
-                <div class="box-content">{data['market_sentiment']}</div>
-            </div>
-            """
-
-        # 2. 深度专题
-        themes_html = ""
-        if "themes" in data:
-            theme_cards = ""
-            for theme in data["themes"]:
-                imp = theme.get("importance", "中")
-                importance_class = "imp-high" if imp == "高" else "imp-med"
-                
-                # 关联文章链接
-                articles_links = ""
-                if "articles" in theme:
-                    links = []
-                    for art in theme["articles"]:
-                        source = art.source or "未知来源"
-                        links.append(f'<a href="{art.url}" target="_blank" class="source-tag">{source}</a>')
-                    if links:
-                        articles_links = f'<div class="ref-links"><span class="ref-label">相关报道:</span> {"".join(links)}</div>'
-                
-                theme_cards += f"""
-                <div class="theme-card">
-                    <div class="theme-header">
-                        <div class="theme-title-wrapper">
-                            <span class="theme-title">{theme.get('title')}</span>
-                        </div>
-                        <span class="importance {importance_class}">{imp}关注</span>
-                    </div>
-                    <div class="theme-body">
-                        <div class="summary-section">
-                            {theme.get('summary')}
-                        </div>
-                        <div class="insight-section">
-                            <div class="insight-label">💡 研究员洞察</div>
-                            <div class="insight-text">{theme.get('insight')}</div>
-                        </div>
-                        {articles_links}
-                    </div>
-                </div>
-                """
-            
-            themes_html = f"""
-            <div class="section-container">
-                <div class="section-header">
-                    <span class="section-icon">🧐</span> 深度专题
-                </div>
-                <div class="themes-grid">
-                    {theme_cards}
-                </div>
-            </div>
-            """
 
-        # 3. 资讯速递
-        flash_html = ""
-        if "news_flash" in data:
-            flash_items = ""
-            for item in data["news_flash"]:
-                article_info = ""
-                if "article" in item:
-                    art = item["article"]
-                    article_info = f'<a href="{art.url}" target="_blank" class="flash-source">{art.source} ↗</a>'
-                
-                flash_items += f"""
-                <div class="flash-item">
-                    <div class="flash-content">
-                        <div class="flash-title">
-                            {item.get('title')} {article_info}
-                        </div>
-                        <div class="flash-comment">
-                           <span class="comment-icon">👉</span> {item.get('one_sentence_comment')}
-                        </div>
-                    </div>
-                </div>
-                """
-            
-            flash_html = f"""
-            <div class="section-container">
-                <div class="section-header">
-                    <span class="section-icon">⚡</span> 资讯速递
-                </div>
-                <div class="flash-grid">
-                    {flash_items}
-                </div>
-            </div>
-            """
+# 合并版报告中无 AI 数据时的占位内容
+_NO_AI_PLACEHOLDER = '<p style="color: var(--text-muted); text-align: center; padding: 40px;">暂无 AI 分析数据</p>'
 
-        full_html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>金融日报 | AI 深度版 - {date_str}</title>
-            <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Noto+Sans+SC:wght@300;400;500;700&display=swap" rel="stylesheet">
-            <style>
-                :root {{
+# 合并版报告样式源码（普通字符串，无需花括号转义；输出时使用下方的压缩版本）
+_COMBINED_CSS = """
+                :root {
                     --primary: #2563eb;
                     --primary-dark: #1e40af;
                     --secondary: #64748b;
@@ -1769,9 +886,9 @@ class Formatter:
                     --shadow-sm: 0 1px 2px 0 rgba(0, 0, 0, 0.05);
                     --shadow-md: 0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -1px rgba(0, 0, 0, 0.06);
                     --shadow-lg: 0 10px 15px -3px rgba(0, 0, 0, 0.1), 0 4px 6px -2px rgba(0, 0, 0, 0.05);
-                }}
-                
-                body {{
+                }
+
+                body {
                     font-family: 'Inter', 'Noto Sans SC', sans-serif;
                     line-height: 1.6;
                     color: var(--text-main);
@@ -1779,20 +896,20 @@ class Formatter:
                     margin: 0;
                     padding: 0;
                     -webkit-font-smoothing: antialiased;
-                }}
-                
-                .main-container {{
+                }
+
+                .main-container {
                     max-width: 900px;
                     margin: 0 auto;
                     padding: 40px 20px;
-                }}
-                
+                }
+
                 /* Header */
-                .report-header {{
+                .report-header {
                     text-align: center;
-                    margin-bottom: 50px;
-                }}
-                .report-title {{
+                    margin-bottom: 40px;
+                }
+                .report-title {
                     font-size: 32px;
                     font-weight: 800;
                     color: #0f172a;
@@ -1800,8 +917,8 @@ class Formatter:
                     margin: 0;
                     display: inline-block;
                     position: relative;
-                }}
-                .report-title::after {{
+                }
+                .report-title::after {
                     content: '';
                     display: block;
                     width: 60px;
@@ -1809,214 +926,190 @@ class Formatter:
                     background: var(--primary);
                     margin: 15px auto 0;
                     border-radius: 2px;
-                }}
-                .report-subtitle {{
+                }
+                .report-subtitle {
                     font-size: 16px;
                     color: var(--text-muted);
                     font-weight: 500;
                     margin-top: 10px;
                     text-transform: uppercase;
                     letter-spacing: 0.05em;
-                }}
-                
-                /* Sentiment Box */
-                .sentiment-box {{
-                    background: linear-gradient(135deg, #ffffff 0%, #eff6ff 100%);
-                    border: 1px solid #dbeafe;
-                    border-radius: 16px;
-                    padding: 24px;
-                    margin-bottom: 50px;
-                    box-shadow: var(--shadow-md);
+                }
+                .mode-toggle-wrap {
+                    margin-top: 16px;
+                    display: inline-flex;
+                    align-items: center;
+                    gap: 8px;
+                }
+                .mode-switch {
                     position: relative;
-                    overflow: hidden;
-                }}
-                .sentiment-box::before {{
-                    content: '';
+                    display: inline-block;
+                    width: 44px;
+                    height: 24px;
+                }
+                .mode-switch input {
+                    opacity: 0;
+                    width: 0;
+                    height: 0;
+                }
+                .slider {
                     position: absolute;
+                    cursor: pointer;
                     top: 0;
                     left: 0;
-                    width: 4px;
-                    height: 100%;
-                    background: var(--primary);
-                }}
-                .box-header {{
-                    font-size: 18px;
-                    font-weight: 700;
-                    color: #1e3a8a;
-                    margin-bottom: 15px;
+                    right: 0;
+                    bottom: 0;
+                    background-color: #94a3b8;
+                    transition: .3s;
+                    border-radius: 24px;
+                }
+                .slider:before {
+                    position: absolute;
+                    content: "";
+                    height: 18px;
+                    width: 18px;
+                    left: 3px;
+                    bottom: 3px;
+                    background-color: white;
+                    transition: .3s;
+                    border-radius: 50%;
+                }
+                input:checked + .slider {
+                    background-color: #2563eb;
+                }
+                input:checked + .slider:before {
+                    transform: translateX(20px);
+                }
+                .mode-label {
+                    font-size: 13px;
+                    color: #64748b;
+                }
+                /* View mode: hide screenshot UI */
+                .view-mode .ai-toolbar,
+                .view-mode .card-select-wrapper,
+                .view-mode .selected-count,
+                .view-mode #screenshot-modal,
+                .view-mode .card-select-indicator {
+                    display: none !important;
+                }
+                .view-mode .sentiment-box,
+                .view-mode .theme-card,
+                .view-mode .flash-item {
+                    cursor: default !important;
+                    border: none !important;
+                    box-shadow: none !important;
+                }
+
+                /* Tab Navigation */
+                .tab-nav {
                     display: flex;
-                    align-items: center;
                     gap: 8px;
-                }}
-                .box-content {{
-                    font-size: 16px;
-                    color: #334155;
-                    font-weight: 400;
-                    text-align: justify;
-                    line-height: 1.7;
-                }}
-
-                /* Section Headers */
-                .section-header {{
-                    font-size: 24px;
-                    font-weight: 700;
-                    color: #0f172a;
-                    margin-bottom: 25px;
-                    display: flex;
-                    align-items: center;
-                    gap: 12px;
+                    margin-bottom: 40px;
                     border-bottom: 2px solid var(--border-color);
-                    padding-bottom: 10px;
-                }}
-                .section-icon {{
-                    font-size: 24px;
-                }}
-                
-                /* Theme Cards */
-                .themes-grid {{
-                    display: grid;
-                    gap: 25px;
-                    margin-bottom: 50px;
-                }}
-                .theme-card {{
-                    background: var(--bg-card);
-                    border-radius: 12px;
-                    padding: 24px;
-                    box-shadow: var(--shadow-sm);
-                    border: 1px solid var(--border-color);
-                    transition: all 0.3s ease;
-                }}
-                .theme-card:hover {{
-                    box-shadow: var(--shadow-lg);
-                    transform: translateY(-2px);
-                    border-color: #cbd5e1;
-                }}
-                .theme-header {{
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: flex-start;
-                    margin-bottom: 18px;
-                    gap: 15px;
-                }}
-                .theme-title {{
-                    font-size: 20px;
-                    font-weight: 700;
-                    color: #0f172a;
-                    line-height: 1.3;
-                }}
-                .importance {{
-                    font-size: 12px;
-                    padding: 4px 10px;
-                    border-radius: 20px;
-                    font-weight: 600;
-                    white-space: nowrap;
-                    text-transform: uppercase;
-                    letter-spacing: 0.02em;
-                }}
-                .imp-high {{ background-color: #fee2e2; color: #b91c1c; }}
-                .imp-med {{ background-color: #fef3c7; color: #b45309; }}
-                
-                .summary-section {{
-                    font-size: 15px;
-                    color: #475569;
-                    margin-bottom: 15px;
-                    line-height: 1.6;
-                }}
-                .insight-section {{
-                    background-color: #f0fdf4;
-                    border-left: 3px solid #10b981;
-                    padding: 15px;
-                    border-radius: 0 8px 8px 0;
-                    margin-bottom: 15px;
-                }}
-                .insight-label {{
-                    font-size: 13px;
-                    font-weight: 700;
-                    color: #047857;
-                    margin-bottom: 5px;
-                    text-transform: uppercase;
-                }}
-                .insight-text {{
+                    padding-bottom: 0;
+                }
+                .tab-btn {
+                    padding: 14px 28px;
+                    border: none;
+                    background: transparent;
                     font-size: 15px;
-                    color: #065f46;
-                }}
-                
-                .ref-links {{
-                    margin-top: 15px;
-                    padding-top: 15px;
-                    border-top: 1px dashed var(--border-color);
-                    display: flex;
-                    flex-wrap: wrap;
-                    gap: 8px;
-                    align-items: center;
-                }}
-                .ref-label {{
-                    font-size: 12px;
-                    color: #94a3b8;
                     font-weight: 600;
-                }}
-                .source-tag {{
-                    font-size: 11px;
-                    color: #475569;
-                    background: #f1f5f9;
-                    padding: 2px 8px;
-                    border-radius: 4px;
-                    text-decoration: none;
-                    transition: background 0.2s;
-                }}
-                .source-tag:hover {{
-                    background: #e2e8f0;
+                    color: var(--text-muted);
+                    cursor: pointer;
+                    position: relative;
+                    transition: color 0.3s;
+                    border-radius: 8px 8px 0 0;
+                }
+                .tab-btn:hover {
+                    color: var(--primary);
+                    background: rgba(37, 99, 235, 0.05);
+                }
+                .tab-btn.active {
                     color: var(--primary);
-                }}
+                }
+                .tab-btn.active::after {
+                    content: '';
+                    position: absolute;
+                    bottom: -2px;
+                    left: 0;
+                    right: 0;
+                    height: 3px;
+                    background: var(--primary);
+                    border-radius: 3px 3px 0 0;
+                }
+                .tab-count {
+                    font-size: 12px;
+                    background: var(--border-color);
+                    padding: 2px 8px;
+                    border-radius: 12px;
+                    margin-left: 8px;
+                    color: var(--text-muted);
+                }
 
-                /* News Flash Grid */
-                .flash-grid {{
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-                    gap: 20px;
-                }}
-                .flash-item {{
-                    background: var(--bg-card);
-                    border: 1px solid var(--border-color);
-                    border-radius: 10px;
-                    padding: 18px;
-                    transition: transform 0.2s;
-                }}
-                .flash-item:hover {{
-                    border-color: #cbd5e1;
-                    box-shadow: var(--shadow-md);
-                }}
-                .flash-title {{
-                    font-size: 15px;
+                /* Tab Content */
+                .tab-content {
+                    min-height: 400px;
+                }
+                .tab-pane {
+                    display: none;
+                    animation: fadeIn 0.4s ease;
+                }
+                .tab-pane.active {
+                    display: block;
+                }
+                @keyframes fadeIn {
+                    from { opacity: 0; transform: translateY(15px); }
+                    to { opacity: 1; transform: translateY(0); }
+                }
+
+                /* AI Section Styles (shared with the AI report) */
+""" + _AI_CARDS_CSS + """
+
+                /* Articles List Styles */
+                .category-section {
+                    margin-bottom: 35px;
+                }
+                .category-section h2 {
+                    color: #34495e;
+                    border-left: 5px solid #3498db;
+                    padding-left: 12px;
+                    margin-bottom: 18px;
+                    font-size: 20px;
+                }
+                .article-item {
+                    margin-bottom: 18px;
+                    padding-bottom: 18px;
+                    border-bottom: 1px solid #eee;
+                }
+                .article-item h3 {
+                    margin-bottom: 6px;
+                    font-size: 16px;
                     font-weight: 600;
-                    color: #0f172a;
-                    margin-bottom: 10px;
-                    line-height: 1.4;
-                }}
-                .flash-source {{
-                    font-size: 11px;
-                    color: #94a3b8;
-                    font-weight: 400;
-                    margin-left: 5px;
+                }
+                .article-item a {
+                    color: #2980b9;
                     text-decoration: none;
-                }}
-                .flash-source:hover {{ color: var(--primary); }}
-                .flash-comment {{
-                    font-size: 13px;
-                    color: #b45309;
-                    background-color: #fffbeb;
-                    padding: 8px 12px;
-                    border-radius: 6px;
-                    margin-top: 8px;
-                    display: flex;
-                    align-items: flex-start;
-                    gap: 8px;
-                }}
-                .comment-icon {{
-                    flex-shrink: 0;
-                }}
-                
-                .footer {{
+                }
+                .article-item a:hover {
+                    text-decoration: underline;
+                }
+                .meta {
+                    font-size: 12px;
+                    color: #7f8c8d;
+                    margin-bottom: 6px;
+                }
+                .meta .source {
+                    margin-right: 12px;
+                }
+                .summary {
+                    font-size: 14px;
+                    color: #555;
+                    margin: 0;
+                    line-height: 1.6;
+                }
+
+                /* Footer */
+                .footer {
                     text-align: center;
                     color: #94a3b8;
                     font-size: 12px;
@@ -2024,262 +1117,1317 @@ class Formatter:
                     padding-bottom: 30px;
                     border-top: 1px solid var(--border-color);
                     padding-top: 20px;
-                }}
-                
-                @media (max-width: 600px) {{
-                    .flash-grid {{
+                }
+
+                @media (max-width: 600px) {
+                    .flash-grid {
                         grid-template-columns: 1fr;
-                    }}
-                    .main-container {{
+                    }
+                    .main-container {
                         padding: 20px 15px;
-                    }}
-                    .report-title {{
+                    }
+                    .report-title {
                         font-size: 24px;
-                    }}
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="main-container">
-                <div class="report-header">
-                    <h1 class="report-title">金融日报</h1>
-                    <div class="report-subtitle">AI 深度分析版 · {date_str}</div>
-                </div>
+                    }
+                    .tab-btn {
+                        padding: 12px 16px;
+                        font-size: 14px;
+                    }
+                }
+
+                /* Screenshot Feature Styles */
+                .ai-toolbar {
+                    display: flex;
+                    justify-content: space-between;
+                    align-items: center;
+                    flex-wrap: wrap;
+                    gap: 12px;
+                    padding: 12px 16px;
+                    background: linear-gradient(135deg, #f0f9ff 0%, #e0f2fe 100%);
+                    border: 1px solid #bae6fd;
+                    border-radius: 12px;
+                    margin-bottom: 16px;
+                    position: sticky;
+                    top: 0;
+                    z-index: 100;
+                    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.05);
+                }
+                .toolbar-left {
+                    display: flex;
+                    align-items: center;
+                    gap: 16px;
+                    flex-wrap: wrap;
+                }
+                .toolbar-right {
+                    display: flex;
+                    align-items: center;
+                    gap: 12px;
+                }
+                .selected-count {
+                    font-size: 14px;
+                    color: #475569;
+                }
+                .selected-count strong {
+                    color: #2563eb;
+                }
+
+                /* Card Selection Checkbox */
+                .card-select-wrapper {
+                    display: inline-flex;
+                    align-items: center;
+                    gap: 8px;
+                    cursor: pointer;
+                    user-select: none;
+                }
+                .card-select-checkbox {
+                    width: 20px;
+                    height: 20px;
+                    border: 2px solid #cbd5e1;
+                    border-radius: 4px;
+                    display: flex;
+                    align-items: center;
+                    justify-content: center;
+                    transition: all 0.2s;
+                    flex-shrink: 0;
+                }
+                .card-select-checkbox svg {
+                    width: 14px;
+                    height: 14px;
+                    stroke: white;
+                    stroke-width: 3;
+                    fill: none;
+                    opacity: 0;
+                    transition: opacity 0.2s;
+                }
+                .card-select-wrapper:hover .card-select-checkbox {
+                    border-color: #2563eb;
+                }
+                .card-select-wrapper.active .card-select-checkbox {
+                    background: #2563eb;
+                    border-color: #2563eb;
+                }
+                .card-select-wrapper.active .card-select-checkbox svg {
+                    opacity: 1;
+                }
+                .card-select-label {
+                    font-size: 14px;
+                    color: #475569;
+                }
+
+                /* Card Select Indicator (for cards) */
+                .card-select-indicator {
+                    position: absolute;
+                    top: 8px;
+                    right: 8px;
+                    width: 18px;
+                    height: 18px;
+                    border: 2px solid #cbd5e1;
+                    border-radius: 50%;
+                    background: white;
+                    cursor: pointer;
+                    transition: all 0.2s;
+                    z-index: 5;
+                }
+                .card-select-indicator::after {
+                    content: '';
+                    position: absolute;
+                    top: 50%;
+                    left: 50%;
+                    transform: translate(-50%, -50%) scale(0);
+                    width: 10px;
+                    height: 10px;
+                    background: #2563eb;
+                    border-radius: 50%;
+                    transition: transform 0.2s;
+                }
+                .theme-card.selected .card-select-indicator,
+                .flash-item.selected .card-select-indicator,
+                .sentiment-box.selected .card-select-indicator {
+                    border-color: #2563eb;
+                }
+                .theme-card.selected .card-select-indicator::after,
+                .flash-item.selected .card-select-indicator::after,
+                .sentiment-box.selected .card-select-indicator::after {
+                    transform: translate(-50%, -50%) scale(1);
+                }
+                .sentiment-box .card-select-indicator {
+                    top: 10px;
+                    right: 10px;
+                }
+
+                /* Screenshot Button */
+                .screenshot-btn {
+                    display: inline-flex;
+                    align-items: center;
+                    gap: 8px;
+                    padding: 10px 20px;
+                    background: linear-gradient(135deg, #2563eb 0%, #1d4ed8 100%);
+                    color: white;
+                    border: none;
+                    border-radius: 8px;
+                    font-size: 14px;
+                    font-weight: 600;
+                    cursor: pointer;
+                    transition: all 0.3s;
+                    box-shadow: 0 2px 4px rgba(37, 99, 235, 0.3);
+                }
+                .screenshot-btn:hover {
+                    transform: translateY(-2px);
+                    box-shadow: 0 4px 12px rgba(37, 99, 235, 0.4);
+                }
+                .screenshot-btn:active {
+                    transform: translateY(0);
+                }
+                }
+                .screenshot-btn:disabled {
+                    background: #94a3b8;
+                    cursor: not-allowed;
+                    transform: none;
+                    box-shadow: none;
+                }
+                .screenshot-btn .spinner {
+                    animation: spin 1s linear infinite;
+                }
+                @keyframes spin {
+                    from { transform: rotate(0deg); }
+                    to { transform: rotate(360deg); }
+                }
+
+                /* Card Selected State */
+                .theme-card, .flash-item {
+                    transition: all 0.3s ease;
+                }
+                .theme-card.has-select, .flash-item.has-select {
+                    cursor: pointer;
+                    border: 2px solid transparent;
+                }
+                .theme-card.has-select:hover, .flash-item.has-select:hover {
+                    border-color: #e2e8f0;
+                }
+                .theme-card.selected, .flash-item.selected {
+                    border-color: #2563eb;
+                    box-shadow: 0 0 0 3px rgba(37, 99, 235, 0.1);
+                }
+                .theme-card.excluded, .flash-item.excluded {
+                    visibility: hidden;
+                    position: absolute;
+                    width: 0;
+                    height: 0;
+                    padding: 0;
+                    margin: 0;
+                    overflow: hidden;
+                }
+
+                /* Modal */
+                .modal {
+                    display: none;
+                    position: fixed;
+                    top: 0;
+                    left: 0;
+                    width: 100%;
+                    height: 100%;
+                    background: rgba(0, 0, 0, 0.7);
+                    z-index: 1000;
+                    backdrop-filter: blur(4px);
+                }
+                .modal.active {
+                    display: flex;
+                    align-items: center;
+                    justify-content: center;
+                }
+                .modal-content {
+                    background: white;
+                    border-radius: 16px;
+                    max-width: 90%;
+                    max-height: 90%;
+                    overflow: auto;
+                    box-shadow: 0 20px 25px -5px rgba(0, 0, 0, 0.1);
+                }
+                .modal-header {
+                    display: flex;
+                    justify-content: space-between;
+                    align-items: center;
+                    padding: 20px 24px;
+                    border-bottom: 1px solid #e2e8f0;
+                }
+                .modal-header h3 {
+                    margin: 0;
+                    font-size: 18px;
+                    color: #0f172a;
+                }
+                .modal-close {
+                    background: none;
+                    border: none;
+                    font-size: 28px;
+                    color: #64748b;
+                    cursor: pointer;
+                    line-height: 1;
+                }
+                .modal-close:hover {
+                    color: #0f172a;
+                }
+                .modal-body {
+                    padding: 24px;
+                    text-align: center;
+                    background: #f8fafc;
+                }
+                .modal-body img {
+                    max-width: 100%;
+                    border-radius: 8px;
+                    box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
+                }
+                .modal-footer {
+                    display: flex;
+                    gap: 12px;
+                    justify-content: center;
+                    padding: 20px 24px;
+                    border-top: 1px solid #e2e8f0;
+                }
+                .btn-primary, .btn-secondary {
+                    padding: 10px 24px;
+                    border-radius: 8px;
+                    font-size: 14px;
+                    font-weight: 600;
+                    cursor: pointer;
+                    transition: all 0.2s;
+                    display: inline-flex;
+                    align-items: center;
+                    gap: 8px;
+                }
+                .btn-primary {
+                    background: #2563eb;
+                    color: white;
+                    border: none;
+                }
+                .btn-primary:hover {
+                    background: #1d4ed8;
+                }
+                .btn-secondary {
+                    background: white;
+                    color: #475569;
+                    border: 1px solid #cbd5e1;
+                }
+                .btn-secondary:hover {
+                    background: #f8fafc;
+                }
+                .toast {
+                    position: fixed;
+                    bottom: 30px;
+                    left: 50%;
+                    transform: translateX(-50%) translateY(100px);
+                    background: #0f172a;
+                    color: white;
+                    padding: 12px 24px;
+                    border-radius: 8px;
+                    font-size: 14px;
+                    opacity: 0;
+                    transition: all 0.3s;
+                    z-index: 1001;
+                }
+                .toast.show {
+                    transform: translateX(-50%) translateY(0);
+                    opacity: 1;
+                }
+
+                /* Dedicated Screenshot Container (Mobile Optimized) */
+                #capture-container {
+                    position: fixed;
+                    left: -9999px;
+                    top: 0;
+                    width: 375px;
+                    background: #ffffff;
+                    padding: 16px;
+                    box-sizing: border-box;
+                }
+
+                /* Mobile-optimized capture card style */
+                .capture-card {
+                    margin-bottom: 16px;
+                    background: #fff;
+                    border-radius: 12px;
+                    overflow: hidden;
+                }
+
+                /* Screenshot title */
+                .capture-title {
+                    font-size: 20px;
+                    font-weight: 700;
+                    text-align: center;
+                    padding: 16px 0;
+                    margin-bottom: 8px;
+                    color: #0f172a;
+                }
+"""
+
+# 导入时压缩一次，每次生成报告直接复用
+_COMBINED_CSS_MIN = _minify_css(_COMBINED_CSS)
+
+# 合并版报告页面按动态内容拆分为若干静态片段，由 Formatter._iter_combined_html 依次产出
+# 页头（str.format 字段：date_str），其后为可选的样式块
+_COMBINED_HEAD_FMT = _minify_html("""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="utf-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <title>金融日报 | {date_str}</title>
+            """ + _FONT_LINK + """
+""").format
+
+# 内联样式块（导入时与压缩后的 CSS 拼好）
+_COMBINED_STYLE_BLOCK = "<style>" + _COMBINED_CSS_MIN + "</style>"
+
+# 样式块之后到 AI 分析区之前（str.format 字段：date_str, article_count）
+_COMBINED_BODY_OPEN_FMT = _minify_html("""
+        </head>
+        <body class="view-mode">
+            <div class="main-container">
+                <div class="report-header">
+                    <h1 class="report-title">金融日报</h1>
+                    <div class="report-subtitle">{date_str}</div>
+                    <div class="mode-toggle-wrap">
+                        <label class="mode-switch"><input type="checkbox" id="mode-switch"><span class="slider"></span></label>
+                        <span class="mode-label">截屏模式</span>
+                    </div>
+                </div>
+
+                <!-- Tab Navigation -->
+                <div class="tab-nav">
+                    <button class="tab-btn active" data-tab="ai-analysis">AI 深度分析</button>
+                    <button class="tab-btn" data-tab="all-articles">全部资讯 <span class="tab-count">{article_count}</span></button>
+                </div>
+
+                <!-- Tab Content -->
+                <div class="tab-content">
+                    <!-- Tab 1: AI Analysis -->
+                    <div id="ai-analysis" class="tab-pane active">
+                        <!-- Screenshot Toolbar -->
+                        <div class="ai-toolbar" id="ai-toolbar">
+                            <div class="toolbar-left">
+                                <label class="card-select-wrapper" data-card="sentiment">
+                                    <div class="card-select-checkbox">
+                                        <svg viewBox="0 0 24 24"><polyline points="20 6 9 17 4 12"></polyline></svg>
+                                    </div>
+                                    <span class="card-select-label">市场综述</span>
+                                </label>
+                                <label class="card-select-wrapper" data-card="themes">
+                                    <div class="card-select-checkbox">
+                                        <svg viewBox="0 0 24 24"><polyline points="20 6 9 17 4 12"></polyline></svg>
+                                    </div>
+                                    <span class="card-select-label">深度专题</span>
+                                </label>
+                                <label class="card-select-wrapper" data-card="flash">
+                                    <div class="card-select-checkbox">
+                                        <svg viewBox="0 0 24 24"><polyline points="20 6 9 17 4 12"></polyline></svg>
+                                    </div>
+                                    <span class="card-select-label">资讯速递</span>
+                                </label>
+                            </div>
+                            <div class="toolbar-right">
+                                <span class="selected-count">已选择 <strong id="selected-count">3</strong> 项</span>
+                                <button id="screenshot-btn" class="screenshot-btn">
+                                    <svg width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><rect x="3" y="3" width="18" height="18" rx="2" ry="2"/><circle cx="8.5" cy="8.5" r="1.5"/><polyline points="21 15 16 10 5 21"/></svg>
+                                    生成长截图
+                                </button>
+                            </div>
+                        </div>
+
+                        """).format
+
+# AI 分析区与文章列表之间（纯静态）
+_COMBINED_BETWEEN_TABS = _minify_html("""
+                    </div>
+
+                    <!-- Screenshot Modal（首次截图时再挂载） -->
+                    <template id="screenshot-modal-template">
+                    <div id="screenshot-modal" class="modal">
+                        <div class="modal-content">
+                            <div class="modal-header">
+                                <h3>截图预览</h3>
+                                <button class="modal-close">&times;</button>
+                            </div>
+                            <div class="modal-body">
+                                <img id="screenshot-preview" src="" alt="截图预览">
+                            </div>
+                            <div class="modal-footer">
+                                <button id="copy-btn" class="btn-primary">
+                                    <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><rect x="9" y="9" width="13" height="13" rx="2" ry="2"/><path d="M5 15H4a2 2 0 0 1-2-2V4a2 2 0 0 1 2-2h9a2 2 0 0 1 2 2v1"/></svg>
+                                    复制图片
+                                </button>
+                                <button id="download-btn" class="btn-secondary">
+                                    <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M21 15v4a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2v-4"/><polyline points="7 10 12 15 17 10"/><line x1="12" y1="15" x2="12" y2="3"/></svg>
+                                    下载 PNG
+                                </button>
+                            </div>
+                        </div>
+                    </div>
+                    </template>
+
+                    <!-- Toast -->
+                    <div id="toast" class="toast"></div>
+
+                    <!-- Tab 2: All Articles -->
+                    <div id="all-articles" class="tab-pane"><template>
+                        """)
+
+# 文章列表之后的页脚与脚本（纯静态，花括号无需转义）
+_COMBINED_TAIL = _minify_html("""
+                    </template></div>
+                </div>
+
+                <div class="footer">
+                    Generated by Financial News Collector • AI 分析由 MiniMax M2.1 提供
+                </div>
+            </div>
+
+            <script src="https://cdnjs.cloudflare.com/ajax/libs/html2canvas/1.4.1/html2canvas.min.js"></script>
+            <script>
+                // Tab switching logic
+                document.querySelectorAll('.tab-btn').forEach(btn => {
+                    btn.addEventListener('click', function() {
+                        // Remove active class from all buttons
+                        document.querySelectorAll('.tab-btn').forEach(b => b.classList.remove('active'));
+                        // Add active class to clicked button
+                        this.classList.add('active');
+
+                        // Hide all tab panes
+                        document.querySelectorAll('.tab-pane').forEach(pane => pane.classList.remove('active'));
+                        // Show target tab pane
+                        const targetTab = this.getAttribute('data-tab');
+                        const pane = document.getElementById(targetTab);
+                        // Mount deferred content (<template>) on first activation
+                        const tpl = pane.querySelector(':scope > template');
+                        if (tpl) tpl.replaceWith(tpl.content);
+                        pane.classList.add('active');
+                    });
+                });
+
+                // Check URL hash for initial tab
+                if (window.location.hash === '#articles') {
+                    document.querySelector('[data-tab="all-articles"]').click();
+                }
+
+                // ============ Screenshot Feature ============
+                (function() {
+                    'use strict';
+
+                    const ScreenshotManager = {
+                        selectedCards: new Set(),
+                        currentCanvas: null,
+                        currentBlob: null,
+                        currentObjectUrl: null,
+                        currentPngUrl: null,
+                        modal: null,
+
+                        init: function() {
+                            this.cacheElements();
+                            this.bindEvents();
+                            this.initMode();
+                            this.selectAllCards();
+                            this.updateCount();
+                        },
+
+                        resetCaptureOutput: function() {
+                            this.currentCanvas = null;
+                            this.currentBlob = null;
+                            if (this.currentObjectUrl) {
+                                try { URL.revokeObjectURL(this.currentObjectUrl); } catch (e) {}
+                                this.currentObjectUrl = null;
+                            }
+                            if (this.currentPngUrl) {
+                                try { URL.revokeObjectURL(this.currentPngUrl); } catch (e) {}
+                                this.currentPngUrl = null;
+                            }
+                            if (this.previewImg) {
+                                this.previewImg.src = '';
+                            }
+                        },
+
+                        canvasToBlob: function(canvas, type, quality) {
+                            type = type || 'image/png';
+                            return new Promise(function(resolve, reject) {
+                                if (canvas && canvas.toBlob) {
+                                    canvas.toBlob(function(blob) {
+                                        if (blob) return resolve(blob);
+                                        reject(new Error('toBlob returned null'));
+                                    }, type, quality);
+                                    return;
+                                }
+
+                                // Fallback: dataURL -> fetch -> blob
+                                try {
+                                    var dataUrl = canvas.toDataURL(type, quality);
+                                    fetch(dataUrl)
+                                        .then(function(res) { return res.blob(); })
+                                        .then(resolve)
+                                        .catch(reject);
+                                } catch (e) {
+                                    reject(e);
+                                }
+                            });
+                        },
+
+                        // PNG is only encoded when the user downloads/copies (preview uses JPEG)
+                        getPngBlob: function() {
+                            var self = this;
+                            if (this.currentBlob) return Promise.resolve(this.currentBlob);
+                            if (!this.currentCanvas) return Promise.reject(new Error('no capture available'));
+                            return this.canvasToBlob(this.currentCanvas, 'image/png').then(function(blob) {
+                                self.currentBlob = blob;
+                                return blob;
+                            });
+                        },
+
+                        initMode: function() {
+                            var saved = localStorage.getItem('reportMode');
+                            if (saved === 'capture') {
+                                document.body.classList.remove('view-mode');
+                                this.modeSwitch.checked = true;
+                            }
+                        },
+
+                        cacheElements: function() {
+                            this.toolbar = document.getElementById('ai-toolbar');
+                            this.screenshotBtn = document.getElementById('screenshot-btn');
+                            this.toast = document.getElementById('toast');
+                            this.aiAnalysis = document.getElementById('ai-analysis');
+                            this.captureContainer = document.getElementById('capture-container');
+                            this.modeSwitch = document.getElementById('mode-switch');
+                        },
+
+                        bindEvents: function() {
+                            var self = this;
+
+                            // Card selection toggles
+                            document.querySelectorAll('.card-select-wrapper').forEach(function(wrapper) {
+                                wrapper.addEventListener('click', function(e) {
+                                    e.preventDefault();
+                                    e.stopPropagation();
+                                    var cardType = this.getAttribute('data-card');
+                                    if (cardType) {
+                                        self.toggleCardType(cardType);
+                                    }
+                                });
+                            });
+
+                            // Individual card selection
+                            document.querySelectorAll('.sentiment-box, .theme-card, .flash-item').forEach(function(card) {
+                                card.addEventListener('click', function() {
+                                    self.toggleCard(this);
+                                });
+                            });
+
+                            // Screenshot button
+                            this.screenshotBtn.addEventListener('click', function() {
+                                self.captureScreenshot();
+                            });
+
+                            // Mode switch
+                            this.modeSwitch.addEventListener('change', function() {
+                                if (this.checked) {
+                                    document.body.classList.remove('view-mode');
+                                    localStorage.setItem('reportMode', 'capture');
+                                } else {
+                                    document.body.classList.add('view-mode');
+                                    localStorage.setItem('reportMode', 'view');
+                                }
+                            });
+                        },
+
+                        // Mount the screenshot modal from its <template> and bind its events (first capture only)
+                        ensureModal: function() {
+                            if (this.modal) return;
+                            var self = this;
+                            var tpl = document.getElementById('screenshot-modal-template');
+                            tpl.replaceWith(tpl.content);
+
+                            this.modal = document.getElementById('screenshot-modal');
+                            this.previewImg = document.getElementById('screenshot-preview');
+                            this.copyBtn = document.getElementById('copy-btn');
+                            this.downloadBtn = document.getElementById('download-btn');
+
+                            // Modal close
+                            this.modal.querySelector('.modal-close').addEventListener('click', function() {
+                                self.closeModal();
+                            });
+
+                            this.copyBtn.addEventListener('click', function() {
+                                self.copyToClipboard();
+                            });
+
+                            this.downloadBtn.addEventListener('click', function() {
+                                self.downloadImage();
+                            });
+
+                            // Close modal on background click
+                            this.modal.addEventListener('click', function(e) {
+                                if (e.target === self.modal) {
+                                    self.closeModal();
+                                }
+                            });
+                        },
+
+                        toggleCardType: function(cardType) {
+                            var wrappers = document.querySelectorAll('.card-select-wrapper[data-card="' + cardType + '"]');
+                            var cards = document.querySelectorAll('[data-card-type="' + cardType + '"]');
+
+                            // Check if all cards of this type are selected
+                            var allSelected = true;
+                            cards.forEach(function(card) {
+                                if (!this.selectedCards.has(card)) {
+                                    allSelected = false;
+                                }
+                            }.bind(this));
+
+                            // Toggle
+                            wrappers.forEach(function(wrapper) {
+                                if (allSelected) {
+                                    wrapper.classList.remove('active');
+                                } else {
+                                    wrapper.classList.add('active');
+                                }
+                            });
+
+                            cards.forEach(function(card) {
+                                if (allSelected) {
+                                    card.classList.remove('selected');
+                                    this.selectedCards.delete(card);
+                                } else {
+                                    card.classList.add('selected');
+                                    this.selectedCards.add(card);
+                                }
+                            }.bind(this));
+
+                            this.updateCount();
+                        },
+
+                        toggleCard: function(card) {
+                            if (this.selectedCards.has(card)) {
+                                card.classList.remove('selected');
+                                this.selectedCards.delete(card);
+                            } else {
+                                card.classList.add('selected');
+                                this.selectedCards.add(card);
+                            }
+                            this.updateCount();
+                            // Update toolbar checkbox based on card type
+                            this.updateToolbarCheckbox(card.getAttribute('data-card-type'));
+                        },
+
+                        selectAllCards: function() {
+                            document.querySelectorAll('.has-select').forEach(function(card) {
+                                card.classList.add('selected');
+                                this.selectedCards.add(card);
+                            }.bind(this));
+                            // Update all toolbar checkboxes
+                            this.updateToolbarCheckbox('sentiment');
+                            this.updateToolbarCheckbox('themes');
+                            this.updateToolbarCheckbox('flash');
+                        },
+
+                        deselectAllCards: function() {
+                            document.querySelectorAll('.has-select').forEach(function(card) {
+                                card.classList.remove('selected');
+                                this.selectedCards.delete(card);
+                            }.bind(this));
+                            // Update all toolbar checkboxes
+                            this.updateToolbarCheckbox('sentiment');
+                            this.updateToolbarCheckbox('themes');
+                            this.updateToolbarCheckbox('flash');
+                        },
+
+                        updateCount: function() {
+                            var count = this.selectedCards.size;
+                            var countEl = document.getElementById('selected-count');
+                            if (countEl) {
+                                countEl.textContent = count;
+                            }
+                            this.screenshotBtn.disabled = count === 0;
+                        },
+
+                        updateToolbarCheckbox: function(cardType) {
+                            var wrappers = document.querySelectorAll('.card-select-wrapper[data-card="' + cardType + '"]');
+                            var cards = document.querySelectorAll('[data-card-type="' + cardType + '"]');
+                            var allSelected = true;
+
+                            cards.forEach(function(card) {
+                                if (!this.selectedCards.has(card)) {
+                                    allSelected = false;
+                                }
+                            }.bind(this));
+
+                            wrappers.forEach(function(wrapper) {
+                                if (allSelected) {
+                                    wrapper.classList.add('active');
+                                } else {
+                                    wrapper.classList.remove('active');
+                                }
+                            });
+                        },
+
+                        hideUnselectedCards: function() {
+                            document.querySelectorAll('.has-select').forEach(function(card) {
+                                if (!this.selectedCards.has(card)) {
+                                    card.classList.add('excluded');
+                                }
+                            }.bind(this));
+                        },
+
+                        showAllCards: function() {
+                            document.querySelectorAll('.has-select.excluded').forEach(function(card) {
+                                card.classList.remove('excluded');
+                            });
+                        },
+
+                        showToast: function(message) {
+                            this.toast.textContent = message;
+                            this.toast.classList.add('show');
+                            setTimeout(function() {
+                                this.toast.classList.remove('show');
+                            }.bind(this), 2000);
+                        },
+
+                        // Mobile-optimized: Prepare cards in dedicated container
+                        preCapture: function() {
+                            var container = this.captureContainer;
+                            if (!container) return;
+
+                            // Clear previous content
+                            container.innerHTML = '';
+
+                            // Add title with date
+                            var title = document.createElement('div');
+                            title.className = 'capture-title';
+                            var subtitleEl = document.querySelector('.report-subtitle');
+                            var dateText = subtitleEl ? subtitleEl.textContent : '';
+                            title.textContent = '金融日报 ' + dateText;
+                            container.appendChild(title);
+
+                            // Clone selected cards in DOM order (maintains original order)
+                            var allCards = document.querySelectorAll('.has-select');
+                            allCards.forEach(function(card) {
+                                if (this.selectedCards.has(card)) {
+                                    var clone = card.cloneNode(true);
+
+                                    // Single pass over original/clone descendants (same document order):
+                                    // computed styles come from the attached original, display:none subtrees
+                                    // are dropped so html2canvas never walks them, and position:fixed is
+                                    // converted to relative (html2canvas fix)
+                                    var srcNodes = card.querySelectorAll('*');
+                                    var cloneNodes = clone.querySelectorAll('*');
+                                    for (var i = 0; i < srcNodes.length; i++) {
+                                        var style = window.getComputedStyle(srcNodes[i]);
+                                        if (style.display === 'none') {
+                                            cloneNodes[i].remove();
+                                        } else if (style.position === 'fixed') {
+                                            cloneNodes[i].style.position = 'relative';
+                                        }
+                                    }
+
+                                    // Remove selection indicator
+                                    var indicator = clone.querySelector('.card-select-indicator');
+                                    if (indicator) indicator.remove();
+
+                                    // Remove selection-related classes
+                                    clone.classList.remove('selected', 'has-select', 'excluded');
+
+                                    // Wrap in capture-card for mobile optimization
+                                    var wrapper = document.createElement('div');
+                                    wrapper.className = 'capture-card';
+                                    wrapper.appendChild(clone);
+                                    container.appendChild(wrapper);
+                                }
+                            }.bind(this));
+                        },
+
+                        captureScreenshot: function() {
+                            var self = this;
+                            var btn = this.screenshotBtn;
+                            var originalHTML = btn.innerHTML;
+
+                            btn.innerHTML = '<svg class="spinner" viewBox="0 0 24 24" width="18" height="18"><circle cx="12" cy="12" r="10" stroke="currentColor" stroke-width="3" fill="none" stroke-dasharray="30 60"/></svg> 生成中...';
+                            btn.disabled = true;
+
+                            // Prepare cards in dedicated container
+                            this.preCapture();
+                            this.resetCaptureOutput();
+
+                            // Use the cached capture container
+                            var container = this.captureContainer;
+                            if (!container || container.children.length === 0) {
+                                this.showToast('请先选择要截图的卡片');
+                                btn.innerHTML = originalHTML;
+                                btn.disabled = false;
+                                return;
+                            }
+
+                            // Mobile / low-DPR devices don't need a 2x retina canvas
+                            var isMobile = /Mobile|Android|iPhone/i.test(navigator.userAgent);
+                            var dpr = Math.min(window.devicePixelRatio || 1, 2);
+                            var scale = isMobile ? Math.min(dpr, 1.5) : 2;
+
+                            // Use dedicated container for capture
+                            html2canvas(container, {
+                                useCORS: true,
+                                allowTaint: true,
+                                backgroundColor: '#ffffff',
+                                scale: scale,
+                                width: 375,  // Mobile width
+                                logging: false
+                            }).then(function(canvas) {
+                                self.currentCanvas = canvas;
+                                // Preview with JPEG (much cheaper to encode than PNG); PNG is deferred to download/copy.
+                                return self.canvasToBlob(canvas, 'image/jpeg', 0.9).then(function(blob) {
+                                    self.currentObjectUrl = URL.createObjectURL(blob);
+                                    self.ensureModal();
+                                    self.previewImg.src = self.currentObjectUrl;
+                                    self.modal.classList.add('active');
+
+                                    // Mobile: show long-press hint
+                                    if (isMobile) {
+                                        self.showToast('长按图片保存到相册');
+                                    }
+                                });
+                            }).catch(function(error) {
+                                console.error('Screenshot failed:', error);
+                                self.showToast('截图失败，请重试');
+                            }).finally(function() {
+                                btn.innerHTML = originalHTML;
+                                btn.disabled = self.selectedCards.size === 0;
+                            });
+                        },
+
+                        closeModal: function() {
+                            if (this.modal) this.modal.classList.remove('active');
+                            // Release the canvas and object URLs held by the preview
+                            this.resetCaptureOutput();
+                        },
+
+                        downloadImage: function() {
+                            if (!this.currentCanvas && !this.currentBlob) return;
+
+                            var self = this;
+                            var date = new Date().toISOString().slice(0, 10);
+                            this.getPngBlob().then(function(blob) {
+                                // Reuse one object URL per capture; revoked in resetCaptureOutput
+                                if (!self.currentPngUrl) {
+                                    self.currentPngUrl = URL.createObjectURL(blob);
+                                }
+                                var link = document.createElement('a');
+                                link.download = '金融日报-AI分析-' + date + '.png';
+                                link.href = self.currentPngUrl;
+                                link.click();
+                            }).catch(function(error) {
+                                console.error('Download failed:', error);
+                                self.showToast('下载失败，请长按图片保存');
+                            });
+                        },
+
+                        copyToClipboard: function() {
+                            var self = this;
+                            if (!this.currentCanvas && !this.currentBlob) return;
+
+                            // Pass the promise straight to ClipboardItem so the user gesture is preserved
+                            Promise.resolve().then(function() {
+                                    var item = new ClipboardItem({ 'image/png': self.getPngBlob() });
+                                    return navigator.clipboard.write([item]);
+                                })
+                                .then(function() {
+                                    self.showToast('已复制到剪贴板');
+                                    self.closeModal();
+                                })
+                                .catch(function(error) {
+                                    console.error('Copy failed:', error);
+                                    self.showToast('复制失败，请手动保存');
+                                });
+                        }
+                    };
+
+                    // Initialize on DOM ready
+                    if (document.readyState === 'loading') {
+                        document.addEventListener('DOMContentLoaded', function() {
+                            ScreenshotManager.init();
+                        });
+                    } else {
+                        ScreenshotManager.init();
+                    }
+                })();
+            </script>
+
+            <!-- Dedicated Screenshot Container (Hidden, for Mobile Optimized Capture) -->
+            <div id="capture-container"></div>
+        </body>
+        </html>
+        """)
+
+
+@dataclass
+class FormatContext:
+    """
+    一次运行内共享的格式化上下文
+
+    分类、排序和日期字符串只计算一次，邮件、合并报告、Telegram 等多种输出直接复用
+    """
+    articles: List[NewsArticle]
+    categorized: Dict[str, List[NewsArticle]]
+    sorted_keys: List[str]
+    category_names: Dict[str, str]  # 分类 -> 已转义的显示名称（未配置的分类回退为大写键名）
+    date: datetime
+    date_str: str        # 2026年01月22日，用于邮件与网页报告
+    date_str_short: str  # 2026-01-22，用于 Telegram 消息
+
+
+class Formatter:
+    """内容格式化器"""
+
+    # 分类显示名称映射
+    CATEGORY_NAMES = {
+        'insurance': '保险行业',
+        'banks': '银行行业',
+        'finance': '财经资讯',
+        'regulation': '政策法规',
+        'internet_finance': '互联网金融',
+        'market': '市场动态'
+    }
+
+    # 分类排序序号（按 CATEGORY_NAMES 定义顺序，类加载时构建一次）
+    _CATEGORY_ORDER = {k: i for i, k in enumerate(CATEGORY_NAMES)}
 
-                {sentiment_html}
-                {themes_html}
-                {flash_html}
+    def __init__(self):
+        # 最近一次分类结果：(文章 id 快照, 文章列表副本, 分类结果)，副本保证 id 在缓存期间有效
+        self._cat_cache = None
 
-                <div class="footer">
-                    Created by AI News Collector • Powered by MiniMax M2.1
-                </div>
-            </div>
-        </body>
-        </html>
+    def make_context(self, articles: List[NewsArticle], date: datetime = None) -> FormatContext:
+        """
+        为一批文章构建格式化上下文（分类、排序只做一次），可传给各 format_* 方法代替文章列表
         """
-        return full_html
+        if date is None:
+            date = datetime.now()
 
-    def format_archive_page(self, reports: list) -> str:
+        categorized = self._categorize_articles(articles)
+
+        # 排序：优先显示配置中定义的分类
+        sorted_keys = sorted(categorized, key=lambda x: self._CATEGORY_ORDER.get(x, 999))
+
+        # 显示名称每个分类只解析、转义一次，渲染循环中直接按键取值
+        # （未配置的分类名来自站点配置，同样按动态文本转义）
+        cat_get = self.CATEGORY_NAMES.get
+        category_names = {c: _esc(cat_get(c, c.upper())) for c in categorized}
+
+        return FormatContext(
+            articles=articles,
+            categorized=categorized,
+            sorted_keys=sorted_keys,
+            category_names=category_names,
+            date=date,
+            date_str=date.strftime('%Y年%m月%d日'),
+            date_str_short=date.strftime('%Y-%m-%d'),
+        )
+
+    def _as_context(self, articles: Union[List[NewsArticle], FormatContext], date: datetime = None) -> FormatContext:
+        """统一入参：已是 FormatContext 时直接使用（忽略 date），否则现场构建"""
+        if isinstance(articles, FormatContext):
+            return articles
+        return self.make_context(articles, date)
+
+    def format_for_email(self, articles: Union[List[NewsArticle], FormatContext], date: datetime = None) -> tuple:
         """
-        生成历史归档页面
+        格式化为邮件格式 (标准 HTML)
 
         Args:
-            reports: 列表，每个元素包含 {'date': 'YYYY-MM-DD', 'title': '标题', 'url': '文件名.html', 'summary': '摘要'}
+            articles: 文章列表，或 make_context 构建的上下文
 
         Returns:
-            str: 归档页面 HTML
+            tuple: (subject, html_body)
         """
-        # 按日期降序排列
-        sorted_reports = sorted(reports, key=lambda x: x['date'], reverse=True)
-
-        # 按年份分组
-        from collections import defaultdict
-        by_year = defaultdict(list)
-        for report in sorted_reports:
-            year = report['date'][:4]
-            by_year[year].append(report)
-
-        # 按年份降序排列
-        years = sorted(by_year.keys(), reverse=True)
-
-        year_sections_html = ""
-        for year in years:
-            items_html = ""
-            for report in by_year[year]:
-                # 格式化日期显示
-                date_obj = datetime.strptime(report['date'], '%Y-%m-%d')
-                date_display = date_obj.strftime('%m月%d日')
-                week_day = date_obj.strftime('%a')
-                week_map = {'Mon': '周一', 'Tue': '周二', 'Wed': '周三', 'Thu': '周四', 'Fri': '周五', 'Sat': '周六', 'Sun': '周日'}
-                week_display = week_map.get(week_day, week_day)
-
-                items_html += f"""
-                <div class="archive-item">
-                    <div class="archive-date">{date_display} <span class="weekday">{week_display}</span></div>
-                    <div class="archive-content">
-                        <a href="{report['url']}" class="archive-link">{report['title']}</a>
-                        {f'<div class="archive-summary">{report["summary"]}</div>' if report.get('summary') else ''}
-                    </div>
-                </div>
-                """
+        ctx = self._as_context(articles, date)
+        if not ctx.articles:
+            return "金融资讯日报", "<p>今日暂无资讯</p>"
 
-            year_sections_html += f"""
-            <div class="year-section">
-                <div class="year-header">{year}年</div>
-                <div class="archive-list">
-                    {items_html}
-                </div>
-            </div>
-            """
+        subject = f"金融资讯日报 - {ctx.date_str}"
 
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>金融日报 | 历史归档</title>
-            <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Noto+Sans+SC:wght@300;400;500;700&display=swap" rel="stylesheet">
-            <style>
-                :root {{
-                    --primary: #2563eb;
-                    --bg-page: #f8fafc;
-                    --text-main: #1e293b;
-                    --text-muted: #64748b;
-                    --border-color: #e2e8f0;
-                }}
+        # 生成HTML
+        html = self._generate_html(ctx)
 
-                body {{
-                    font-family: 'Inter', 'Noto Sans SC', sans-serif;
-                    line-height: 1.6;
-                    color: var(--text-main);
-                    background-color: var(--bg-page);
-                    margin: 0;
-                    padding: 0;
-                    -webkit-font-smoothing: antialiased;
-                }}
+        return subject, html
 
-                .main-container {{
-                    max-width: 800px;
-                    margin: 0 auto;
-                    padding: 40px 20px;
-                }}
+    def format_ai_report(self, ai_data: Dict[str, Any], date: datetime = None) -> str:
+        """
+        将 AI 分析结果格式化为现代化的 HTML 研报
+        """
+        if date is None:
+            date = datetime.now()
 
-                .report-header {{
-                    text-align: center;
-                    margin-bottom: 50px;
-                }}
-                .report-title {{
-                    font-size: 32px;
-                    font-weight: 800;
-                    color: #0f172a;
-                    letter-spacing: -0.025em;
-                    margin: 0;
-                }}
-                .report-title::after {{
-                    content: '';
-                    display: block;
-                    width: 60px;
-                    height: 4px;
-                    background: var(--primary);
-                    margin: 15px auto 0;
-                    border-radius: 2px;
-                }}
-                .report-subtitle {{
-                    font-size: 16px;
-                    color: var(--text-muted);
-                    font-weight: 500;
-                    margin-top: 10px;
-                }}
+        return self._generate_ai_html_template(ai_data, date)
 
-                .year-section {{
-                    margin-bottom: 40px;
-                }}
-                .year-header {{
-                    font-size: 24px;
-                    font-weight: 700;
-                    color: #0f172a;
-                    margin-bottom: 20px;
-                    padding-bottom: 10px;
-                    border-bottom: 2px solid var(--border-color);
-                }}
+    def write_ai_report(self, ai_data: Dict[str, Any], output_file, date: datetime = None, gzip_copy: bool = False):
+        """
+        将 AI 报告逐段流式写入文件（不在内存中拼接完整 HTML）
 
-                .archive-list {{
-                    display: flex;
-                    flex-direction: column;
-                    gap: 12px;
-                }}
-                .archive-item {{
-                    display: flex;
-                    align-items: flex-start;
-                    gap: 20px;
-                    padding: 16px;
-                    background: white;
-                    border-radius: 12px;
-                    border: 1px solid var(--border-color);
-                    transition: all 0.2s;
-                }}
-                .archive-item:hover {{
-                    border-color: #cbd5e1;
-                    box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-                }}
-                .archive-date {{
-                    font-size: 15px;
-                    font-weight: 600;
-                    color: #0f172a;
-                    white-space: nowrap;
-                    min-width: 80px;
-                }}
-                .weekday {{
-                    font-size: 12px;
-                    color: var(--text-muted);
-                    font-weight: 400;
-                    margin-left: 4px;
-                }}
-                .archive-content {{
-                    flex: 1;
-                }}
-                .archive-link {{
-                    font-size: 15px;
-                    font-weight: 500;
-                    color: var(--primary);
-                    text-decoration: none;
-                    display: block;
-                }}
-                .archive-link:hover {{
-                    text-decoration: underline;
-                }}
-                .archive-summary {{
-                    font-size: 13px;
-                    color: var(--text-muted);
-                    margin-top: 6px;
-                    line-height: 1.5;
-                }}
+        Args:
+            gzip_copy: 同时写出 .gz 压缩副本（同一次遍历写入两个文件）
+        """
+        if date is None:
+            date = datetime.now()
 
-                .footer {{
-                    text-align: center;
-                    color: #94a3b8;
-                    font-size: 12px;
-                    margin-top: 60px;
-                    padding-bottom: 30px;
-                    border-top: 1px solid var(--border-color);
-                    padding-top: 20px;
-                }}
+        # 报告由大量小片段组成，1 MiB 写缓冲减少 write 系统调用
+        with open(output_file, 'wb', buffering=1 << 20) as f:
+            if not gzip_copy:
+                f.writelines(self._iter_ai_bytes(ai_data, date))
+                return
 
-                .stats {{
-                    text-align: center;
-                    color: var(--text-muted);
-                    font-size: 14px;
-                    margin-bottom: 40px;
-                }}
+            with gzip.open(f"{output_file}.gz", 'wb', compresslevel=6) as gz:
+                for data in self._iter_ai_bytes(ai_data, date):
+                    f.write(data)
+                    gz.write(data)
 
-                @media (max-width: 600px) {{
-                    .archive-item {{
-                        flex-direction: column;
-                        gap: 8px;
-                    }}
-                    .archive-date {{
-                        font-size: 13px;
-                    }}
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="main-container">
-                <div class="report-header">
-                    <h1 class="report-title">金融日报</h1>
-                    <div class="report-subtitle">历史归档</div>
-                </div>
+    def format_combined_report(self, articles: Union[List[NewsArticle], FormatContext], ai_data: Dict[str, Any] = None,
+                               date: datetime = None, include_styles: bool = True) -> str:
+        """
+        生成合并版 HTML 报告（标准列表 + AI分析），使用 Tab 切换
 
-                <div class="stats">共 {len(sorted_reports)} 期 · {len(years)} 年</div>
+        Args:
+            include_styles: 是否内联样式表；样式已由外层页面提供时传 False，省去约 12 KB 的 CSS
 
-                {year_sections_html}
+        Returns:
+            str: 合并后的完整HTML
+        """
+        return "".join(self.iter_combined_report(articles, ai_data, date, include_styles))
 
-                <div class="footer">
-                    Generated by Financial News Collector
-                </div>
-            </div>
-        </body>
-        </html>
+    def iter_combined_report(self, articles: Union[List[NewsArticle], FormatContext], ai_data: Dict[str, Any] = None,
+                             date: datetime = None, include_styles: bool = True) -> Iterator[str]:
+        """
+        逐段产出合并版 HTML 报告，供写文件等场景直接消费，无需在内存中拼接完整页面
+
+        Args:
+            include_styles: 为 False 时不输出内联样式块（见 format_combined_report）
+        """
+        ctx = self._as_context(articles, date)
+
+        # 生成 AI 分析部分 HTML
+        ai_sections_html = self._generate_ai_sections(ai_data) if ai_data else ""
+
+        # 生成文章列表部分 HTML
+        articles_html = self._generate_articles_section(ctx)
+
+        return self._iter_combined_html(ai_sections_html, articles_html, len(ctx.articles), ctx.date, include_styles)
+
+    def _generate_ai_sections(self, data: Dict[str, Any]) -> str:
+        """提取 AI 分析的各个部分（市场综述、深度专题、资讯速递）"""
+        if not data:
+            return ""
+
+        parts = []
+
+        # 1. 市场综述
+        if data.get("market_sentiment"):
+            parts.append(_COMBINED_SENTIMENT_FMT(content=_esc(data['market_sentiment'])))
+
+        # 2. 深度专题
+        themes = data.get("themes") or ()
+        if themes:
+            theme_cards_parts = []
+            for theme in themes:
+                imp = theme.get("importance", "中")
+
+                # 关联文章链接
+                articles_links = ""
+                if "articles" in theme:
+                    # 来源标签在文章对象上缓存，重复渲染不再拼接
+                    links = "".join(art.source_tag_html for art in theme["articles"])
+                    if links:
+                        articles_links = _REF_LINKS_FMT(links)
+
+                theme_cards_parts.append(_render_theme_card(
+                    theme.get('title'), imp, theme.get('summary'), theme.get('insight'), articles_links,
+                    selectable=True,
+                ))
+            parts.append(_COMBINED_THEMES_FMT(cards="".join(theme_cards_parts)))
+
+        # 3. 资讯速递
+        news_flash = data.get("news_flash") or ()
+        if news_flash:
+            flash_items_parts = []
+            for item in news_flash:
+                article_info = ""
+                if "article" in item:
+                    article_info = item["article"].flash_source_html
+
+                flash_items_parts.append(_render_flash_item(
+                    item.get('title'), article_info, item.get('one_sentence_comment'), selectable=True,
+                ))
+            parts.append(_COMBINED_FLASH_FMT(items="".join(flash_items_parts)))
+
+        return "".join(parts)
+
+    def _generate_articles_section(self, ctx: FormatContext) -> str:
+        """生成文章列表部分的 HTML"""
+        return "".join(self._iter_category_blocks(ctx))
+
+    def _iter_category_blocks(self, ctx: FormatContext) -> Iterator[str]:
+        """按排序后的分类逐个产出分类区块（邮件与合并报告共用）"""
+        # 循环内用到的属性/方法先绑定为局部变量
+        categorized = ctx.categorized
+        name_map = ctx.category_names
+
+        for category in ctx.sorted_keys:
+            rows = tuple(
+                (art.url, art.title, art.source, art.publish_time_hm, art.summary or '暂无摘要')
+                for art in categorized[category]
+            )
+            yield _render_category_block(name_map[category], rows)
+
+    def _iter_combined_html(self, ai_html: str, articles_html: str, article_count: int, date: datetime,
+                            include_styles: bool = True) -> Iterator[str]:
+        """逐段产出合并版 HTML 页面（静态片段与动态内容交替，不拼接整页字符串）"""
+        date_str = date.strftime('%Y年%m月%d日')
+
+        yield from self._render_head(date_str, include_styles)
+        yield from self._render_body(ai_html, articles_html, article_count, date_str)
+
+    def _render_head(self, date_str: str, include_styles: bool = True) -> Iterator[str]:
+        """合并版页面 <head> 部分（include_styles=False 时不输出内联样式块）"""
+        yield _COMBINED_HEAD_FMT(date_str=date_str)
+        if include_styles:
+            yield _COMBINED_STYLE_BLOCK
+
+    def _render_body(self, ai_html: str, articles_html: str, article_count: int, date_str: str) -> Iterator[str]:
+        """合并版页面 </head> 之后的全部内容"""
+        yield _COMBINED_BODY_OPEN_FMT(date_str=date_str, article_count=article_count)
+        yield ai_html or _NO_AI_PLACEHOLDER
+        yield _COMBINED_BETWEEN_TABS
+        yield articles_html
+        yield _COMBINED_TAIL
+
+    def format_for_telegram(self, articles: Union[List[NewsArticle], FormatContext], date: datetime = None) -> str:
+        """
+        格式化为 Telegram 消息 (HTML)
+        """
+        ctx = self._as_context(articles, date)
+        if not ctx.articles:
+            return "今日暂无资讯"
+
+        parts = [f"<b>{ctx.date_str_short} 金融资讯日报</b>\n\n"]
+        append = parts.append
+        categorized = ctx.categorized
+        name_map = ctx.category_names
+
+        # 全局连续编号：每个分类的起始序号由前面各分类的篇数累加得到
+        starts = accumulate((len(categorized[c]) for c in ctx.sorted_keys), initial=1)
+        for category, start in zip(ctx.sorted_keys, starts):
+            append(f"<b>{name_map[category]}</b>\n")
+            for idx, art in enumerate(categorized[category], start):
+                # 使用 HTML 格式，标题与链接均需转义（转义结果缓存在文章对象上）
+                append(f"{idx}. <a href=\"{art.url_attr_safe}\">{art.title_html_safe}</a>\n")
+            append("\n")
+
+        parts.append(f"共 {len(ctx.articles)} 篇 | Generated by News Collector")
+        return "".join(parts)
+
+    def _categorize_articles(self, articles: List[NewsArticle]) -> Dict[str, List[NewsArticle]]:
+        """按分类整理文章（同一批文章连续生成多种格式时复用上一次的结果）"""
+        key = tuple(map(id, articles))
+        if self._cat_cache is not None and self._cat_cache[0] == key:
+            return self._cat_cache[2]
+
+        categorized = {}
+        for article in articles:
+            cat = article.category or 'other'
+            if cat not in categorized:
+                categorized[cat] = []
+            categorized[cat].append(article)
+
+        self._cat_cache = (key, list(articles), categorized)
+        return categorized
+
+    def _generate_html(self, ctx: FormatContext) -> str:
+        """生成标准的基础 HTML 报告"""
+        sections_html = "".join(self._iter_category_blocks(ctx))
+
+        # 生成时间仅作页脚元信息，直接取本地时间字符串，无需构造 datetime
+        generated_at = time.strftime('%H:%M:%S')
+
+        return _BASIC_HTML_HEAD + _BASIC_PAGE_FMT(date_str=ctx.date_str, sections_html=sections_html, generated_at=generated_at)
+
+    def _generate_ai_html_template(self, data: Dict[str, Any], date: datetime) -> str:
+        """
+        生成 AI 增强版 HTML 报告 (Modern Premium Style)
         """
-        return html
+        return b"".join(self._iter_ai_bytes(data, date)).decode('utf-8')
+
+    def _iter_ai_bytes(self, data: Dict[str, Any], date: datetime) -> Iterator[bytes]:
+        """按顺序逐段产出 UTF-8 编码的 AI 报告，静态外壳直接产出预编码字节，写文件时无需先拼出完整字符串"""
+        date_str = date.strftime('%Y年%m月%d日')
+
+        yield _AI_HTML_HEAD
+        yield _AI_REPORT_HEADER_FMT(date_str=date_str).encode('utf-8')
+
+        # 1. 市场综述
+        if data.get("market_sentiment"):
+            yield _AI_SENTIMENT_FMT(content=_esc(data['market_sentiment'])).encode('utf-8')
+
+        # 2. 深度专题（空列表不输出分区外壳）
+        themes = data.get("themes") or ()
+        if themes:
+            yield _AI_THEMES_OPEN
+            for theme in themes:
+                imp = theme.get("importance", "中")
+                
+                # 关联文章链接
+                articles_links = ""
+                if "articles" in theme:
+                    # 来源标签在文章对象上缓存，重复渲染不再拼接
+                    links = "".join(art.source_tag_html for art in theme["articles"])
+                    if links:
+                        articles_links = _REF_LINKS_FMT(links)
+                
+                yield _render_theme_card(
+                    theme.get('title'), imp, theme.get('summary'), theme.get('insight'), articles_links,
+                ).encode('utf-8')
+            yield _AI_SECTION_CLOSE
+
+        # 3. 资讯速递
+        news_flash = data.get("news_flash") or ()
+        if news_flash:
+            yield _AI_FLASH_OPEN
+            for item in news_flash:
+                article_info = ""
+                if "article" in item:
+                    article_info = item["article"].flash_source_html
+                
+                yield _render_flash_item(item.get('title'), article_info, item.get('one_sentence_comment')).encode('utf-8')
+            yield _AI_SECTION_CLOSE
+
+        yield _AI_REPORT_FOOTER
+
+    def format_archive_page(self, reports: list) -> str:
+        """
+        生成历史归档页面
+
+        Args:
+            reports: 列表，每个元素包含 {'date': 'YYYY-MM-DD', 'title': '标题', 'url': '文件名.html', 'summary': '摘要'}，
+                     可选预先解析好的 'date_obj'（date 对象），存在时直接使用
+
+        Returns:
+            str: 归档页面 HTML
+        """
+        # 每个日期只解析一次，排序、按年分组和星期显示共用同一个 date 对象
+        decorated = [
+            (report.get('date_obj') or datetime.fromisoformat(report['date']).date(), report)
+            for report in reports
+        ]
+        # 按日期降序排列
+        decorated.sort(key=lambda t: t[0], reverse=True)
+
+        # 报告已按日期降序，相邻同年的报告连续出现，groupby 单次遍历即可完成分组
+        year_groups = [(year, list(group)) for year, group in groupby(decorated, key=lambda t: t[0].year)]
+
+        year_sections = [_render_year_section(group) for group in year_groups]
+
+        parts = [
+            _ARCHIVE_HTML_HEAD,
+            _ARCHIVE_PAGE_OPEN_FMT(report_count=len(decorated), year_count=len(year_groups)),
+            *year_sections,
+            _ARCHIVE_PAGE_CLOSE,
+        ]
+        return "".join(parts)
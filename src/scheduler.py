@@ -2,14 +2,21 @@
 定时任务调度器
 """
 
+import gzip
+import json
 import logging
 import re
 import signal
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from html import unescape
 from pathlib import Path
-from typing import List, Optional, Callable
+from typing import List, Optional, Callable, Sequence
+from urllib.parse import urlparse
 
+from apscheduler.executors.pool import ThreadPoolExecutor as JobThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
@@ -17,19 +24,69 @@ from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
 from .config import config
 from .database import db
 from .spiders import ScrapySpider, RSSSpider, PlaywrightSpider
-from .processors import Deduplicator, Formatter, AIProcessor
+from .processors import Deduplicator, Formatter, FormatContext, AIProcessor
 from .notifiers import NotifierFactory
 from .models import NewsArticle, WebsiteConfig, SpiderType, CrawlResult
 
 logger = logging.getLogger(__name__)
 
+# 归档页扫描：报告标题 <h1> 位于内联样式之后，位置随样式体积变化
+# （旧版未压缩样式的报告约在 28 KB 处），分块读取直到第一个 </h1>
+_ARCHIVE_H1_RE = re.compile(rb'<h1[^>]*>([^<]+)</h1>', re.IGNORECASE)
+_ARCHIVE_H1_OPEN_RE = re.compile(rb'<h1', re.IGNORECASE)
+_ARCHIVE_H1_CLOSE_RE = re.compile(rb'</h1>', re.IGNORECASE)
+_ARCHIVE_SCAN_CHUNK = 16384
+# 归档扫描结果缓存（按文件 mtime 判断是否需要重新解析），放在数据目录下，不随 outputs 发布；
+# 扫描方式变化时递增版本号，旧缓存整体失效
+_ARCHIVE_CACHE_FILE = "archive_cache.json"
+_ARCHIVE_CACHE_VERSION = 2
+
+
+def _scan_report_title(html_file: Path) -> Optional[bytes]:
+    """
+    分块读取报告，返回第一个 h1 标题的原始字节，未找到返回 None
+
+    已扫描过、不含 <h1 的部分随即丢弃，每块只在新读入的数据中查找，整体为一次线性扫描。
+    """
+    buf = b""
+    pos = 0  # buf 中下一次查找 <h1 的起点
+    with html_file.open('rb') as f:
+        while True:
+            chunk = f.read(_ARCHIVE_SCAN_CHUNK)
+            if not chunk:
+                return None
+            buf += chunk
+            while True:
+                opened = _ARCHIVE_H1_OPEN_RE.search(buf, pos)
+                if opened is None:
+                    # 保留末尾 2 字节，跨块的 "<h1" 下一轮仍能找到
+                    buf = buf[-2:]
+                    pos = 0
+                    break
+                closed = _ARCHIVE_H1_CLOSE_RE.search(buf, opened.start())
+                if closed is None:
+                    # 标题未读完：丢掉 <h1 之前的部分，继续读下一块
+                    buf = buf[opened.start():]
+                    pos = 0
+                    break
+                m = _ARCHIVE_H1_RE.match(buf, opened.start(), closed.end())
+                if m:
+                    return m.group(1)
+                # 标题内含其它标签，继续找下一个 h1
+                pos = opened.end()
+
 
 class NewsScheduler:
     """新闻爬取调度器"""
 
     def __init__(self):
-        self.scheduler = BackgroundScheduler()
-        self.deduplicator = Deduplicator()
+        # 每日爬取可能持续数分钟：同一任务不并发、积压的多次触发合并为一次，
+        # 错过触发时间（如进程繁忙或刚恢复）一小时内仍补跑
+        self.scheduler = BackgroundScheduler(
+            executors={'default': JobThreadPoolExecutor(4)},
+            job_defaults={'coalesce': True, 'max_instances': 1, 'misfire_grace_time': 3600},
+        )
+        self.deduplicator = Deduplicator(existing_urls=db.existing_urls)
         self.formatter = Formatter()
         
         # 初始化 AI 处理器
@@ -79,10 +136,11 @@ class NewsScheduler:
 
         self._running = True
         ai_report_data = None
+        format_ctx = None
 
         try:
             # 1. 获取所有网站配置
-            websites = config.get_all_website_list()
+            websites = config.get_website_configs()
             logger.info(f"共有 {len(websites)} 个数据源")
 
             # 2. 从数据库加载已见的URL
@@ -94,20 +152,30 @@ class NewsScheduler:
             logger.info(f"共爬取 {len(all_articles)} 篇新文章")
 
             if all_articles:
-                # 4. 保存到数据库
-                saved_count = db.save_articles(all_articles)
-                logger.info(f"保存 {saved_count} 篇文章到数据库")
-                
-                # 4.5 AI 深度分析
-                if self.ai_processor.enabled:
-                    logger.info("正在进行 AI 深度分析...")
-                    ai_report_data = self.ai_processor.process_daily_news(all_articles)
-
-                # 5. 发送通知 (TODO: 使通知器支持 AI 报告格式，目前暂传原始列表)
-                self._send_notifications(all_articles)
+                # AI 分析（LLM 往返耗时最长）在后台线程进行，与入库、通知并行；
+                # 只有本地报告需要等待 AI 结果
+                with ThreadPoolExecutor(max_workers=1, thread_name_prefix='ai') as ai_executor:
+                    ai_future = None
+                    if self.ai_processor.enabled:
+                        logger.info("正在进行 AI 深度分析...")
+                        ai_future = ai_executor.submit(self.ai_processor.process_daily_news, all_articles)
+
+                    # 4. 保存到数据库
+                    saved_count = db.save_articles(all_articles)
+                    logger.info(f"保存 {saved_count} 篇文章到数据库")
+
+                    # 分类排序只做一次，通知与本地报告共用
+                    format_ctx = self.formatter.make_context(all_articles)
+
+                    # 5. 发送通知 (TODO: 使通知器支持 AI 报告格式，目前暂传原始列表)
+                    self._send_notifications(all_articles, format_ctx)
+
+                    # 4.5 等待 AI 深度分析结果
+                    if ai_future is not None:
+                        ai_report_data = ai_future.result()
 
             # 6. 保存到本地文件
-            self._save_to_file(all_articles, ai_report_data)
+            self._save_to_file(all_articles, ai_report_data, format_ctx)
 
             # 7. 记录爬取历史
             self._log_crawl_history()
@@ -120,75 +188,116 @@ class NewsScheduler:
 
         return all_articles
 
-    def _crawl_all_websites(self, websites: List[dict]) -> List[NewsArticle]:
-        """爬取所有网站"""
+    def _crawl_all_websites(self, websites: Sequence[WebsiteConfig]) -> List[NewsArticle]:
+        """
+        爬取所有网站
+
+        抓取以网络 I/O 为主，用线程池重叠各站点的等待时间；同一域名共用一个信号量，
+        限制对单个站点的并发数。Playwright 数据源合并为一个任务，共用一个浏览器进程；
+        RSS 数据源也合并为一个任务，在同一事件循环内并发请求。
+        去重与数据库写入仍在主线程按完成顺序串行执行。
+        """
         all_articles = []
+        if not websites:
+            return all_articles
+
+        playwright_sites = [w for w in websites if w.type == SpiderType.PLAYWRIGHT.value]
+        rss_sites = [w for w in websites if w.type == SpiderType.RSS.value]
+        other_sites = [w for w in websites
+                       if w.type not in (SpiderType.PLAYWRIGHT.value, SpiderType.RSS.value)]
+
+        spider_config = config.get_spider_config()
+        task_count = len(other_sites) + (1 if playwright_sites else 0) + (1 if rss_sites else 0)
+        max_workers = max(1, min(spider_config.get('max_concurrency', 8), task_count))
+        per_host = max(1, spider_config.get('max_per_host', 2))
+
+        # 信号量在提交前建好，工作线程只读不写
+        host_limits = {}
+        for website in other_sites:
+            host = urlparse(website.url).netloc
+            if host not in host_limits:
+                host_limits[host] = threading.BoundedSemaphore(per_host)
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='crawl') as executor:
+            futures = {
+                executor.submit(
+                    self._crawl_one, website,
+                    host_limits[urlparse(website.url).netloc]
+                ): website.name
+                for website in other_sites
+            }
+            if playwright_sites:
+                futures[executor.submit(self._crawl_playwright_sites, playwright_sites)] = "Playwright 数据源"
+            if rss_sites:
+                futures[executor.submit(self._crawl_rss_sites, rss_sites)] = "RSS 数据源"
+
+            for future in as_completed(futures):
+                try:
+                    results = future.result()
+                except Exception as e:
+                    logger.error(f"爬取 {futures[future]} 失败: {e}")
+                    continue
 
-        for site_config in websites:
-            try:
-                # 创建网站配置对象
-                website = WebsiteConfig(
-                    name=site_config['name'],
-                    url=site_config['url'],
-                    category=site_config['category'],
-                    source_type=site_config['source_type'],
-                    type=site_config.get('type', SpiderType.SCRAPY.value),
-                    list_url=site_config.get('list_url'),
-                    list_selector=site_config.get('list_selector'),
-                    title_selector=site_config.get('title_selector'),
-                    link_selector=site_config.get('link_selector'),
-                    date_selector=site_config.get('date_selector'),
-                    rss_url=site_config.get('rss_url')
-                )
-
-                # 根据类型选择爬虫
-                spider_type = website.type
-                if spider_type == SpiderType.RSS.value:
-                    spider = RSSSpider(website)
-                elif spider_type == SpiderType.PLAYWRIGHT.value:
-                    spider = PlaywrightSpider(website)
-                else:
-                    spider = ScrapySpider(website)
-
-                # 执行爬取
-                articles = spider.crawl()
-
-                # 去重
-                articles = self.deduplicator.deduplicate(articles)
-
-                all_articles.extend(articles)
-
-                # 只在获取到文章时输出摘要
-                if articles:
-                    logger.info(f"[{website.name}] 成功获取 {len(articles)} 篇文章")
-
-                # 记录结果
-                result = CrawlResult(
-                    source_name=website.name,
-                    category=website.category,
-                    source_type=website.source_type,
-                    success=len(articles) > 0,
-                    articles=articles
-                )
-                db.save_crawl_result(result)
-
-            except Exception as e:
-                logger.error(f"爬取 {site_config.get('name')} 失败: {e}")
-                continue
+                for website, articles in results:
+                    try:
+                        # 去重
+                        articles = self.deduplicator.deduplicate(articles)
+
+                        all_articles.extend(articles)
+
+                        # 只在获取到文章时输出摘要
+                        if articles:
+                            logger.info(f"[{website.name}] 成功获取 {len(articles)} 篇文章")
+
+                        # 记录结果
+                        result = CrawlResult(
+                            source_name=website.name,
+                            category=website.category,
+                            source_type=website.source_type,
+                            success=len(articles) > 0,
+                            articles=articles
+                        )
+                        db.save_crawl_result(result)
+
+                    except Exception as e:
+                        logger.error(f"爬取 {website.name} 失败: {e}")
+                        continue
 
         return all_articles
 
+    def _crawl_one(self, website: WebsiteConfig, host_limit: threading.BoundedSemaphore):
+        """在工作线程中爬取单个 Scrapy 网站，返回 [(网站配置, 原始文章列表)]（RSS / Playwright 数据源走批量任务）"""
+        spider = ScrapySpider(website)
+
+        # 执行爬取
+        with host_limit:
+            articles = spider.crawl()
+
+        return [(website, articles)]
+
+    def _crawl_rss_sites(self, websites: List[WebsiteConfig]):
+        """在工作线程中批量爬取 RSS 数据源（并发请求各 feed），返回 [(网站配置, 原始文章列表)]"""
+        spiders = [RSSSpider(website) for website in websites]
+        results = RSSSpider.crawl_many(spiders)
+        return [(spider.config, articles) for spider, articles in zip(spiders, results)]
+
+    def _crawl_playwright_sites(self, websites: List[WebsiteConfig]):
+        """在工作线程中批量爬取 Playwright 数据源（共用一个浏览器），返回 [(网站配置, 原始文章列表)]"""
+        spiders = [PlaywrightSpider(website) for website in websites]
+        results = PlaywrightSpider.crawl_many(spiders)
+        return [(spider.config, articles) for spider, articles in zip(spiders, results)]
+
     def _load_seen_urls(self):
         """从数据库加载已见的URL"""
         try:
-            articles = db.get_recent_articles(days=30)
-            urls = [a.url for a in articles]
-            self.deduplicator.load_from_database(urls)
-            logger.info(f"已加载 {len(urls)} 个已见URL")
+            count = self.deduplicator.load_from_database(
+                db.get_recent_urls(days=30), expected=db.count_recent_urls(days=30)
+            )
+            logger.info(f"已加载 {count} 个已见URL")
         except Exception as e:
             logger.warning(f"加载已见URL失败: {e}")
 
-    def _send_notifications(self, articles: List[NewsArticle]):
+    def _send_notifications(self, articles: List[NewsArticle], format_ctx: FormatContext = None):
         """发送通知"""
         if not self.notifiers:
             self.notifiers = NotifierFactory.create_all(config.get_notifiers_config())
@@ -196,7 +305,7 @@ class NewsScheduler:
         for notifier in self.notifiers:
             if notifier.is_available():
                 try:
-                    result = notifier.send(articles)
+                    result = notifier.send(articles, ctx=format_ctx)
                     logger.info(f"{notifier.name} 通知结果: {'成功' if result.success else '失败'}")
                 except Exception as e:
                     logger.error(f"{notifier.name} 通知失败: {e}")
@@ -206,7 +315,7 @@ class NewsScheduler:
         stats = db.get_statistics()
         logger.info(f"当前数据库统计: {stats}")
 
-    def _save_to_file(self, articles: List[NewsArticle], ai_report_data: dict = None):
+    def _save_to_file(self, articles: List[NewsArticle], ai_report_data: dict = None, format_ctx: FormatContext = None):
         """保存爬取结果到本地HTML文件"""
         try:
             # 如果没有新文章，从数据库获取最近的
@@ -218,6 +327,9 @@ class NewsScheduler:
                     logger.info("没有文章可保存")
                     return
 
+            if format_ctx is None:
+                format_ctx = self.formatter.make_context(articles)
+
             # 创建输出目录
             output_dir = Path("outputs")
             output_dir.mkdir(exist_ok=True)
@@ -229,13 +341,13 @@ class NewsScheduler:
             # 使用 Formatter 生成 HTML
             if ai_report_data:
                 logger.info("生成合并版 HTML 报告（标准列表 + AI分析）")
-                html = self.formatter.format_combined_report(articles, ai_report_data)
+                html = self.formatter.iter_combined_report(format_ctx, ai_report_data)
             else:
                 logger.info("生成标准版 HTML 报告")
-                subject, html = self.formatter.format_for_email(articles)
+                subject, html = self.formatter.format_for_email(format_ctx)
 
             # 保存文件
-            output_file.write_text(html, encoding='utf-8')
+            self._write_html(output_file, html)
             logger.info(f"已保存HTML到: {output_file}")
 
             # 生成归档页
@@ -244,10 +356,41 @@ class NewsScheduler:
         except Exception as e:
             logger.error(f"保存文件失败: {e}")
 
+    def _write_html(self, output_file: Path, html):
+        """写入 HTML 文件，按配置额外生成 .html.gz 压缩副本
+
+        Args:
+            html: 完整 HTML 字符串，或逐段产出的字符串迭代器（逐段写入，不拼接整页）
+        """
+        chunks = (html,) if isinstance(html, str) else html
+        gz_file = output_file.with_name(output_file.name + '.gz')
+
+        # 合并版报告由大量小片段组成，1 MiB 写缓冲减少 write 系统调用
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            # 报告中大段 CSS/JS 为静态内容，gzip 后体积约为原来的 1/6
+            if not config.get('output.gzip', False):
+                f.writelines(chunks)
+                return
+
+            with gzip.open(gz_file, 'wt', encoding='utf-8', compresslevel=6) as gz:
+                for chunk in chunks:
+                    f.write(chunk)
+                    gz.write(chunk)
+        logger.info(f"已保存压缩副本: {gz_file}")
+
     def _generate_archive_page(self, output_dir: Path):
         """扫描 outputs 目录生成归档页面"""
         try:
-            import re
+            cache_file = db.db_path.parent / _ARCHIVE_CACHE_FILE
+            try:
+                cache_data = json.loads(cache_file.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                cache_data = {}
+            if cache_data.get('version') == _ARCHIVE_CACHE_VERSION:
+                cache = cache_data.get('files', {})
+            else:
+                cache = {}
+            new_cache = {}
 
             reports = []
             # 扫描所有 news_*.html 文件
@@ -257,35 +400,45 @@ class NewsScheduler:
                     date_str = html_file.stem  # news_2026-01-22
                     date = date_str.replace("news_", "")
 
-                    # 解析 HTML 文件获取标题
-                    content = html_file.read_text(encoding='utf-8')
-
-                    # 提取标题 (优先取 h1)
-                    title_match = re.search(r'<h1[^>]*>([^<]+)</h1>', content, re.IGNORECASE)
-                    if title_match:
-                        title = title_match.group(1).strip()
+                    # 文件未变化时直接复用上次解析的标题
+                    mtime_ns = html_file.stat().st_mtime_ns
+                    cached = cache.get(html_file.name)
+                    if cached and cached.get('mtime_ns') == mtime_ns:
+                        title = cached['title']
                     else:
-                        title = f"{date} 金融资讯"
-
-                    # 提取摘要（取第一段 article 摘要）
-                    summary_match = re.search(r'<div class="summary"[^>]*>([^<]+)</div>', content)
-                    summary = summary_match.group(1).strip() if summary_match else ""
+                        title_raw = _scan_report_title(html_file)
+                        # 页面中的文本已是 HTML 转义形式，还原后交给 Formatter 统一转义
+                        if title_raw:
+                            title = unescape(title_raw.decode('utf-8', 'replace').strip())
+                        else:
+                            title = f"{date} 金融资讯"
+                    new_cache[html_file.name] = {'mtime_ns': mtime_ns, 'title': title}
 
                     reports.append({
                         'date': date,
                         'title': title,
                         'url': html_file.name,
-                        'summary': summary
+                        # 预先解析日期，归档页排序、分组与渲染直接复用
+                        'date_obj': datetime.fromisoformat(date).date(),
                     })
                 except Exception as e:
                     logger.warning(f"解析 {html_file.name} 失败: {e}")
                     continue
 
+            if new_cache != cache:
+                try:
+                    cache_file.write_text(
+                        json.dumps({'version': _ARCHIVE_CACHE_VERSION, 'files': new_cache}, ensure_ascii=False),
+                        encoding='utf-8'
+                    )
+                except OSError as e:
+                    logger.debug(f"写入归档缓存失败: {e}")
+
             if reports:
                 # 直接生成 index.html（归档页）
                 archive_html = self.formatter.format_archive_page(reports)
                 index_file = output_dir / "index.html"
-                index_file.write_text(archive_html, encoding='utf-8')
+                self._write_html(index_file, archive_html)
                 logger.info(f"已生成归档页: {index_file} ({len(reports)} 期)")
 
         except Exception as e:
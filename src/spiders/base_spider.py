@@ -2,25 +2,147 @@
 基础爬虫类
 """
 
+import asyncio
+import importlib.util
 import logging
+import random
 import re
+import threading
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
 from urllib.parse import urljoin, urlparse
 
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+from urllib3.util.request import ACCEPT_ENCODING
+from lxml.cssselect import CSSSelector
 
 from ..config import config
 from ..models import NewsArticle, SpiderType, WebsiteConfig
 
 logger = logging.getLogger(__name__)
 
+# 统一按 UTF-8 字节交给 lxml 解析，避免带 <?xml encoding=...?> 声明的页面在 str 输入时报错
+_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+# 元素文本（等价于 BeautifulSoup 的 get_text(strip=True)：逐段去空白后直接拼接，忽略注释与脚本/样式）
+_TEXT_XPATH = etree.XPath('descendant-or-self::text()[not(ancestor::script or ancestor::style)]')
+
+# 正文容器兜底：class 中包含 article/content/post/entry 的第一个元素
+_CONTENT_CLASS_XPATH = etree.XPath(
+    '//*[re:test(@class, "article|content|post|entry")]',
+    namespaces={'re': 'http://exslt.org/regular-expressions'},
+)
+
+# 提取正文前需要移除的噪声标签
+_NOISE_TAGS = ('script', 'style', 'nav', 'header', 'footer')
+
+
+# httpx 的 HTTP/2 支持依赖可选的 h2 包
+_HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+# 响应头与页面 <meta> 中声明的编码
+_HEADER_CHARSET_RE = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w.:-]+)', re.IGNORECASE)
+# 声明为 GB2312/GBK 的页面常混有超出字符集的汉字，统一按超集 GB18030 解码
+_ENCODING_ALIASES = {'gb2312': 'gb18030', 'gbk': 'gb18030'}
+
+# 常见日期格式
+_DATE_FORMATS = (
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%d',
+    '%Y/%m/%d %H:%M:%S',
+    '%Y/%m/%d %H:%M',
+    '%Y/%m/%d',
+    '%m-%d %H:%M',
+    '%m月%d日 %H:%M',
+    '%m月%d日',
+)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_cached(date_str: str, hint: Optional[str] = None):
+    """
+    解析日期字符串，返回 (datetime, 命中的格式) 或 None（失败结果同样缓存）
+
+    ISO 形式（2026-01-22 / 2026-01-22 08:30:00）先走 C 实现的 fromisoformat，
+    命中时格式返回 None，不影响来源的格式提示。
+    """
+    if len(date_str) >= 10 and date_str[4] == '-':
+        try:
+            dt = datetime.fromisoformat(date_str)
+        except ValueError:
+            pass
+        else:
+            if dt.tzinfo is None:
+                return dt, None
+
+    formats = _DATE_FORMATS
+    if hint:
+        formats = (hint,) + tuple(fmt for fmt in _DATE_FORMATS if fmt != hint)
+
+    for fmt in formats:
+        try:
+            return datetime.strptime(date_str, fmt), fmt
+        except ValueError:
+            continue
+
+    return None
+
+
+@lru_cache(maxsize=256)
+def _compile_excludes(patterns: tuple) -> Optional[re.Pattern]:
+    """把 URL 排除子串合并为一个正则（单次扫描匹配全部子串），无模式时返回 None"""
+    if not patterns:
+        return None
+    return re.compile('|'.join(map(re.escape, patterns)))
+
+
+@lru_cache(maxsize=256)
+def _css(selector: str) -> CSSSelector:
+    """编译 CSS 选择器（各站点选择器固定，编译结果按字符串缓存）"""
+    return CSSSelector(selector)
+
+
+def _parse_html(html: str):
+    """解析 HTML 为 lxml 文档树，空文档或无法解析时返回 None"""
+    if not html:
+        return None
+    try:
+        return lxml.html.document_fromstring(html.encode('utf-8', 'replace'), parser=_HTML_PARSER)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+def _node_text(elem) -> str:
+    """获取元素的纯文本"""
+    return ''.join(s.strip() for s in _TEXT_XPATH(elem))
+
+
+def _drop_tags(elem, tags):
+    """清空 elem 下指定标签的内容与子树（保留尾随文本为独立片段，与 decompose 后的取文本结果一致）"""
+    for tag in list(elem.iterdescendants(*tags)):
+        tag.clear(keep_tail=True)
+
 
 class BaseSpider(ABC):
     """爬虫基类"""
 
+    # 所有爬虫共用一个 Session：连接池跨站点、跨线程复用，同一域名的后续请求免去 TCP/TLS 握手
+    _shared_session: Optional[requests.Session] = None
+    _session_lock = threading.Lock()
+    # 连接池大小需覆盖线程池并发数；重试由 _make_request 自行处理
+    POOL_SIZE = 64
+    # _fetch_many_async 同时进行的请求数
+    FETCH_CONCURRENCY = 8
+
     def __init__(self, website_config: WebsiteConfig):
         self.config = website_config
         self.name = website_config.name
@@ -35,24 +157,50 @@ class BaseSpider(ABC):
         self.retry_times = spider_config.get('retry_times', 3)
         self.delay = spider_config.get('delay', 1)
         self.max_items = spider_config.get('max_items_per_source', 50)
+        # 正文最大字符数（部分页面正文后附带大量评论，0 表示不限制）
+        self.max_content_chars = spider_config.get('max_content_chars', 0)
+
+        # URL 排除模式预编译为单个正则
+        self._exclude_re = _compile_excludes(tuple(getattr(website_config, 'exclude_patterns', None) or ()))
+
+        # 本次爬取的时间戳，同一次爬取的文章共用（crawl() 开始时刷新）
+        self._crawl_time = datetime.now()
+
+        # 同一来源的日期格式通常固定，记下上次成功的格式优先尝试
+        self._date_fmt_hint: Optional[str] = None
 
         # 获取代理设置
         proxy_config = spider_config.get('proxy', {})
         self.proxy_url = proxy_config.get('url', 'http://127.0.0.1:7897')
 
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': spider_config.get('user_agent',
-                'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'zh-CN,zh;q=0.8,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        })
+        self.session = self._get_shared_session(spider_config)
+
+    @classmethod
+    def _get_shared_session(cls, spider_config: Dict[str, Any]) -> requests.Session:
+        """获取（首次调用时创建）共享的 requests.Session"""
+        if BaseSpider._shared_session is None:
+            with BaseSpider._session_lock:
+                if BaseSpider._shared_session is None:
+                    session = requests.Session()
+                    session.headers.update({
+                        'User-Agent': spider_config.get('user_agent',
+                            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'),
+                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                        'Accept-Language': 'zh-CN,zh;q=0.8,en;q=0.5',
+                        # 只声明 urllib3 能解压的编码（安装 brotli / zstandard 后自动加入 br、zstd）
+                        'Accept-Encoding': ACCEPT_ENCODING,
+                        'Connection': 'keep-alive',
+                    })
+                    adapter = HTTPAdapter(pool_connections=cls.POOL_SIZE, pool_maxsize=cls.POOL_SIZE, max_retries=0)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    BaseSpider._shared_session = session
+        return BaseSpider._shared_session
 
     def crawl(self) -> List[NewsArticle]:
         """执行爬取"""
         logger.info(f"开始爬取: {self.name} ({self.base_url})")
+        self._crawl_time = datetime.now()
         try:
             articles = self._crawl_impl()
             logger.info(f"爬取完成: {self.name}, 获取 {len(articles)} 篇文章")
@@ -66,8 +214,9 @@ class BaseSpider(ABC):
         """实际爬取逻辑，子类实现"""
         pass
 
-    def _make_request(self, url: str, retries: int = None) -> Optional[requests.Response]:
-        """发送HTTP请求"""
+    def _make_request(self, url: str, retries: int = None,
+                      headers: Optional[dict] = None, method: str = 'GET') -> Optional[requests.Response]:
+        """发送HTTP请求（headers 为本次请求额外附加的请求头）"""
         if retries is None:
             retries = self.retry_times
 
@@ -83,31 +232,20 @@ class BaseSpider(ABC):
                     }
                     logger.debug(f"[{self.name}] 使用代理: {self.proxy_url}")
 
-                response = self.session.get(url, timeout=self.timeout, proxies=proxies)
+                response = self.session.request(method, url, timeout=self.timeout, proxies=proxies, headers=headers)
                 response.raise_for_status()
 
                 # 正确处理中文编码
-                # 优先使用配置的编码，其次使用响应头中的编码
-                if self.encoding:
-                    response.encoding = self.encoding
-                elif response.apparent_encoding:
-                    response.encoding = response.apparent_encoding
-                elif 'charset' in response.headers.get('content-type', '').lower():
-                    # 从 Content-Type 中提取编码
-                    content_type = response.headers.get('content-type', '')
-                    match = re.search(r'charset=([^\s;]+)', content_type, re.IGNORECASE)
-                    if match:
-                        response.encoding = match.group(1)
-                else:
-                    # 默认尝试 utf-8
-                    response.encoding = 'utf-8'
+                response.encoding = self._detect_encoding(
+                    response.content, response.headers.get('content-type', '')
+                )
 
                 return response
             except requests.RequestException as e:
                 last_error = e
                 if attempt < retries - 1:
-                    import time
-                    time.sleep(self.delay)
+                    # 指数退避 + 随机抖动，避免多个线程同时重试同一限流站点
+                    time.sleep(self.delay * (2 ** attempt) + random.uniform(0, 0.5))
 
         # 只在最后一次失败时输出警告
         if last_error:
@@ -122,37 +260,152 @@ class BaseSpider(ABC):
                 logger.debug(f"[{self.name}] 请求失败: {url}")
         return None
 
+    def _detect_encoding(self, content: bytes, content_type: str) -> str:
+        """
+        确定页面编码：配置的编码 > 响应头 charset > 页面前部的 <meta charset> > 内容探测 > utf-8
+
+        内容探测（chardet）要扫描整个响应体，只在前几种方式都拿不到编码时才使用。
+        """
+        if self.encoding:
+            return self.encoding
+
+        # 从 Content-Type 中提取编码
+        match = _HEADER_CHARSET_RE.search(content_type)
+        if match:
+            declared = match.group(1).lower()
+            return _ENCODING_ALIASES.get(declared, declared)
+
+        # <meta charset="..."> / <meta http-equiv ... content="...; charset=..."> 通常在前 1 KB 内
+        match = _META_CHARSET_RE.search(content, 0, 1024)
+        if match:
+            declared = match.group(1).decode('ascii').lower()
+            return _ENCODING_ALIASES.get(declared, declared)
+
+        detected = chardet.detect(content)['encoding']
+        if detected:
+            return detected
+
+        # 默认尝试 utf-8
+        return 'utf-8'
+
+    def _decode_html(self, content: bytes, content_type: str) -> str:
+        """按 _detect_encoding 的结果解码响应体（与 requests 的 response.text 一致，无法识别的编码退回 utf-8）"""
+        encoding = self._detect_encoding(content, content_type)
+        try:
+            return content.decode(encoding, errors='replace')
+        except LookupError:
+            return content.decode('utf-8', errors='replace')
+
+    def _async_client(self):
+        """
+        创建与共享 Session 请求头、代理一致的 httpx.AsyncClient
+
+        安装了 h2 时启用 HTTP/2，同源的列表页与文章页复用一条连接并行传输。
+        """
+        import httpx
+
+        # 压缩编码交给 httpx 按自身支持的解码器协商
+        headers = {k: v for k, v in self.session.headers.items()
+                   if k.lower() not in ('accept-encoding', 'connection')}
+        client_kwargs = {
+            'headers': headers,
+            'timeout': self.timeout,
+            'follow_redirects': True,
+            'http2': _HTTP2_AVAILABLE,
+            'limits': httpx.Limits(max_connections=self.FETCH_CONCURRENCY * 2,
+                                   max_keepalive_connections=self.FETCH_CONCURRENCY * 2),
+        }
+        if self.use_proxy or getattr(self.config, 'use_proxy', False):
+            client_kwargs['proxy'] = self.proxy_url
+        return httpx.AsyncClient(**client_kwargs)
+
+    async def _fetch_async(self, client, url: str) -> Optional[str]:
+        """用给定客户端抓取单个页面（失败时按退避重试），返回解码后的 HTML，失败返回 None"""
+        import httpx
+
+        retries = max(1, self.retry_times)
+        for attempt in range(retries):
+            try:
+                response = await client.get(url)
+                response.raise_for_status()
+                return self._decode_html(response.content, response.headers.get('content-type', ''))
+            except httpx.HTTPError as e:
+                if attempt < retries - 1:
+                    await asyncio.sleep(self.delay * (2 ** attempt) + random.uniform(0, 0.5))
+                else:
+                    logger.debug(f"[{self.name}] 请求失败: {url} ({type(e).__name__})")
+        return None
+
+    async def _fetch_many_async(self, urls: List[str],
+                                parse: Optional[Callable[[str, str], Any]] = None,
+                                client=None) -> Dict[str, Any]:
+        """
+        并发抓取多个页面（文章详情页等），返回 {url: html}，失败的 URL 不在结果中
+
+        给出 parse(url, html) 时，每个页面下载完成后立即在线程池中解析，与其余页面的下载重叠，
+        结果为 {url: parse 的返回值}；解析出错的 URL 同样不在结果中。
+        同时进行的请求数受 FETCH_CONCURRENCY 限制；未给出 client 时临时创建一个 _async_client()。
+        """
+        if client is None:
+            async with self._async_client() as client:
+                return await self._fetch_many_async(urls, parse, client)
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.FETCH_CONCURRENCY)
+
+        async def fetch(url: str):
+            async with semaphore:
+                html = await self._fetch_async(client, url)
+            if html is None or parse is None:
+                return url, html
+            # 解析放到信号量之外，不占用下载名额
+            try:
+                return url, await loop.run_in_executor(None, parse, url, html)
+            except Exception as e:
+                logger.debug(f"[{self.name}] 解析页面失败: {url}, 错误: {e}")
+                return url, None
+
+        results = await asyncio.gather(*(fetch(url) for url in urls))
+
+        return {url: result for url, result in results if result is not None}
+
     def _parse_list_page(self, html: str, list_selector: str = None,
                          title_selector: str = None, link_selector: str = None) -> List[Dict[str, str]]:
         """解析列表页"""
-        soup = BeautifulSoup(html, 'lxml')
+        root = _parse_html(html)
         items = []
+        if root is None:
+            return items
 
         # 使用配置的选择器或默认值
         selector = list_selector or self.config.list_selector or '.news-list li'
         title_s = title_selector or self.config.title_selector or ''
         link_s = link_selector or self.config.link_selector or ''
 
-        # 获取URL排除模式
-        exclude_patterns = getattr(self.config, 'exclude_patterns', [])
+        exclude_re = self._exclude_re
 
-        elements = soup.select(selector)
+        title_sel = _css(title_s) if title_s else None
+        link_sel = _css(link_s) if link_s else None
+
+        elements = _css(selector)(root)
         for elem in elements[:self.max_items]:
             try:
                 # 如果 title_selector 为空，使用元素本身
-                if title_s:
-                    title_elem = elem.select_one(title_s)
+                if title_sel is not None:
+                    found = title_sel(elem)
+                    title_elem = found[0] if found else None
                 else:
                     title_elem = elem
 
                 # 如果 link_selector 为空，使用元素本身
-                if link_s:
-                    link_elem = elem.select_one(link_s)
+                if link_sel is not None:
+                    found = link_sel(elem)
+                    link_elem = found[0] if found else None
                 else:
                     link_elem = elem
 
-                if title_elem and link_elem:
-                    title = title_elem.get_text(strip=True)
+                if title_elem is not None and link_elem is not None:
+                    title = _node_text(title_elem)
                     link = link_elem.get('href', '')
 
                     if title and link:
@@ -161,7 +414,7 @@ class BaseSpider(ABC):
                             link = urljoin(self.base_url, link)
 
                         # URL过滤：排除广告、导航等无效链接
-                        if exclude_patterns and any(pattern in link for pattern in exclude_patterns):
+                        if exclude_re is not None and exclude_re.search(link):
                             logger.debug(f"排除无效链接: {link}")
                             continue
 
@@ -177,45 +430,49 @@ class BaseSpider(ABC):
 
     def _extract_article_content(self, url: str, html: str) -> tuple:
         """提取文章内容"""
-        soup = BeautifulSoup(html, 'lxml')
+        root = _parse_html(html)
 
         # 尝试多种方式提取正文
         content = ""
         summary = ""
 
+        if root is None:
+            return summary, content
+
         # 方法1: 查找文章容器
-        article_elem = soup.find('article') or soup.find(class_=re.compile(r'article|content|post|entry'))
+        article_elem = root.find('.//article')
+        if article_elem is None:
+            found = _CONTENT_CLASS_XPATH(root)
+            article_elem = found[0] if found else None
 
-        if article_elem:
+        if article_elem is not None:
             # 移除脚本和样式
-            for tag in article_elem.find_all(['script', 'style', 'nav', 'header', 'footer']):
-                tag.decompose()
+            _drop_tags(article_elem, _NOISE_TAGS)
 
-            # 获取纯文本
-            paragraphs = article_elem.find_all('p')
+            # 获取纯文本（摘要只取首段；正文超过上限后不再读取后续段落）
+            paragraphs = article_elem.findall('.//p')
             if paragraphs:
-                content = '\n\n'.join([p.get_text(strip=True) for p in paragraphs])
-                summary = paragraphs[0].get_text(strip=True)[:200] if paragraphs else ""
+                summary = _node_text(paragraphs[0])[:200]
+                content = self._join_paragraphs(paragraphs)
 
         # 方法2: 如果没有找到，尝试其他选择器
         if not content:
             for selector in ['.content', '.article-body', '.post-content', '#content']:
-                elem = soup.select_one(selector)
-                if elem:
-                    for tag in elem.find_all(['script', 'style', 'nav', 'header', 'footer']):
-                        tag.decompose()
-                    content = elem.get_text(strip=True)
+                found = _css(selector)(root)
+                if found:
+                    elem = found[0]
+                    _drop_tags(elem, _NOISE_TAGS)
+                    content = self._limit_content(_node_text(elem))
                     summary = content[:200]
                     break
 
         # 方法3: 使用正则表达式提取
         if not content:
             # 移除脚本和样式
-            for tag in soup.find_all(['script', 'style']):
-                tag.decompose()
-            body = soup.find('body')
-            if body:
-                content = body.get_text(strip=True)
+            _drop_tags(root, ('script', 'style'))
+            body = root.find('body')
+            if body is not None:
+                content = self._limit_content(_node_text(body))
                 summary = content[:200]
 
         # 清理内容
@@ -224,43 +481,48 @@ class BaseSpider(ABC):
 
         return summary, content
 
+    def _join_paragraphs(self, paragraphs) -> str:
+        """拼接段落文本；设置了 max_content_chars 时，累计长度达到上限即停止取后续段落"""
+        limit = self.max_content_chars
+        if not limit:
+            return '\n\n'.join([_node_text(p) for p in paragraphs])
+
+        parts = []
+        total = 0
+        for p in paragraphs:
+            text = _node_text(p)
+            parts.append(text)
+            total += len(text) + 2
+            if total >= limit:
+                break
+        return self._limit_content('\n\n'.join(parts))
+
+    def _limit_content(self, text: str) -> str:
+        """按 max_content_chars 截断正文（0 表示不限制）"""
+        limit = self.max_content_chars
+        return text[:limit] if limit else text
+
     def _clean_content(self, text: str) -> str:
         """清理内容"""
         if not text:
             return ""
 
-        # 移除多余空白
-        lines = text.split('\n')
-        lines = [line.strip() for line in lines if line.strip()]
-        return '\n'.join(lines)
+        # 移除多余空白（逐行去首尾空白并丢弃空行，不生成中间列表）
+        return '\n'.join(filter(None, (line.strip() for line in text.splitlines())))
 
     def _parse_date(self, date_str: str) -> Optional[datetime]:
-        """解析日期"""
+        """解析日期（优先尝试本来源上次成功的格式）"""
         if not date_str:
             return None
 
-        date_str = date_str.strip()
-
-        # 常见日期格式
-        formats = [
-            '%Y-%m-%d %H:%M:%S',
-            '%Y-%m-%d %H:%M',
-            '%Y-%m-%d',
-            '%Y/%m/%d %H:%M:%S',
-            '%Y/%m/%d %H:%M',
-            '%Y/%m/%d',
-            '%m-%d %H:%M',
-            '%m月%d日 %H:%M',
-            '%m月%d日',
-        ]
-
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str, fmt)
-            except ValueError:
-                continue
+        parsed = _parse_date_cached(date_str.strip(), self._date_fmt_hint)
+        if parsed is None:
+            return None
 
-        return None
+        dt, fmt = parsed
+        if fmt is not None:
+            self._date_fmt_hint = fmt
+        return dt
 
     def _create_article(self, title: str, url: str, summary: str = "", content: str = "",
                         publish_time: datetime = None) -> NewsArticle:
@@ -274,5 +536,5 @@ class BaseSpider(ABC):
             publish_time=publish_time,
             summary=summary,
             content=content,
-            crawled_time=datetime.now()
+            crawled_time=self._crawl_time
         )
@@ -3,11 +3,14 @@ Playwright动态页面爬虫
 """
 
 import asyncio
+import json
 import logging
 import random
 import time
+from datetime import datetime
+from pathlib import Path
 from typing import List, Optional
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 
 from .base_spider import BaseSpider
 from ..config import config
@@ -15,16 +18,154 @@ from ..models import NewsArticle, SpiderType, WebsiteConfig
 
 logger = logging.getLogger(__name__)
 
-# 随机User-Agent列表
-USER_AGENTS = [
+# 随机User-Agent列表（只读，各爬虫共用）
+USER_AGENTS = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+)
+
+# Chromium 启动参数（反检测 + 容器环境兼容）
+_BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--mute-audio',
+    '--disable-accelerated-2d-canvas',
 ]
 
+# 正文容器候选选择器（按优先级）
+_CONTENT_SELECTORS = [
+    'article',
+    '.article-content',
+    '.post-content',
+    '.content',
+    '#content',
+    '.article-body',
+    '.article-main',
+    '.news-content',
+    '.text-content',
+]
+
+# 文本抓取不需要的资源类型，在浏览器内直接拦截（不含 'other'：未归类的请求中可能有站点渲染正文所需的资源）
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet'})
+
+
+async def _block_resources(route) -> None:
+    """拦截图片、字体、样式等与正文无关的请求"""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# 列表页：在页面内完成条目提取与 URL 排除，只把保留下来的前 max 个 [标题文本, href] 传回；
+# 排除模式按子串匹配补全后的绝对地址，href 原样返回，由 Python 端补全
+_LIST_ITEMS_JS = """
+(els, cfg) => {
+    const out = [];
+    for (const el of els) {
+        if (out.length >= cfg.max) break;
+        const titleEl = cfg.title ? el.querySelector(cfg.title) : el;
+        const linkEl = cfg.link ? el.querySelector(cfg.link) : el;
+        if (!titleEl || !linkEl) continue;
+        const title = titleEl.innerText;
+        const href = linkEl.getAttribute('href');
+        if (!title || !href) continue;
+        let url = href;
+        if (!href.startsWith('http')) {
+            try { url = new URL(href, cfg.base).href; } catch (e) {}
+        }
+        if (cfg.exclude.some(p => url.includes(p))) continue;
+        out.push([title, href]);
+    }
+    return out;
+}
+"""
+
+# 文章页：取第一个含非空段落的正文容器，返回 {parts: 去空白后的段落文本}；
+# 都没有时在同一次调用中退回整页文本 {body: ...}
+_ARTICLE_TEXT_JS = """
+(selectors) => {
+    for (const sel of selectors) {
+        const el = document.querySelector(sel);
+        if (!el) continue;
+        const parts = Array.from(el.querySelectorAll('p'), p => p.innerText.trim()).filter(Boolean);
+        if (parts.length) return {parts};
+    }
+    return {body: document.body ? document.body.innerText : ''};
+}
+"""
+
+# 批量爬取时同时打开的站点上下文数量
+MAX_PARALLEL_PAGES = 3
+
+
+async def _launch_browser(p, headless: bool = True):
+    """启动 Chromium"""
+    return await p.chromium.launch(headless=headless, args=_BROWSER_ARGS)
+
+
+class _BrowserPool:
+    """
+    批量爬取期间共享的 Chromium
+
+    各站点从这里取浏览器创建自己的上下文；同一浏览器累计创建 max_contexts 个上下文后
+    换用新启动的浏览器，旧浏览器待其上下文全部结束后关闭，以限制长时间运行的内存增长
+    """
+
+    def __init__(self, p, headless: bool = True, max_contexts: int = 10):
+        self._p = p
+        self._headless = headless
+        self._max_contexts = max(1, max_contexts)
+        self._lock = asyncio.Lock()
+        self._browser = None
+        self._created = 0
+        # 浏览器 -> 仍在使用它的站点数
+        self._active = {}
+
+    async def acquire(self):
+        """取得当前浏览器（必要时启动或换新），用完须调用 release"""
+        async with self._lock:
+            if self._browser is None or self._created >= self._max_contexts:
+                old = self._browser
+                self._browser = await _launch_browser(self._p, headless=self._headless)
+                self._active[self._browser] = 0
+                self._created = 0
+                if old is not None:
+                    logger.debug("浏览器已达上下文上限，启动新浏览器")
+                    if not self._active[old]:
+                        await self._retire(old)
+            self._created += 1
+            self._active[self._browser] += 1
+            return self._browser
+
+    async def release(self, browser) -> None:
+        """归还浏览器；已被换下且无人使用时关闭"""
+        self._active[browser] -= 1
+        if browser is not self._browser and not self._active[browser]:
+            await self._retire(browser)
+
+    async def _retire(self, browser) -> None:
+        del self._active[browser]
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.debug(f"关闭浏览器失败: {e}")
+
+    async def close(self) -> None:
+        """关闭所有浏览器"""
+        for browser in list(self._active):
+            await self._retire(browser)
+        self._browser = None
+
 
 class PlaywrightSpider(BaseSpider):
     """Playwright动态页面爬虫"""
@@ -34,39 +175,22 @@ class PlaywrightSpider(BaseSpider):
         self.type = SpiderType.PLAYWRIGHT
         self._browser = None
 
-    def _get_random_user_agent(self) -> str:
-        """获取随机User-Agent"""
-        return random.choice(USER_AGENTS)
-
-    async def _create_stealth_context(self, p) -> dict:
-        """创建反检测浏览器上下文"""
-        browser_args = [
-            '--disable-blink-features=AutomationControlled',
-            '--disable-dev-shm-usage',
-            '--disable-gpu',
-            '--no-sandbox',
-            '--disable-setuid-sandbox',
-            '--disable-web-security',
-            '--disable-features=IsolateOrigins,site-per-process',
-            '--mute-audio',
-            '--disable-accelerated-2d-canvas',
-        ]
-
-        # 获取代理设置
+        # 同一站点内并发抓取文章详情的页面数
         spider_config = config.get_spider_config()
-        proxy_config = spider_config.get('proxy', {})
-        proxy_enabled = proxy_config.get('enabled', False) or (hasattr(self.config, 'use_proxy') and self.config.use_proxy)
-        proxy_url = proxy_config.get('url', 'http://127.0.0.1:7897')
-
-        # 启动浏览器
-        browser = await p.chromium.launch(
-            headless=self.config.headless if hasattr(self.config, 'headless') else True,
-            args=browser_args
-        )
-
-        # 构建context参数
-        context_params = {
-            'user_agent': self._get_random_user_agent(),
+        playwright_config = spider_config.get('playwright', {})
+        self.page_concurrency = max(1, playwright_config.get('page_concurrency', 4))
+        # 每个浏览器上下文最多抓取的文章数，超过后换新上下文
+        self.articles_per_context = max(1, playwright_config.get('articles_per_context', 50))
+        # 是否拦截图片、字体、样式等资源
+        self.block_resources = playwright_config.get('block_resources', True)
+
+        # 站点的 Cookie / localStorage 保存在 storage_state_dir 下（按域名一个文件），
+        # 下次运行时恢复，免去重复的 Cookie 同意、重定向等首访流程；配置为空时不保存
+        state_dir = playwright_config.get('storage_state_dir', 'data/browser_state')
+        self._state_file = Path(state_dir) / f"{urlparse(self.base_url).netloc}.json" if state_dir else None
+
+        # 上下文参数在初始化时确定，每次创建上下文只需补上随机 User-Agent
+        self._context_params = {
             'viewport': {'width': 1920, 'height': 1080},
             'locale': 'zh-CN',
             'timezone_id': 'Asia/Shanghai',
@@ -76,13 +200,84 @@ class PlaywrightSpider(BaseSpider):
             'reduced_motion': 'no-preference',
         }
 
-        # 如果启用代理，添加代理设置
-        if proxy_enabled:
-            context_params['proxy'] = {'server': proxy_url}
-            logger.info(f"[{self.name}] Playwright使用代理: {proxy_url}")
+        # 获取代理设置
+        proxy_config = spider_config.get('proxy', {})
+        if proxy_config.get('enabled', False) or getattr(website_config, 'use_proxy', False):
+            self._context_params['proxy'] = {'server': proxy_config.get('url', 'http://127.0.0.1:7897')}
+
+    def _get_random_user_agent(self) -> str:
+        """获取随机User-Agent"""
+        return random.choice(USER_AGENTS)
+
+    @classmethod
+    def crawl_many(cls, spiders: List['PlaywrightSpider']) -> List[List[NewsArticle]]:
+        """
+        批量爬取多个 Playwright 数据源：各站点共享浏览器、使用独立上下文并发执行，
+        浏览器每创建 browser_max_contexts 个上下文换新一次
+
+        Returns:
+            与 spiders 一一对应的文章列表（单个站点失败时为空列表）
+        """
+        if not spiders:
+            return []
+        try:
+            return asyncio.run(cls._crawl_many_async(spiders))
+        except ImportError:
+            logger.error("Playwright未安装，请运行: pip install playwright && playwright install")
+        except Exception as e:
+            logger.error(f"Playwright批量爬取失败: {e}", exc_info=True)
+        return [[] for _ in spiders]
+
+    @staticmethod
+    async def _crawl_many_async(spiders: List['PlaywrightSpider']) -> List[List[NewsArticle]]:
+        """crawl_many 的异步实现"""
+        from playwright.async_api import async_playwright
+
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_PAGES)
+        playwright_config = config.get_spider_config().get('playwright', {})
+
+        async with async_playwright() as p:
+            pool = _BrowserPool(
+                p,
+                headless=all(s.config.headless for s in spiders),
+                max_contexts=playwright_config.get('browser_max_contexts', 10),
+            )
+
+            async def crawl_one(spider: 'PlaywrightSpider') -> List[NewsArticle]:
+                async with semaphore:
+                    logger.info(f"开始爬取: {spider.name} ({spider.base_url})")
+                    spider._crawl_time = datetime.now()
+                    try:
+                        browser = await pool.acquire()
+                        try:
+                            articles = await spider._crawl_with_browser(browser)
+                        finally:
+                            await pool.release(browser)
+                    except Exception as e:
+                        logger.error(f"Playwright爬取失败: {spider.name}, 错误: {e}")
+                        return []
+                    logger.info(f"爬取完成: {spider.name}, 获取 {len(articles)} 篇文章")
+                    return articles
+
+            try:
+                return await asyncio.gather(*(crawl_one(s) for s in spiders))
+            finally:
+                await pool.close()
+
+    async def _create_stealth_context(self, browser):
+        """在已启动的浏览器上创建反检测上下文"""
+        context_params = {'user_agent': self._get_random_user_agent(), **self._context_params}
+        if 'proxy' in context_params:
+            logger.info(f"[{self.name}] Playwright使用代理: {context_params['proxy']['server']}")
+
+        storage_state = self._load_storage_state()
+        if storage_state:
+            context_params['storage_state'] = storage_state
 
         # 创建上下文
         context = await browser.new_context(**context_params)
+        if self.block_resources:
+            await context.route('**/*', _block_resources)
 
         # 注入stealth脚本
         try:
@@ -95,112 +290,155 @@ class PlaywrightSpider(BaseSpider):
         except Exception as e:
             logger.debug(f"stealth注入失败: {e}")
 
-        return {'browser': browser, 'context': context}
+        return context
+
+    def _load_storage_state(self) -> Optional[dict]:
+        """读取上次保存的站点状态，文件不存在或损坏时返回 None"""
+        if self._state_file is None or not self._state_file.exists():
+            return None
+        try:
+            return json.loads(self._state_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            logger.debug(f"[{self.name}] 读取浏览器状态失败: {e}")
+            return None
+
+    async def _save_storage_state(self, context) -> None:
+        """保存站点的 Cookie / localStorage，供下次运行恢复"""
+        if self._state_file is None:
+            return
+        try:
+            self._state_file.parent.mkdir(parents=True, exist_ok=True)
+            await context.storage_state(path=str(self._state_file))
+        except Exception as e:
+            logger.debug(f"[{self.name}] 保存浏览器状态失败: {e}")
 
     async def _crawl_impl_async(self) -> List[NewsArticle]:
-        """异步爬取实现"""
+        """异步爬取实现（单站点：自行启动并关闭浏览器）"""
         articles = []
 
         try:
             from playwright.async_api import async_playwright
 
             async with async_playwright() as p:
-                # 创建反检测上下文
-                resources = await self._create_stealth_context(p)
-                browser = resources['browser']
-                context = resources['context']
+                browser = await _launch_browser(p, headless=self.config.headless)
+                try:
+                    articles = await self._crawl_with_browser(browser)
+                finally:
+                    await browser.close()
 
-                page = await context.new_page()
+        except ImportError:
+            logger.error("Playwright未安装，请运行: pip install playwright && playwright install")
+        except Exception as e:
+            logger.error(f"Playwright爬取失败: {self.name}, 错误: {e}", exc_info=True)
 
-                # 获取列表页
-                list_url = self.config.list_url or self.base_url
-                logger.info(f"加载页面: {list_url}")
+        return articles
 
-                # 随机等待
-                wait_time = getattr(self.config, 'wait_time', 2) + random.uniform(0, 2)
+    async def _crawl_with_browser(self, browser) -> List[NewsArticle]:
+        """使用给定浏览器爬取本站，结束时只关闭本站的上下文"""
+        articles = []
 
-                await page.goto(list_url, wait_until='domcontentloaded', timeout=30000)
+        # 创建反检测上下文
+        context = await self._create_stealth_context(browser)
+        try:
+            page = await context.new_page()
 
-                # 等待页面渲染
-                await page.wait_for_timeout(int(wait_time * 1000))
+            # 获取列表页
+            list_url = self.config.list_url or self.base_url
+            logger.info(f"加载页面: {list_url}")
 
-                # 等待内容加载
-                try:
-                    await page.wait_for_selector(
-                        self.config.list_selector or '.news-list li',
-                        timeout=10000
-                    )
-                except Exception as e:
-                    logger.warning(f"等待选择器超时: {e}")
+            await page.goto(list_url, wait_until='domcontentloaded', timeout=30000)
 
-                # 解析列表
-                items = await self._parse_list_page_async(page)
+            # 等待内容加载
+            try:
+                await page.wait_for_selector(
+                    self.config.list_selector or '.news-list li',
+                    timeout=10000
+                )
+            except Exception as e:
+                logger.warning(f"等待选择器超时: {e}")
 
-                for item in items:
-                    try:
-                        article = await self._crawl_article_async(page, item['url'], item['title'])
-                        if article:
-                            articles.append(article)
-                    except Exception as e:
-                        logger.debug(f"爬取文章失败: {item.get('url')}, 错误: {e}")
-                        continue
+            # 等待页面渲染：网络空闲即继续，wait_time 为最长等待时间
+            try:
+                await page.wait_for_load_state(
+                    'networkidle', timeout=getattr(self.config, 'wait_time', 2) * 1000
+                )
+            except Exception:
+                pass
 
-                await browser.close()
+            # 有反爬的站点保留随机等待
+            if self.config.use_stealth:
+                await page.wait_for_timeout(random.uniform(0, 2) * 1000)
 
-        except ImportError:
-            logger.error("Playwright未安装，请运行: pip install playwright && playwright install")
-        except Exception as e:
-            logger.error(f"Playwright爬取失败: {self.name}, 错误: {e}", exc_info=True)
+            # 解析列表
+            items = await self._parse_list_page_async(page)
+
+            # 文章详情页：每 articles_per_context 篇换一个新上下文，限制单个上下文的内存增长
+            for start in range(0, len(items), self.articles_per_context):
+                if start:
+                    # 新上下文沿用本次运行中已获得的 Cookie
+                    await self._save_storage_state(context)
+                    await context.close()
+                    context = await self._create_stealth_context(browser)
+                    page = await context.new_page()
+                batch = items[start:start + self.articles_per_context]
+                articles.extend(await self._crawl_items_async(context, page, batch))
+
+            await self._save_storage_state(context)
+        finally:
+            await context.close()
+
+        return articles
+
+    async def _crawl_items_async(self, context, page, items: List[dict]) -> List[NewsArticle]:
+        """在同一上下文内抓取一批文章：建立页面池（复用传入页面），各文章从池中取页面并发抓取"""
+        pages = asyncio.Queue()
+        pages.put_nowait(page)
+        for _ in range(min(self.page_concurrency, len(items)) - 1):
+            pages.put_nowait(await context.new_page())
 
+        async def crawl_item(item):
+            item_page = await pages.get()
+            try:
+                return await self._crawl_article_async(item_page, item['url'], item['title'])
+            finally:
+                pages.put_nowait(item_page)
+
+        articles = []
+        results = await asyncio.gather(*(crawl_item(item) for item in items), return_exceptions=True)
+        for item, result in zip(items, results):
+            if isinstance(result, Exception):
+                logger.debug(f"爬取文章失败: {item.get('url')}, 错误: {result}")
+            elif result:
+                articles.append(result)
         return articles
 
     async def _parse_list_page_async(self, page) -> List[dict]:
-        """异步解析列表页"""
+        """异步解析列表页（提取、URL 排除与数量截取都在页面内一次完成，避免逐个元素往返）"""
         items = []
 
         selector = self.config.list_selector or '.news-list li'
-        title_s = self.config.title_selector if self.config.title_selector else None
-        link_s = self.config.link_selector if self.config.link_selector else None
 
-        # 获取URL排除模式
-        exclude_patterns = getattr(self.config, 'exclude_patterns', [])
+        try:
+            raw_items = await page.eval_on_selector_all(selector, _LIST_ITEMS_JS, {
+                'max': self.max_items,
+                'title': self.config.title_selector or None,
+                'link': self.config.link_selector or None,
+                'base': self.base_url,
+                # URL排除模式：排除广告、导航等无效链接
+                'exclude': list(getattr(self.config, 'exclude_patterns', None) or ()),
+            })
+        except Exception as e:
+            logger.debug(f"解析列表项失败: {e}")
+            return items
 
-        elements = await page.query_selector_all(selector)
+        for title, link in raw_items:
+            if not link.startswith('http'):
+                link = urljoin(self.base_url, link)
 
-        for elem in elements[:self.max_items]:
-            try:
-                # 如果 title_selector 为空，使用元素本身
-                if title_s:
-                    title_elem = await elem.query_selector(title_s)
-                else:
-                    title_elem = elem
-
-                # 如果 link_selector 为空，使用元素本身
-                if link_s:
-                    link_elem = await elem.query_selector(link_s)
-                else:
-                    link_elem = elem
-
-                if title_elem and link_elem:
-                    title = await title_elem.inner_text()
-                    link = await link_elem.get_attribute('href')
-
-                    if title and link:
-                        if not link.startswith('http'):
-                            link = urljoin(self.base_url, link)
-
-                        # URL过滤：排除广告、导航等无效链接
-                        if exclude_patterns and any(pattern in link for pattern in exclude_patterns):
-                            logger.debug(f"排除无效链接: {link}")
-                            continue
-
-                        items.append({
-                            'title': title.strip(),
-                            'url': link
-                        })
-            except Exception as e:
-                logger.debug(f"解析列表项失败: {e}")
-                continue
+            items.append({
+                'title': title.strip(),
+                'url': link
+            })
 
         return items
 
@@ -208,7 +446,12 @@ class PlaywrightSpider(BaseSpider):
         """异步爬取单篇文章"""
         try:
             await page.goto(url, wait_until='domcontentloaded', timeout=30000)
-            await page.wait_for_timeout(2000)
+
+            # 等到正文段落出现即提取，最多等待 2 秒
+            try:
+                await page.wait_for_selector('p', state='attached', timeout=2000)
+            except Exception:
+                pass
 
             # 提取内容
             summary, content = await self._extract_content_async(page)
@@ -228,51 +471,20 @@ class PlaywrightSpider(BaseSpider):
         content = ""
         summary = ""
 
-        # 尝试多种选择器
-        selectors = [
-            'article',
-            '.article-content',
-            '.post-content',
-            '.content',
-            '#content',
-            '.article-body',
-            '.article-main',
-            '.news-content',
-            '.text-content',
-        ]
-
-        for selector in selectors:
-            try:
-                elem = await page.query_selector(selector)
-                if elem:
-                    # 获取所有段落
-                    paragraphs = await elem.query_selector_all('p')
-                    if paragraphs:
-                        text_parts = []
-                        for p in paragraphs:
-                            text = await p.inner_text()
-                            if text.strip():
-                                text_parts.append(text.strip())
-
-                        if text_parts:
-                            content = '\n\n'.join(text_parts)
-                            summary = text_parts[0][:200] if text_parts else ""
-                            break
-            except Exception:
-                continue
-
-        # 如果没有找到，尝试获取整个页面文本
-        if not content:
-            try:
-                text = await page.inner_text('body')
-                if text:
-                    # 清理文本
-                    lines = text.split('\n')
-                    lines = [line.strip() for line in lines if line.strip()]
-                    content = '\n'.join(lines)
-                    summary = content[:200]
-            except Exception:
-                pass
+        # 正文容器探测、段落提取与整页兜底都在页面内一次完成
+        try:
+            result = await page.evaluate(_ARTICLE_TEXT_JS, _CONTENT_SELECTORS)
+        except Exception:
+            return summary, content
+
+        text_parts = result.get('parts')
+        if text_parts:
+            content = '\n\n'.join(text_parts)
+            summary = text_parts[0][:200]
+        elif result.get('body'):
+            # 清理文本
+            content = self._clean_content(result['body'])
+            summary = content[:200]
 
         return summary, content
 
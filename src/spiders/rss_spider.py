@@ -2,32 +2,154 @@
 RSS爬虫
 """
 
+import asyncio
 import logging
+import random
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Optional
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 
 import feedparser
 
-from .base_spider import BaseSpider
+from .base_spider import _HTTP2_AVAILABLE, BaseSpider, _node_text, _parse_html
+from ..config import config
+from ..database import db
 from ..models import NewsArticle, SpiderType, WebsiteConfig
 
 logger = logging.getLogger(__name__)
 
+# 未配置 rss_url 时探测的常见 RSS 路径（按优先级）
+_COMMON_FEED_PATHS = (
+    '/rss',
+    '/feed',
+    '/feed.xml',
+    '/rss.xml',
+    '/atom.xml',
+    '/rss/feed.xml',
+)
+
+# 批量爬取时同时进行的 feed 请求数
+MAX_PARALLEL_FEEDS = 32
+
 
 class RSSSpider(BaseSpider):
     """RSS订阅爬虫"""
 
-    def __init__(self, website_config: WebsiteConfig):
+    def __init__(self, website_config: WebsiteConfig, conditional: bool = True):
+        """
+        Args:
+            conditional: 是否发条件请求并记录 ETag / Last-Modified；
+                         测试等一次性抓取传 False，既总能拿到完整 feed，也不影响定时任务的缓存
+        """
         super().__init__(website_config)
         self.type = SpiderType.RSS
         # 如果配置了rss_url则使用，否则尝试常见的rss地址
         self.rss_url = website_config.rss_url
+        self.conditional = conditional
+
+    @classmethod
+    def crawl_many(cls, spiders: List['RSSSpider']) -> List[List[NewsArticle]]:
+        """
+        批量爬取多个 RSS 数据源：所有 feed 在一个事件循环内并发请求，
+        XML 解析放到线程池中，与其余请求的网络等待重叠
+
+        Returns:
+            与 spiders 一一对应的文章列表（单个数据源失败时为空列表）
+        """
+        if not spiders:
+            return []
+        try:
+            return asyncio.run(cls._crawl_many_async(spiders))
+        except Exception as e:
+            logger.error(f"RSS批量爬取失败: {e}", exc_info=True)
+        return [[] for _ in spiders]
+
+    @staticmethod
+    async def _crawl_many_async(spiders: List['RSSSpider']) -> List[List[NewsArticle]]:
+        """crawl_many 的异步实现（httpx.AsyncClient，按代理设置分组共用客户端，同一域名受 max_per_host 限制）"""
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_FEEDS)
+        per_host = max(1, config.get_spider_config().get('max_per_host', 2))
+        host_limits = {}
+        clients = {}
+
+        def get_client(spider: 'RSSSpider') -> 'httpx.AsyncClient':
+            proxy = spider.proxy_url if spider.use_proxy or getattr(spider.config, 'use_proxy', False) else None
+            if proxy not in clients:
+                headers = {k: v for k, v in spider.session.headers.items()
+                           if k.lower() not in ('accept-encoding', 'connection')}
+                clients[proxy] = httpx.AsyncClient(
+                    headers=headers,
+                    timeout=spider.timeout,
+                    follow_redirects=True,
+                    http2=_HTTP2_AVAILABLE,
+                    limits=httpx.Limits(max_connections=MAX_PARALLEL_FEEDS,
+                                        max_keepalive_connections=MAX_PARALLEL_FEEDS),
+                    proxy=proxy,
+                )
+            return clients[proxy]
+
+        async def fetch(spider: 'RSSSpider', feed_url: str):
+            client = get_client(spider)
+            headers = spider._conditional_headers(feed_url)
+            retries = max(1, spider.retry_times)
+            for attempt in range(retries):
+                try:
+                    response = await client.get(feed_url, headers=headers)
+                    if response.status_code == 304:
+                        return response
+                    response.raise_for_status()
+                    return response
+                except httpx.HTTPError as e:
+                    if attempt < retries - 1:
+                        await asyncio.sleep(spider.delay * (2 ** attempt) + random.uniform(0, 0.5))
+                    else:
+                        logger.debug(f"[{spider.name}] 请求失败: {feed_url} ({type(e).__name__})")
+            return None
+
+        async def crawl_one(spider: 'RSSSpider') -> List[NewsArticle]:
+            logger.info(f"开始爬取: {spider.name} ({spider.base_url})")
+            spider._crawl_time = datetime.now()
+            try:
+                # 未配置 rss_url 时的地址探测是同步请求，放到线程池中
+                feed_url = spider.rss_url or await loop.run_in_executor(None, spider._get_feed_url)
+                if not feed_url:
+                    logger.warning(f"无法找到RSS feed: {spider.name}")
+                    return []
+
+                host = urlparse(feed_url).netloc
+                host_limit = host_limits.setdefault(host, asyncio.Semaphore(per_host))
+                async with semaphore, host_limit:
+                    response = await fetch(spider, feed_url)
+
+                if response is None:
+                    logger.error(f"获取RSS失败: {spider.name}")
+                    spider._forget_feed_url()
+                    return []
+                if response.status_code == 304:
+                    logger.info(f"RSS未更新: {spider.name}")
+                    return []
+
+                articles = await loop.run_in_executor(
+                    None, spider._parse_feed, feed_url, response.content, response.headers
+                )
+            except Exception as e:
+                logger.error(f"获取RSS失败: {spider.name}, 错误: {e}")
+                return []
+            logger.info(f"爬取完成: {spider.name}, 获取 {len(articles)} 篇文章")
+            return articles
+
+        try:
+            return await asyncio.gather(*(crawl_one(s) for s in spiders))
+        finally:
+            for client in clients.values():
+                await client.aclose()
 
     def _crawl_impl(self) -> List[NewsArticle]:
         """RSS爬取实现"""
-        articles = []
-
         # 获取RSS feed URL
         feed_url = self._get_feed_url()
         if not feed_url:
@@ -35,49 +157,95 @@ class RSSSpider(BaseSpider):
             return []
 
         try:
-            # 解析RSS
-            feed = feedparser.parse(feed_url)
+            response = self._make_request(feed_url, headers=self._conditional_headers(feed_url))
+            if response is None:
+                logger.error(f"获取RSS失败: {self.name}")
+                self._forget_feed_url()
+                return []
+            if response.status_code == 304:
+                logger.info(f"RSS未更新: {self.name}")
+                return []
 
-            if feed.bozo:
-                logger.warning(f"RSS解析失败: {self.name}, 错误: {feed.bozo_exception}")
-
-            for entry in feed.entries[:self.max_items]:
-                try:
-                    article = self._parse_entry(entry)
-                    if article:
-                        articles.append(article)
-                except Exception as e:
-                    logger.debug(f"解析RSS条目失败: {e}")
-                    continue
+            return self._parse_feed(feed_url, response.content, response.headers)
 
         except Exception as e:
             logger.error(f"获取RSS失败: {self.name}, 错误: {e}")
 
+        return []
+
+    def _conditional_headers(self, feed_url: str) -> dict:
+        """带上次的 ETag / Last-Modified 发条件请求，未更新的 feed 返回 304，无需下载和解析"""
+        if not self.conditional:
+            return {}
+        cache = db.get_feed_cache(feed_url)
+        headers = {}
+        if cache['etag']:
+            headers['If-None-Match'] = cache['etag']
+        if cache['last_modified']:
+            headers['If-Modified-Since'] = cache['last_modified']
+        return headers
+
+    def _parse_feed(self, feed_url: str, content: bytes, response_headers) -> List[NewsArticle]:
+        """
+        解析已下载的 feed，解析成功且得到文章时记录本次的 ETag / Last-Modified
+
+        解析失败或没有条目时不更新缓存，下次仍完整下载，避免服务器以 304 掩盖本次未取到的内容。
+        """
+        articles = []
+
+        # 直接解析已下载的字节，由 feedparser 按 XML 声明处理编码
+        feed = feedparser.parse(
+            content,
+            response_headers={k.lower(): v for k, v in response_headers.items()}
+        )
+
+        if feed.bozo:
+            logger.warning(f"RSS解析失败: {self.name}, 错误: {feed.bozo_exception}")
+
+        for entry in feed.entries[:self.max_items]:
+            try:
+                article = self._parse_entry(entry)
+                if article:
+                    articles.append(article)
+            except Exception as e:
+                logger.debug(f"解析RSS条目失败: {e}")
+                continue
+
+        if self.conditional and not feed.bozo and articles:
+            db.save_feed_cache(feed_url, response_headers.get('ETag'), response_headers.get('Last-Modified'))
+
         return articles
 
     def _get_feed_url(self) -> Optional[str]:
-        """获取RSS feed URL"""
+        """获取RSS feed URL（未配置时优先用上次探测到的地址，否则并发探测常见路径）"""
         if self.rss_url:
             return self.rss_url
 
-        # 尝试常见的RSS地址
-        common_paths = [
-            '/rss',
-            '/feed',
-            '/feed.xml',
-            '/rss.xml',
-            '/atom.xml',
-            '/rss/feed.xml',
-        ]
-
-        for path in common_paths:
-            url = urljoin(self.base_url, path)
-            response = self._make_request(url)
-            if response and 'xml' in response.headers.get('Content-Type', '').lower():
-                return url
+        cached = db.get_feed_url(self.base_url)
+        if cached:
+            return cached
+
+        # 尝试常见的RSS地址：所有候选同时用 HEAD 请求，只看 Content-Type 不下载内容；
+        # 候选全部请求失败时（如站点不支持 HEAD）再用 GET 探测一次
+        urls = [urljoin(self.base_url, path) for path in _COMMON_FEED_PATHS]
+        with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            for method in ('HEAD', 'GET'):
+                responses = list(executor.map(lambda url: self._make_request(url, method=method), urls))
+                # 按候选顺序取第一个 XML 响应
+                for url, response in zip(urls, responses):
+                    if response and 'xml' in response.headers.get('Content-Type', '').lower():
+                        db.save_feed_url(self.base_url, url)
+                        return url
+                if any(response is not None for response in responses):
+                    break
 
         return None
 
+    def _forget_feed_url(self):
+        """探测到的地址请求失败时清除记录，下次重新探测"""
+        if not self.rss_url:
+            db.save_feed_url(self.base_url, None)
+
     def _parse_entry(self, entry) -> Optional[NewsArticle]:
         """解析RSS条目"""
         # 获取标题
@@ -106,11 +274,14 @@ class RSSSpider(BaseSpider):
         elif hasattr(entry, 'description'):
             summary = entry.description
 
-        # 清理HTML标签
-        from bs4 import BeautifulSoup
+        # 清理HTML标签（不含标签和实体的纯文本摘要无需解析）
         if summary:
-            soup = BeautifulSoup(summary, 'lxml')
-            summary = soup.get_text(strip=True)[:500]
+            if '<' in summary or '&' in summary:
+                root = _parse_html(summary)
+                summary = _node_text(root) if root is not None else ''
+            else:
+                summary = summary.strip()
+            summary = summary[:500]
 
         return self._create_article(
             title=title,
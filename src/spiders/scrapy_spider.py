@@ -2,8 +2,9 @@
 Scrapy爬虫
 """
 
+import asyncio
 import logging
-from typing import List, Optional
+from typing import List
 
 from .base_spider import BaseSpider
 from ..models import NewsArticle, SpiderType, WebsiteConfig
@@ -19,40 +20,46 @@ class ScrapySpider(BaseSpider):
         self.type = SpiderType.SCRAPY
 
     def _crawl_impl(self) -> List[NewsArticle]:
-        """Scrapy爬取实现"""
+        """Scrapy爬取实现（列表页与文章页共用一个异步客户端）"""
+        return asyncio.run(self._crawl_impl_async())
+
+    async def _crawl_impl_async(self) -> List[NewsArticle]:
+        """_crawl_impl 的异步实现"""
         articles = []
 
         # 获取列表页URL
         list_url = self.config.list_url or self.base_url
 
-        # 发送请求
-        response = self._make_request(list_url)
-        if not response:
-            return []
+        async with self._async_client() as client:
+            # 发送请求
+            html = await self._fetch_async(client, list_url)
+            if html is None:
+                return []
 
-        # 解析列表页
-        items = self._parse_list_page(response.text)
+            # 解析列表页
+            items = self._parse_list_page(html)
 
-        for item in items:
-            try:
-                # 获取文章详情
-                article = self._crawl_article(item['url'], item['title'])
-                if article:
-                    articles.append(article)
-            except Exception as e:
-                logger.debug(f"爬取文章失败: {item.get('url')}, 错误: {e}")
-                continue
+            # 并发获取文章详情页，每页下载完成即在线程池中解析
+            titles = {}
+            for item in items:
+                titles.setdefault(item['url'], item['title'])
+            pages = await self._fetch_many_async(
+                list(titles),
+                parse=lambda url, html: self._build_article(url, titles[url], html),
+                client=client
+            )
 
-        return articles
+        for url in titles:
+            article = pages.get(url)
+            if article is not None:
+                articles.append(article)
 
-    def _crawl_article(self, url: str, title: str) -> Optional[NewsArticle]:
-        """爬取单篇文章"""
-        response = self._make_request(url)
-        if not response:
-            return None
+        return articles
 
+    def _build_article(self, url: str, title: str, html: str) -> NewsArticle:
+        """由文章详情页 HTML 构建文章对象"""
         # 提取内容
-        summary, content = self._extract_article_content(url, response.text)
+        summary, content = self._extract_article_content(url, html)
 
         return self._create_article(
             title=title,
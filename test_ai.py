@@ -82,17 +82,14 @@ def main():
         print("AI 分析失败")
         return
 
-    # 生成 HTML 报告
+    # 生成 HTML 报告并保存（逐段流式写入）
     formatter = Formatter()
-    html = formatter.format_ai_report(report_data)
 
-    # 保存文件
     output_dir = Path("outputs")
     output_dir.mkdir(exist_ok=True)
     output_file = output_dir / f"ai_{target_date}.html"
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html)
+    formatter.write_ai_report(report_data, output_file, gzip_copy=config.get('output.gzip', False))
 
     print("=" * 60)
     print(f"AI 报告已保存到: {output_file}")
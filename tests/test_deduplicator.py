@@ -0,0 +1,51 @@
+"""
+去重处理器测试
+"""
+
+import unittest
+
+from src.models import NewsArticle
+from src.processors.deduplicator import Deduplicator
+
+
+class HistoryConfirmTest(unittest.TestCase):
+    """布隆过滤器命中的 URL 每批只做一次精确确认"""
+
+    def setUp(self):
+        self.calls = []
+        self.stored = {'https://example.com/old'}
+
+        def existing_urls(urls):
+            urls = set(urls)
+            self.calls.append(urls)
+            return urls & self.stored
+
+        self.deduplicator = Deduplicator(existing_urls=existing_urls)
+
+    def _article(self, n: str) -> NewsArticle:
+        return NewsArticle(title=f'标题{n}', url=f'https://example.com/{n}', source='来源', category='banks')
+
+    def test_one_query_per_batch(self):
+        # 模拟布隆过滤器误判：fp 不在数据库中但命中过滤器
+        self.deduplicator.load_from_database(['https://example.com/old', 'https://example.com/fp'])
+        articles = [self._article('old'), self._article('fp'), self._article('new')]
+
+        unique = self.deduplicator.deduplicate(articles)
+
+        self.assertEqual([a.url for a in unique], ['https://example.com/fp', 'https://example.com/new'])
+        self.assertEqual(self.calls, [{'https://example.com/old', 'https://example.com/fp'}])
+
+    def test_no_query_without_hits(self):
+        self.deduplicator.load_from_database([])
+        self.deduplicator.deduplicate([self._article('new')])
+        self.assertEqual(self.calls, [])
+
+    def test_load_from_generator(self):
+        urls = (f'https://example.com/{i}' for i in range(3))
+        self.assertEqual(self.deduplicator.load_from_database(urls, expected=3), 3)
+        self.assertFalse(self.deduplicator.is_seen('https://example.com/1'))
+        self.assertEqual(self.calls, [{'https://example.com/1'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
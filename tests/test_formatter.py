@@ -0,0 +1,64 @@
+"""
+Formatter 报告渲染测试
+"""
+
+import unittest
+from datetime import datetime
+
+from src.models import NewsArticle
+from src.processors.formatter import Formatter
+
+
+class NonStringAIFieldsTest(unittest.TestCase):
+    """AI 返回的 JSON 字段可能不是字符串，报告仍应正常渲染"""
+
+    def setUp(self):
+        self.formatter = Formatter()
+        self.date = datetime(2026, 1, 22)
+        self.article = NewsArticle(title='标题', url='https://example.com/a', source='来源', category='banks')
+        self.ai_data = {
+            'market_sentiment': 42,
+            'themes': [
+                {'title': 5, 'importance': 3, 'summary': ['a', 'b'], 'insight': {'k': 1},
+                 'articles': [self.article]},
+                {'title': None, 'importance': ['高'], 'summary': 1.5, 'insight': None},
+            ],
+            'news_flash': [
+                {'title': 7, 'one_sentence_comment': {'x': 1}, 'article': self.article},
+                {'title': ['<b>'], 'one_sentence_comment': None},
+            ],
+        }
+
+    def test_ai_report(self):
+        html = self.formatter.format_ai_report(self.ai_data, self.date)
+        self.assertIn('42', html)
+        self.assertIn('[&#x27;a&#x27;, &#x27;b&#x27;]', html)
+        self.assertIn('{&#x27;x&#x27;: 1}', html)
+        self.assertIn('[&#x27;&lt;b&gt;&#x27;]', html)
+
+    def test_combined_report(self):
+        html = self.formatter.format_combined_report([self.article], self.ai_data, self.date)
+        self.assertIn('[&#x27;a&#x27;, &#x27;b&#x27;]', html)
+        self.assertIn('{&#x27;x&#x27;: 1}', html)
+
+
+class CombinedReportStylesTest(unittest.TestCase):
+    """include_styles=False 时合并版报告不内联样式表，其余内容不变"""
+
+    def test_include_styles_flag(self):
+        formatter = Formatter()
+        date = datetime(2026, 1, 22)
+        article = NewsArticle(title='标题', url='https://example.com/a', source='来源', category='banks')
+
+        full = formatter.format_combined_report([article], None, date)
+        bare = formatter.format_combined_report([article], None, date, include_styles=False)
+        streamed = "".join(formatter.iter_combined_report([article], None, date, include_styles=False))
+
+        self.assertIn('<style>', full)
+        self.assertNotIn('<style>', bare)
+        self.assertEqual(bare, streamed)
+        self.assertIn('https://example.com/a', bare)
+
+
+if __name__ == '__main__':
+    unittest.main()
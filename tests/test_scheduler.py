@@ -0,0 +1,46 @@
+"""
+归档页扫描测试
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.scheduler import _ARCHIVE_SCAN_CHUNK, _scan_report_title
+
+
+class ScanReportTitleTest(unittest.TestCase):
+    """报告标题的位置随内联样式体积变化，不能只看文件开头一段"""
+
+    def _write(self, content: bytes) -> Path:
+        tmp = tempfile.NamedTemporaryFile(suffix='.html', delete=False)
+        self.addCleanup(Path(tmp.name).unlink)
+        with tmp:
+            tmp.write(content)
+        return Path(tmp.name)
+
+    def test_title_past_first_chunk(self):
+        # 旧版报告内联未压缩样式，标题约在 28 KB 处
+        css = b'<style>' + b'.card { color: #333; }\n' * 1300 + b'</style>'
+        self.assertGreater(len(css), 28000)
+        path = self._write(b'<html><head>' + css + '</head><body><h1>金融日报 &amp; 要闻</h1>'.encode())
+        self.assertEqual(_scan_report_title(path), '金融日报 &amp; 要闻'.encode())
+
+    def test_title_across_chunk_boundary(self):
+        title = '<h1 class="title">金融日报</h1>'.encode()
+        for offset in range(-len(title), 2):
+            padding = b' ' * (_ARCHIVE_SCAN_CHUNK + offset)
+            path = self._write(padding + title + b'<p>x</p>')
+            self.assertEqual(_scan_report_title(path), '金融日报'.encode(), offset)
+
+    def test_skips_h1_with_markup(self):
+        path = self._write(b'<h1><span>x</span></h1><h1>second</h1>')
+        self.assertEqual(_scan_report_title(path), b'second')
+
+    def test_no_title(self):
+        path = self._write(b'<html><body>' + b'x' * 40000 + b'</body></html>')
+        self.assertIsNone(_scan_report_title(path))
+
+
+if __name__ == '__main__':
+    unittest.main()